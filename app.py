@@ -5,6 +5,7 @@ import threading
 import time
 from typing import Dict, List, Optional, Generator
 from tools.shared_console import console
+from tools.structured_log import get_logger
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.syntax import Syntax
@@ -44,7 +45,7 @@ from tools.config_styles import (
         pygment,
         custom_colorsUX,
         )
-from pustakapersona.personareadle import run_readle_persona
+from pustakapersona.personareadle import run_readle_persona, run_batch_readle_persona
 from core.fireworks_api_client import generate_response
 from pustakapersona.personacode import (
         run_code_persona,
@@ -52,6 +53,8 @@ from pustakapersona.personacode import (
         )
 from pustakapersona.persona_generative_komentar import run_generative_commenter
 
+log = get_logger("app")
+
 SYSTEM_PROMPT = """
 You are an intelligent and helpful AI assistant named Dobby.
 
@@ -207,7 +210,7 @@ YOUR ANALYTICAL ANSWER:"""
             for chunk in generate_response(final_messages, stream=True, temperature=0.3):
                 if chunk.strip(): yield chunk
         except Exception as e:
-            console.log(f"[red]General chat error: {e}[/red]")
+            log.error(f"[red]General chat error: {e}[/red]")
             yield "Sorry, an error occurred while processing the response. Please try again."
 
 
@@ -242,12 +245,14 @@ def chat():
                             "!quit",
                             "!exit",
                             "!keluar",
+                            "!refresh",
                             "selectmodel",
                             "currentmodel",
                             ], meta_dict={
                                 "!quit": "| english",
                                 "!keluar": "| indonesia",
                                 "!exit": "| english",
+                                "!refresh": "| bypass cached wallet data",
                                 "selectmodel": "| change AI model",
                                 "currentmodel": "| show current model"}
                         ),
@@ -317,6 +322,15 @@ def chat():
                 console.print(f"[red]Error getting model info: {e}[/red]")
             continue
 
+        # "!refresh <request>" runs the request with force_refresh, so the wallet
+        # analyzer fetches live data instead of serving a cached entry.
+        force_refresh = user_input.lower().startswith("!refresh")
+        if force_refresh:
+            user_input = user_input[len("!refresh"):].strip()
+            if not user_input:
+                console.print("[yellow]Usage: !refresh <request>, e.g. '!refresh analyze 0x...'[/yellow]")
+                continue
+
         if not user_input.strip():
             continue
 
@@ -325,20 +339,21 @@ def chat():
         try:
             decision = route_with_advanced_intelligence(user_input, messages)
         except Exception as e:
-            console.log(f"[red]Routing error: {e}[/red]")
+            log.error(f"[red]Routing error: {e}[/red]")
             decision = {"tool": "general_chat"}
 
         tool_to_use = decision.get("tool", "general_chat")
         agent.last_tool_used = tool_to_use
 
-        if tool_to_use in ["general_chat", "web_search", "context_answer", "readle", "address_analyzer", "code_generator", "generative_commenter"]:
+        if tool_to_use in ["general_chat", "web_search", "context_answer", "readle", "batch_readle", "address_analyzer", "code_generator", "generative_commenter"]:
             try:
                 generator_map_stream = {
                     "web_search": lambda: run_enhanced_search_persona(user_input, decision.get("query", user_input), agent._extract_search_context(messages)),
                     "context_answer": lambda: agent._generate_context_response(user_input, agent.active_context) if agent.active_context else agent._stream_general_chat(messages),
                     "general_chat": lambda: agent._stream_general_chat(messages),
                     "readle": lambda: run_readle_persona(decision.get("query"), messages),
-                    "address_analyzer": lambda: run_wallet_analysis_persona_stream(decision.get("query", user_input), messages),
+                    "batch_readle": lambda: run_batch_readle_persona(decision.get("query", user_input), messages),
+                    "address_analyzer": lambda: run_wallet_analysis_persona_stream(decision.get("query", user_input), messages, force_refresh=force_refresh),
                     "code_generator": lambda: run_code_persona(user_input, messages),
                     "generative_commenter": lambda: run_generative_commenter(decision.get("query", user_input), messages),
                 }
@@ -364,7 +379,7 @@ def chat():
                             language, code = code_blocks[0]  # Ambil blok kode pertama
                             code_interaction_data = {"language": language, "code": code.strip()}
                     except Exception as e:
-                        console.log(f"[yellow]Could not extract code for interaction: {e}[/yellow]")
+                        log.warning(f"[yellow]Could not extract code for interaction: {e}[/yellow]")
 
                 if tool_to_use == "address_analyzer":
                     address_for_explorer = decision.get("query", user_input)
@@ -373,7 +388,7 @@ def chat():
                         console.rule("[bold cyan]Explorer session completed. Returning to main chat mode.[/bold cyan]")
 
             except Exception as e:
-                console.log(f"[red]Streaming error: {e}[/red]")
+                log.error(f"[red]Streaming error: {e}[/red]")
                 bot_response_full = "Sorry, an unexpected error occurred during streaming."
                 bot_panel_content = Markdown(f"[red]{bot_response_full}[/red]", style="default")
                 code_interaction_data = None
@@ -388,7 +403,7 @@ def chat():
                     code_interaction_data = None
 
                     if nonlocal_tool == "address_analyzer":
-                        analysis_result = run_wallet_analysis_persona(decision.get("query"))
+                        analysis_result = run_wallet_analysis_persona(decision.get("query"), force_refresh=force_refresh)
                         bot_response_full = analysis_result.get("report_markdown", "")
                         if bot_response_full:
                             result_container['panel_content'] = Markdown(bot_response_full, style="default")
@@ -406,7 +421,8 @@ def chat():
                             result_container['panel_content'] = Markdown(f"[yellow]{bot_response_full}[/yellow]")
                     else:
                         generator_map = {
-                            "readle": lambda: run_readle_persona(decision.get("query"))
+                            "readle": lambda: run_readle_persona(decision.get("query")),
+                            "batch_readle": lambda: run_batch_readle_persona(decision.get("query", user_input))
                         }
                         generator_func = generator_map.get(nonlocal_tool)
                         if generator_func:
@@ -441,7 +457,7 @@ def chat():
 
             if 'error' in result_container:
                 e = result_container['error']
-                console.log(f"[red]Critical processing error: {e}[/red]")
+                log.error(f"[red]Critical processing error: {e}[/red]")
                 bot_response_full = "Sorry, an unexpected error occurred."
                 console.print(Panel(f"[red]{bot_response_full}[/red]", title="[bold red]Error[/bold red]", border_style="red"))
                 bot_panel_content = None
@@ -481,7 +497,7 @@ def chat():
 
         tool_used = agent.last_tool_used
 
-        if tool_used in ["web_search", "readle", "code_generator", "memory_recall", "address_analyzer", "generative_commenter"]:
+        if tool_used in ["web_search", "readle", "batch_readle", "code_generator", "memory_recall", "address_analyzer", "generative_commenter"]:
             agent.active_context = bot_response_full
             console.rule(f"[green]Context saved from '{tool_used}'.[/green]")
         elif tool_used == "general_chat":
@@ -497,7 +513,7 @@ def chat():
             else:
                 save_linear_session(messages, session_filename)
         except Exception as e:
-            console.log(f"[yellow]Session save error: {e}[/yellow]")
+            log.warning(f"[yellow]Session save error: {e}[/yellow]")
 
     console.print("\n[bold green]👋 See you later! Thank you for using Enhanced Agent CLI.[/bold green]")
 
@@ -0,0 +1,65 @@
+"""Benchmark: Brave result-page parser backends on saved HTML fixtures.
+
+Run from the repository root:
+    python -m benchmarks.bench_brave_parser [--repeat 5] [--limit 12]
+"""
+import argparse
+import time
+from pathlib import Path
+
+from rich.table import Table
+
+from tools.shared_console import console
+from tools.brave_parser import PARSER_BACKENDS, parse_organic_results
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "brave"
+
+
+def time_backend(html: str, backend: str, limit: int, repeat: int):
+    best = float("inf")
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = parse_organic_results(html, limit=limit, backend=backend)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="best-of-N timing")
+    parser.add_argument("--limit", type=int, default=12, help="organic results to keep (brave_search limit)")
+    args = parser.parse_args()
+
+    backends = [name for name in ("bs4", "lxml", "selectolax") if name in PARSER_BACKENDS]
+    fixtures = sorted(FIXTURE_DIR.glob("*.html"))
+
+    table = Table(title=f"Brave parser backends | {len(fixtures)} fixtures | limit={args.limit}", expand=True)
+    table.add_column("Fixture")
+    table.add_column("KB", justify="right")
+    table.add_column("Results", justify="right")
+    for name in backends:
+        table.add_column(f"{name} (ms)", justify="right")
+    for name in backends[1:]:
+        table.add_column(f"{name} speed-up", justify="right")
+        table.add_column(f"{name} identical", justify="center")
+
+    for fixture in fixtures:
+        html = fixture.read_text(encoding="utf-8")
+        timings = {}
+        outputs = {}
+        for name in backends:
+            timings[name], outputs[name] = time_backend(html, name, args.limit, args.repeat)
+
+        row = [fixture.stem, f"{len(html) / 1024:.0f}", str(len(outputs["bs4"]))]
+        row += [f"{timings[name]:.1f}" for name in backends]
+        for name in backends[1:]:
+            row.append(f"{timings['bs4'] / timings[name]:.1f}x")
+            row.append("[green]yes[/green]" if outputs[name] == outputs["bs4"] else "[red]NO[/red]")
+        table.add_row(*row)
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
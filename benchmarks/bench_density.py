@@ -0,0 +1,110 @@
+"""Benchmark: quality and speed of the density layer against layer 1 and trafilatura.
+
+Every extractor starts from the raw HTML, so parse time is included. Quality
+is word-level precision/recall/F1 against fixtures/html/<page>.expected.txt
+(pages without one are timed only). Those gold texts are built by
+benchmarks.gold_text from hand-chosen article containers with BeautifulSoup,
+independently of the extractors scored here. A few lost words barely move
+F1 on long pages, so it is printed to four places.
+
+Run from the repository root:
+    python -m benchmarks.bench_density [--repeat 5] [--readle readle_v2]
+"""
+import argparse
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
+from rich.table import Table
+
+from tools.shared_console import console
+from tools import density_extract, lxml_extract, readle, readle_v2
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "html"
+READLES = {"readle": (readle, lxml_extract.READLE_RULES), "readle_v2": (readle_v2, lxml_extract.READLE_V2_RULES)}
+_WORD = re.compile(r"\w+")
+
+
+def word_f1(extracted: str, expected: str):
+    """Precision, recall and F1 of the extracted words (as a multiset) against the expected text."""
+    got = Counter(_WORD.findall(extracted.lower()))
+    want = Counter(_WORD.findall(expected.lower()))
+    overlap = sum((got & want).values())
+    if not overlap:
+        return 0.0, 0.0, 0.0
+    precision = overlap / sum(got.values())
+    recall = overlap / sum(want.values())
+    return precision, recall, 2 * precision * recall / (precision + recall)
+
+
+def extractors(module, rules):
+    layers = {
+        "layer1 bs4": lambda html: module.layer1_bs4(html)[1],
+        "layer1 lxml": lambda html: lxml_extract.layer1_content(lxml_extract.parse_html(html), rules),
+        "density": lambda html: density_extract.density_content(lxml_extract.parse_html(html)),
+    }
+    if module.trafilatura is not None:
+        include_tables = module is readle_v2
+        layers["trafilatura"] = lambda html: module.trafilatura.extract(html, include_comments=False, include_tables=include_tables) or ""
+    return layers
+
+
+def best_of(repeat: int, func, html: str):
+    best = float("inf")
+    result = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="best-of-N timing")
+    parser.add_argument("--readle", choices=sorted(READLES), default="readle_v2", help="which readle's layer 1 and trafilatura options")
+    args = parser.parse_args()
+
+    layers = extractors(*READLES[args.readle])
+    fixtures = sorted(FIXTURE_DIR.glob("*.html"))
+
+    table = Table(title=f"{args.readle} layers | {len(fixtures)} fixtures | ms and word F1", expand=True)
+    table.add_column("Fixture")
+    for name in layers:
+        table.add_column(f"{name} ms", justify="right")
+        table.add_column(f"{name} F1", justify="right")
+
+    totals = {name: {"ms": 0.0, "precision": 0.0, "recall": 0.0, "f1": 0.0, "scored": 0} for name in layers}
+    for fixture in fixtures:
+        html = fixture.read_text(encoding="utf-8")
+        expected_path = fixture.with_suffix(".expected.txt")
+        expected = expected_path.read_text(encoding="utf-8") if expected_path.exists() else None
+        row = [fixture.stem]
+        for name, extract in layers.items():
+            ms, text = best_of(args.repeat, extract, html)
+            totals[name]["ms"] += ms
+            row.append(f"{ms:.1f}")
+            if expected is None:
+                row.append("-")
+                continue
+            precision, recall, f1 = word_f1(text, expected)
+            for key, value in (("precision", precision), ("recall", recall), ("f1", f1)):
+                totals[name][key] += value
+            totals[name]["scored"] += 1
+            row.append(f"{f1:.4f}")
+        table.add_row(*row)
+    console.print(table)
+
+    summary = Table(title="Corpus totals", expand=True)
+    for column in ("Layer", "Total ms", "Precision", "Recall", "F1"):
+        summary.add_column(column, justify="left" if column == "Layer" else "right")
+    for name, total in totals.items():
+        scored = total["scored"] or 1
+        summary.add_row(name, f"{total['ms']:.0f}", f"{total['precision'] / scored:.4f}",
+                        f"{total['recall'] / scored:.4f}", f"{total['f1'] / scored:.4f}")
+    console.print(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: readle extraction, BeautifulSoup layer 1 vs the single-parse lxml pipeline.
+
+For each saved page it times layer 1 on both backends, then the whole
+layer 1 + trafilatura path: "bs4" parses the page twice (BeautifulSoup, then
+trafilatura's own lxml parse), "lxml" parses it once and shares the tree.
+
+Run from the repository root:
+    python -m benchmarks.bench_extraction [--repeat 5] [--readle readle_v2]
+"""
+import argparse
+import time
+from pathlib import Path
+
+from rich.table import Table
+
+from tools.shared_console import console
+from tools import lxml_extract, readle, readle_v2
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "html"
+READLES = {"readle": (readle, lxml_extract.READLE_RULES), "readle_v2": (readle_v2, lxml_extract.READLE_V2_RULES)}
+
+
+def best_of(repeat: int, func, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def layer1_lxml(html: str, rules):
+    tree = lxml_extract.parse_html(html)
+    return lxml_extract.page_title(tree), lxml_extract.layer1_content(tree, rules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="best-of-N timing")
+    parser.add_argument("--readle", choices=sorted(READLES), default="readle_v2", help="which readle's layer 1 to run")
+    args = parser.parse_args()
+
+    module, rules = READLES[args.readle]
+    fixtures = sorted(FIXTURE_DIR.glob("*.html"))
+    full_path = module.trafilatura is not None and lxml_extract.available()
+
+    table = Table(title=f"{args.readle} extraction | {len(fixtures)} fixtures | best of {args.repeat}, ms", expand=True)
+    table.add_column("Fixture")
+    table.add_column("KB", justify="right")
+    table.add_column("L1 bs4", justify="right")
+    table.add_column("L1 lxml", justify="right")
+    table.add_column("L1 gain", justify="right")
+    table.add_column("L1 same", justify="center")
+    if full_path:
+        table.add_column("Full bs4", justify="right")
+        table.add_column("Full lxml", justify="right")
+        table.add_column("Full gain", justify="right")
+        table.add_column("Full same", justify="center")
+
+    totals = {"bs4": 0.0, "lxml": 0.0}
+    for fixture in fixtures:
+        html = fixture.read_text(encoding="utf-8")
+        bs4_ms, bs4_out = best_of(args.repeat, module.layer1_bs4, html)
+        lxml_ms, lxml_out = best_of(args.repeat, layer1_lxml, html, rules)
+        row = [fixture.stem, f"{len(html) / 1024:.0f}", f"{bs4_ms:.1f}", f"{lxml_ms:.1f}", f"{bs4_ms / lxml_ms:.1f}x",
+               "[green]yes[/green]" if bs4_out == lxml_out else "[red]NO[/red]"]
+        if full_path:
+            # Past the layer-1 threshold both paths return before trafilatura;
+            # raise it so every page runs the whole pipeline.
+            threshold = module.MINIMUM_CONTENT_LENGTH
+            module.MINIMUM_CONTENT_LENGTH = 10 ** 9
+            try:
+                bs4_full_ms, bs4_full = best_of(args.repeat, module.extract_all_layers, fixture.stem, html, "bs4")
+                lxml_full_ms, lxml_full = best_of(args.repeat, module.extract_all_layers, fixture.stem, html, "lxml")
+            finally:
+                module.MINIMUM_CONTENT_LENGTH = threshold
+            totals["bs4"] += bs4_full_ms
+            totals["lxml"] += lxml_full_ms
+            row += [f"{bs4_full_ms:.1f}", f"{lxml_full_ms:.1f}", f"{bs4_full_ms / lxml_full_ms:.1f}x",
+                    "[green]yes[/green]" if bs4_full == lxml_full else "[red]NO[/red]"]
+        table.add_row(*row)
+
+    console.print(table)
+    if full_path and totals["lxml"]:
+        console.print(f"[bold]Whole corpus, layer 1 + trafilatura:[/bold] bs4 {totals['bs4']:.0f} ms, "
+                      f"lxml {totals['lxml']:.0f} ms ({totals['bs4'] / totals['lxml']:.1f}x)")
+    elif not full_path:
+        console.print("[yellow]trafilatura or lxml is not installed; timed layer 1 only.[/yellow]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Microbenchmark: per-result scoring vs. the batch ResultScorer.
+
+BM25 is computed once per batch whichever path runs, so it is timed on its
+own and both paths are given the same BM25 scores: "Scalar" and "Batch" time
+everything built on top of it, and "End to end" adds the BM25 time to both.
+
+Run from the repository root:
+    python -m benchmarks.bench_result_scoring [--size 10000]
+"""
+import argparse
+import copy
+import random
+import time
+from datetime import datetime
+
+from rich.table import Table
+
+from tools.shared_console import console
+from pustakapersona.personasearchweb_optimaldebug_fix import EnhancedSearchPersona, SearchResult
+
+WORDS = [
+    "the", "latest", "release", "of", "python", "library", "bitcoin", "price", "today", "market",
+    "research", "paper", "official", "documentation", "guide", "install", "pip", "api", "trading",
+    "volume", "news", "breaking", "study", "clinical", "treatment", "company", "earnings", "stock",
+    "click here", "amazing", "crypto", "coin", "framework", "version", "tutorial", "report", "2025",
+]
+DOMAINS = [
+    "github.com", "docs.github.com", "stackoverflow.com", "pypi.org", "coinmarketcap.com", "coingecko.com",
+    "reuters.com", "bbc.com", "arxiv.org", "nature.com", "nih.gov", "mit.edu", "example.org",
+    "medium.com", "reddit.com", "random-blog.net", "en.wikipedia.org", "sec.gov", "forbes.com",
+]
+QUERIES = {
+    "programming": "requests python library latest version",
+    "crypto": "bitcoin price today usd",
+    "academic": "transformer research paper",
+    "general": "weather jakarta",
+}
+
+
+def make_results(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    results = []
+    for i in range(size):
+        domain = rng.choice(DOMAINS)
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 9)))
+        snippet = " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 40)))
+        results.append(SearchResult(
+            title=title.title(),
+            url=f"https://www.{domain}/page/{i}",
+            snippet=snippet,
+            domain=domain,
+            relevance_score=0.0,
+        ))
+    return results
+
+
+def lexical_scores(persona, results, query):
+    return persona.relevance_model.score_batch([f"{r.title} {r.snippet}".lower() for r in results], query)
+
+
+def score_scalar(persona, results, query, intent, lexical):
+    for r, lexical_score in zip(results, lexical):
+        r.source_quality = persona._calculate_source_quality(r.url, r.title, r.snippet, intent)
+        r.relevance_score = persona._calculate_relevance_score(r, query, intent, lexical_score=float(lexical_score))
+        r.intent_match = persona._calculate_intent_match_score(r, query, intent)
+        r.final_score = persona._calculate_final_score(r, query, intent)
+
+
+def ranking(results):
+    return [r.url for r in sorted(results, key=lambda x: x.final_score, reverse=True)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3, help="best-of-N timing")
+    args = parser.parse_args()
+
+    persona = EnhancedSearchPersona()
+    persona.relevance_model.corpus_stats = None
+    base = make_results(args.size)
+    now = datetime.now()
+
+    table = Table(title=f"Result scoring | {args.size} results", expand=True)
+    table.add_column("Intent")
+    table.add_column("BM25 (ms)", justify="right")
+    table.add_column("Scalar (ms)", justify="right")
+    table.add_column("Batch (ms)", justify="right")
+    table.add_column("Speed-up", justify="right")
+    table.add_column("End to end", justify="right")
+    table.add_column("Identical", justify="center")
+
+    for intent, query in QUERIES.items():
+        scalar_results = copy.deepcopy(base)
+        batch_results = copy.deepcopy(base)
+        bm25_ms = scalar_ms = batch_ms = float("inf")
+
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            lexical = lexical_scores(persona, base, query)
+            bm25_ms = min(bm25_ms, (time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            score_scalar(persona, scalar_results, query, intent, lexical)
+            scalar_ms = min(scalar_ms, (time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            persona.result_scorer.score_batch(batch_results, query, intent, now=now, lexical=lexical)
+            batch_ms = min(batch_ms, (time.perf_counter() - start) * 1000)
+
+        identical = all(
+            (a.final_score, a.relevance_score, a.source_quality, a.intent_match)
+            == (b.final_score, b.relevance_score, b.source_quality, b.intent_match)
+            for a, b in zip(scalar_results, batch_results)
+        ) and ranking(scalar_results) == ranking(batch_results)
+
+        table.add_row(intent, f"{bm25_ms:.1f}", f"{scalar_ms:.1f}", f"{batch_ms:.1f}", f"{scalar_ms / batch_ms:.1f}x",
+                      f"{(bm25_ms + scalar_ms) / (bm25_ms + batch_ms):.1f}x",
+                      "[green]yes[/green]" if identical else "[red]NO[/red]")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
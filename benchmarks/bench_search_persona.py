@@ -0,0 +1,327 @@
+"""Benchmark: end-to-end search persona replay on recorded Brave pages and LLM streams.
+
+Every case in fixtures/search_persona/manifest.json is run through
+EnhancedSearchPersona with its Brave pages served from disk (after the recorded
+network latency) and the LLM replaying its recorded stream, so the numbers
+cover fan-out, parsing, scoring, ranking and time to first token without
+touching the network.
+
+Run from the repository root:
+    python -m benchmarks.bench_search_persona [--repeat 3] [--speed 1.0]
+        [--output report.json] [--compare baseline.json]
+    python -m benchmarks.bench_search_persona --record CASE_ID [CASE_ID ...]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from rich.table import Table
+
+from tools import structured_log
+from tools.shared_console import console
+from tools.brave_parser import parse_organic_results
+from tools.search_backends import FixtureBackend, _empty_response
+import pustakapersona.personasearchweb_optimaldebug_fix as persona_module
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "search_persona"
+STAGES = ("fanout", "parse", "score", "rank", "synthesis_ttft", "ttft", "total")
+RANKING_DEPTH = 6
+
+
+class StageClock:
+    """Per-run stage timings in milliseconds, safe to add to from search threads."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self.totals: Dict[str, float] = {"parse": 0.0, "score": 0.0}
+        self._lock = threading.Lock()
+
+    def mark(self, name: str):
+        self.marks.setdefault(name, time.perf_counter())
+
+    def add(self, stage: str, elapsed: float):
+        with self._lock:
+            self.totals[stage] += elapsed * 1000
+
+    def since(self, name: str, until: str) -> Optional[float]:
+        if name not in self.marks or until not in self.marks:
+            return None
+        return (self.marks[until] - self.marks[name]) * 1000
+
+    def report(self) -> Dict[str, Optional[float]]:
+        self.marks["call"] = self.start
+        return {
+            "fanout": self.since("call", "synthesis"),
+            "parse": self.totals["parse"],
+            "score": self.totals["score"],
+            "rank": self.since("synthesis", "language"),
+            "synthesis_ttft": self.since("synthesis", "first_token"),
+            "ttft": self.since("call", "first_chunk"),
+            "total": self.since("call", "done"),
+        }
+
+
+class RecordedPageBackend(FixtureBackend):
+    """Serve the case's Brave pages by query order, sleeping the recorded latency
+    and timing the HTML parse."""
+
+    name = "recorded"
+
+    def __init__(self, pages: Dict[str, Dict], speed: float, clock: StageClock):
+        super().__init__(directory=str(FIXTURE_DIR))
+        self.pages = pages
+        self.speed = speed
+        self.clock = clock
+
+    def search(self, query: str, limit: int = 12) -> Dict:
+        page = self.pages.get(query)
+        if page is None:
+            return _empty_response(query, self.name)
+        time.sleep(page["latency_ms"] / 1000 * self.speed)
+        html = (self.directory / page["file"]).read_text(encoding="utf-8")
+        start = time.perf_counter()
+        results = parse_organic_results(html, limit)
+        self.clock.add("parse", time.perf_counter() - start)
+        return {"status": "success", "searchParameters": {"query": query, "engine": self.name}, "organic_results": results}
+
+
+def replay_stream(recording: Dict, speed: float, clock: StageClock):
+    time.sleep(recording["ttft_ms"] / 1000 * speed)
+    clock.mark("first_token")
+    for delay_ms, text in recording["chunks"]:
+        time.sleep(delay_ms / 1000 * speed)
+        yield text
+
+
+def run_case(case: Dict, speed: float) -> Dict:
+    llm = json.loads((FIXTURE_DIR / case["llm"]).read_text(encoding="utf-8"))
+    persona = persona_module.EnhancedSearchPersona()
+    persona.relevance_model.corpus_stats = None
+
+    intent = persona._classify_query_intent(case["search_query"])
+    queries = persona._generate_intent_based_queries(case["search_query"], intent, max_queries=persona.fanout_config["max_queries"])
+    clock = StageClock()
+    persona.search_backend = RecordedPageBackend(dict(zip(queries, case["pages"])), speed, clock)
+
+    score_batch = persona.result_scorer.score_batch
+
+    def timed_score_batch(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return score_batch(*args, **kwargs)
+        finally:
+            clock.add("score", time.perf_counter() - start)
+
+    persona.result_scorer.score_batch = timed_score_batch
+
+    synthesize = persona._synthesize_results
+
+    def timed_synthesize(*args, **kwargs):
+        clock.mark("synthesis")
+        return synthesize(*args, **kwargs)
+
+    persona._synthesize_results = timed_synthesize
+
+    def detect_language(text: str) -> str:
+        clock.mark("language")
+        time.sleep(llm["language"]["latency_ms"] / 1000 * speed)
+        return llm["language"]["text"]
+
+    streams = iter([llm["synthesis"], llm.get("refine", llm["synthesis"])])
+
+    def generate_response(messages, stream=False, **kwargs):
+        return replay_stream(next(streams), speed, clock)
+
+    saved = (persona_module._search_persona, persona_module.generate_response, persona_module.detect_target_language_from_text)
+    persona_module._search_persona = persona
+    persona_module.generate_response = generate_response
+    persona_module.detect_target_language_from_text = detect_language
+    try:
+        clock.start = time.perf_counter()
+        answer = []
+        for chunk in persona_module.run_enhanced_search_persona(case["user_query"], case["search_query"]):
+            clock.mark("first_chunk")
+            answer.append(chunk)
+        clock.mark("done")
+    finally:
+        persona_module._search_persona, persona_module.generate_response, persona_module.detect_target_language_from_text = saved
+
+    return {
+        "intent": intent,
+        "stages": clock.report(),
+        "fanout": dict(persona.last_fanout),
+        "ranking": [res.url for res in persona.last_search_results[:RANKING_DEPTH]],
+        "answer_chars": len("".join(answer)),
+    }
+
+
+def median(values: List[Optional[float]]) -> Optional[float]:
+    present = [value for value in values if value is not None]
+    return round(statistics.median(present), 2) if present else None
+
+
+def summarize_case(case: Dict, runs: List[Dict]) -> Dict:
+    rankings = [run["ranking"] for run in runs]
+    reference = max(rankings, key=rankings.count)
+    return {
+        "expected_intent": case["intent"],
+        "intent": runs[0]["intent"],
+        "fanout": runs[0]["fanout"],
+        "stages_ms": {stage: median([run["stages"][stage] for run in runs]) for stage in STAGES},
+        "ranking": reference,
+        "ranking_stability": round(rankings.count(reference) / len(rankings), 3),
+    }
+
+
+def overlap(a: List[str], b: List[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(set(a) & set(b)) / max(len(a), len(b))
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.0f}"
+
+
+def print_report(report: Dict, baseline: Optional[Dict]):
+    title = f"Search persona replay | commit {report['commit']} | repeat={report['repeat']} speed={report['speed']}"
+    if baseline:
+        title += f" | vs {baseline.get('commit')}"
+    table = Table(title=title, expand=True)
+    table.add_column("Case")
+    table.add_column("Intent")
+    table.add_column("Queries", justify="right")
+    for stage in STAGES:
+        table.add_column(f"{stage} (ms)", justify="right")
+    table.add_column("Stable", justify="right")
+    if baseline:
+        table.add_column("Rank overlap", justify="right")
+
+    for case_id, case in report["cases"].items():
+        intent = case["intent"] if case["intent"] == case["expected_intent"] else f"[red]{case['intent']}[/red]"
+        fanout = case["fanout"]
+        row = [case_id, intent, f"{fanout.get('used', '-')}/{fanout.get('planned', '-')} ({fanout.get('waves', '-')}w)"]
+        base = (baseline or {}).get("cases", {}).get(case_id)
+        for stage in STAGES:
+            cell = format_ms(case["stages_ms"][stage])
+            if base and case["stages_ms"][stage] is not None and base["stages_ms"].get(stage):
+                delta = (case["stages_ms"][stage] - base["stages_ms"][stage]) / base["stages_ms"][stage]
+                color = "red" if delta > 0.1 else "green" if delta < -0.1 else "dim"
+                cell += f" [{color}]{delta:+.0%}[/{color}]"
+            row.append(cell)
+        row.append(f"{case['ranking_stability']:.0%}")
+        if baseline:
+            row.append(f"{overlap(case['ranking'], base['ranking']):.0%}" if base else "-")
+        table.add_row(*row)
+    console.print(table)
+
+
+def record_case(case: Dict):
+    """Replace a case's pages and LLM stream with live Brave pages and a live
+    generation from core.fireworks_api_client."""
+    from tools.upgradescraper import fetch_search_page, generate_headers
+    from tools.proxy_pool import get_proxy_pool
+    from core.fireworks_api_client import generate_response
+    import tools.lang_utils as lang_utils
+
+    persona = persona_module.EnhancedSearchPersona()
+    intent = persona._classify_query_intent(case["search_query"])
+    queries = persona._generate_intent_based_queries(case["search_query"], intent, max_queries=persona.fanout_config["max_queries"])
+    for index, query in enumerate(queries):
+        start = time.perf_counter()
+        response = fetch_search_page(f"https://search.brave.com/search?q={quote(query)}", generate_headers(), proxies=get_proxy_pool().get_proxies())
+        page = {"file": f"{case['id']}-{index}.html", "latency_ms": int((time.perf_counter() - start) * 1000)}
+        (FIXTURE_DIR / page["file"]).write_text(response.text, encoding="utf-8")
+        if index < len(case["pages"]):
+            case["pages"][index] = page
+        else:
+            case["pages"].append(page)
+
+    recorded = {}
+
+    def recording_generate(messages, stream=False, **kwargs):
+        if not stream:
+            start = time.perf_counter()
+            text = generate_response(messages, stream=False, **kwargs)
+            text = "".join(text) if isinstance(text, list) else str(text)
+            recorded["language"] = {"latency_ms": int((time.perf_counter() - start) * 1000), "text": text.strip().lower()}
+            return text
+        return record_stream(messages, kwargs)
+
+    def record_stream(messages, kwargs):
+        chunks = []
+        recording = recorded["refine" if "synthesis" in recorded else "synthesis"] = {"ttft_ms": 0, "chunks": chunks}
+        start = last = time.perf_counter()
+        for chunk in generate_response(messages, stream=True, **kwargs):
+            now = time.perf_counter()
+            if chunks:
+                chunks.append([int((now - last) * 1000), chunk])
+            else:
+                recording["ttft_ms"] = int((now - start) * 1000)
+                chunks.append([0, chunk])
+            last = now
+            yield chunk
+
+    saved = (persona_module.generate_response, lang_utils.generate_response)
+    persona_module.generate_response = recording_generate
+    lang_utils.generate_response = recording_generate
+    try:
+        answer = "".join(persona.search_with_context(case["user_query"], case["search_query"], stream=True))
+    finally:
+        persona_module.generate_response, lang_utils.generate_response = saved
+
+    recorded.setdefault("language", {"latency_ms": 0, "text": "english"})
+    (FIXTURE_DIR / case["llm"]).write_text(json.dumps(recorded, ensure_ascii=False, indent=1), encoding="utf-8")
+    console.print(f"[green]Recorded {case['id']}: {len(queries)} pages, {len(answer)} answer chars[/green]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; stage timings are medians")
+    parser.add_argument("--speed", type=float, default=1.0, help="scale recorded network and LLM delays (0 = no waiting)")
+    parser.add_argument("--case", action="append", help="only run these case ids")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="JSON report from another commit to diff against")
+    parser.add_argument("--record", nargs="+", metavar="CASE_ID", help="re-record these cases live (needs network and an LLM key)")
+    args = parser.parse_args()
+
+    structured_log.configure(level="warning")
+    manifest_path = FIXTURE_DIR / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    if args.record:
+        for case in manifest["cases"]:
+            if case["id"] in args.record:
+                record_case(case)
+        manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+        return
+
+    cases = [case for case in manifest["cases"] if not args.case or case["id"] in args.case]
+    report = {"commit": git_commit(), "repeat": args.repeat, "speed": args.speed, "cases": {}}
+    for case in cases:
+        runs = [run_case(case, args.speed) for _ in range(args.repeat)]
+        report["cases"][case["id"]] = summarize_case(case, runs)
+
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+    print_report(report, baseline)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        console.print(f"[dim]Report written to {args.output}[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark: TextRank extractive pre-summary time and prompt reduction.
+
+Runs tools.textrank.extractive_summary over the main texts in
+fixtures/html/*.expected.txt (and any extra text files given).
+
+Run from the repository root:
+    python -m benchmarks.bench_textrank [--budget 2000] [--repeat 5] [file ...]
+"""
+import argparse
+import time
+from pathlib import Path
+
+from rich.table import Table
+
+from tools.shared_console import console
+from tools.text_utils import estimate_tokens
+from tools.textrank import extractive_summary, split_sentences
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", type=Path, help="extra plain-text documents")
+    parser.add_argument("--budget", type=int, default=2000, help="summary budget in tokens (PRESUMMARY_CONFIG budget_tokens)")
+    parser.add_argument("--repeat", type=int, default=5, help="best-of-N timing")
+    args = parser.parse_args()
+
+    documents = sorted(FIXTURE_DIR.glob("*.expected.txt")) + args.files
+    table = Table(title=f"TextRank pre-summary | budget {args.budget} tokens | best of {args.repeat}", expand=True)
+    for column in ("Document", "Sentences", "Tokens in", "Tokens out", "Kept", "ms"):
+        table.add_column(column, justify="left" if column == "Document" else "right")
+
+    for path in documents:
+        text = path.read_text(encoding="utf-8")
+        best = float("inf")
+        summary = text
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            summary = extractive_summary(text, args.budget)
+            best = min(best, (time.perf_counter() - start) * 1000)
+        tokens_in, tokens_out = estimate_tokens(text), estimate_tokens(summary)
+        table.add_row(path.name.split(".")[0], str(len(split_sentences(text))), str(tokens_in), str(tokens_out),
+                      f"{tokens_out / max(tokens_in, 1):.0%}", f"{best:.1f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Rebuild the fixtures/html/<page>.expected.txt gold texts.
+
+The gold text of a page is the text of its article container, picked by
+hand below, minus the parts chosen by hand as not belonging to the article.
+It is read with BeautifulSoup's html.parser, so it shares no code with the
+extractors the benchmarks score against it.
+
+Run from the repository root:
+    python -m benchmarks.gold_text [--check]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from tools.shared_console import console
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "html"
+# Never article text on any page: page furniture, embedded media captions
+# and "related" boxes.
+COMMON_DROP = ("script", "style", "noscript", "nav", "form", "aside", "figure")
+# fixture -> (article container, extra selectors to drop inside it)
+GOLD = {
+    "blog-article": ("article.post", ()),
+    "div-content": ("div#content", ()),
+    "docs-role-main": ("[role=main]", ()),
+    "inline-links": ("article.post", ("div.share-bar", "ul.related-links")),
+    "malformed": ("article", ()),
+    "news-main": ("main", ()),
+    "no-container": ("div.wrap", ()),
+    "short-page": ("main", ()),
+    "wordpress-entry": ("div.entry-content", ()),
+}
+BLOCKS = ("p", "div", "section", "article", "main", "li", "ul", "ol", "pre", "blockquote",
+          "table", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6", "br", "hr")
+
+
+def gold_text(html: str, container: str, drop=()) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    root = soup.select_one(container)
+    if root is None:
+        raise ValueError(f"no element matches {container!r}")
+    for selector in COMMON_DROP + tuple(drop):
+        for element in root.select(selector):
+            element.decompose()
+    for element in root.find_all(BLOCKS):
+        element.insert_before("\n")
+        element.insert_after("\n")
+    lines = (" ".join(line.split()) for line in root.get_text().splitlines())
+    return "\n".join(line for line in lines if line) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="report out-of-date gold files instead of writing them")
+    args = parser.parse_args()
+
+    stale = []
+    for name, (container, drop) in sorted(GOLD.items()):
+        html = (FIXTURE_DIR / f"{name}.html").read_text(encoding="utf-8")
+        path = FIXTURE_DIR / f"{name}.expected.txt"
+        text = gold_text(html, container, drop)
+        if path.exists() and path.read_text(encoding="utf-8") == text:
+            continue
+        stale.append(name)
+        if not args.check:
+            path.write_text(text, encoding="utf-8")
+    verb = "out of date" if args.check else "written"
+    console.print(f"{len(stale)} gold file(s) {verb}" + (f": {', '.join(stale)}" if stale else ""))
+    if args.check and stale:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 import json
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
-from tools.shared_console import console
+from tools.structured_log import get_logger
 from .fireworks_api_client import generate_response, MODEL_UTAMA
 
+log = get_logger("core.advanced_router")
+
 
 @dataclass
 class RouterDecision:
@@ -73,7 +75,7 @@ TOOLS & INTENTS:
    - Requests to write, modify, or explain code.
 
 5) READLE
-   - Read and summarize content from a URL. If chosen, include the URL in suggested_query.
+   - Read and summarize content from a single URL. If chosen, include the URL in suggested_query.
 
 6) ADDRESS_ANALYSIS
    - Analyze a crypto address. The address may be EVM (0x...), BTC (1..., 3..., bc1...), Solana-like, etc.
@@ -87,6 +89,10 @@ TOOLS & INTENTS:
    - Extract the tweet ID from URLs or use provided ID directly in suggested_query.
    - Examples: "reply to this tweet: 1234567890", "generate reply for https://x.com/user/status/1234567890"
 
+9) BATCH_READLE
+   - Read and summarize two or more URLs together, or a file that lists URLs.
+   - Put all the URLs (space separated) or the file path in suggested_query.
+
 
 RESPONSE FORMAT (STRICT JSON):
 {{
@@ -96,11 +102,12 @@ RESPONSE FORMAT (STRICT JSON):
   "suggested_query": "string to pass to the tool"
 }}
 
-VALID INTENTS: GENERAL_CHAT, MEMORY_RECALL, CONTEXT_ANSWER, CODE_GENERATOR, READLE, ADDRESS_ANALYSIS, FRESH_SEARCH, GENERATE_X_REPLY
+VALID INTENTS: GENERAL_CHAT, MEMORY_RECALL, CONTEXT_ANSWER, CODE_GENERATOR, READLE, BATCH_READLE, ADDRESS_ANALYSIS, FRESH_SEARCH, GENERATE_X_REPLY
 
 NOTES:
 - Do not include markdown in the JSON. No backticks. No extra keys.
 - If intent is READLE, suggested_query should be the URL only.
+- If intent is BATCH_READLE, suggested_query should be the URLs or the file path only.
 - If intent is ADDRESS_ANALYSIS, suggested_query should be the extracted address only.
 - If intent is GENERATE_X_REPLY, suggested_query should be the tweet ID only.
 - If intent is CONTEXT_ANSWER and there are previous results available, set intent accordingly.
@@ -134,6 +141,7 @@ NOTES:
                 "MEMORY_RECALL": "memory_recall",
                 "CODE_GENERATOR": "code_generator",
                 "READLE": "readle",
+                "BATCH_READLE": "batch_readle",
                 "CONTEXT_ANSWER": "context_answer",
                 "ADDRESS_ANALYSIS": "address_analyzer",
                 "FRESH_SEARCH": "web_search",
@@ -175,23 +183,23 @@ NOTES:
 
         except (json.JSONDecodeError, ValueError, KeyError) as e:
             debug_text = response_text if 'response_text' in locals() else 'No response'
-            console.log(f"[yellow]LLM classification failed: {e}[/yellow]\nResponse: {debug_text}")
+            log.warning(f"[yellow]LLM classification failed: {e}[/yellow]\nResponse: {debug_text}")
             return None
         except Exception as e:
-            console.log(f"[red]LLM error: {e}[/red]")
+            log.error(f"[red]LLM error: {e}[/red]")
             return None
 
     def route_with_advanced_intelligence(self, user_input: str, conversation_history: List[Dict]) -> Dict:
-        console.log("[cyan]Advanced Router analyzing intent (LLM-based)...[/cyan]")
+        log.info("[cyan]Advanced Router analyzing intent (LLM-based)...[/cyan]")
         context, has_search_results = self._extract_conversation_context(conversation_history)
 
         llm_decision = self._llm_intent_classification(user_input, context, has_search_results)
         if llm_decision and llm_decision.confidence >= 0.6:
-            console.log(f"[green]LLM Decision:[/green] {llm_decision.tool} (confidence: {llm_decision.confidence:.2f})")
-            console.log(f"[dim]   Reasoning: {llm_decision.reasoning}[/dim]")
+            log.info(f"[green]LLM Decision:[/green] {llm_decision.tool} (confidence: {llm_decision.confidence:.2f})")
+            log.debug("[dim]   Reasoning: %s[/dim]", llm_decision.reasoning)
             return llm_decision.__dict__
 
-        console.log("[yellow]LLM confidence low or failed. Falling back to GENERAL_CHAT.[/yellow]")
+        log.warning("[yellow]LLM confidence low or failed. Falling back to GENERAL_CHAT.[/yellow]")
         fallback = RouterDecision(
             tool="general_chat",
             query=user_input,
@@ -1,8 +1,10 @@
 import requests
 import json
-from tools.shared_console import console
+from tools.structured_log import get_logger
 import os
 
+log = get_logger("core.fireworks_api_client")
+
 CONFIG = {
     "fireworks": {
         "api_url": "https://api.fireworks.ai/inference/v1/chat/completions",
@@ -30,7 +32,7 @@ def generate_response(messages: list, stream: bool = False, model: str = None, t
     
     if layanan not in CONFIG:
         error_msg = f"\n[ERROR] Service '{layanan}' is not recognized. Available services: {list(CONFIG.keys())}"
-        console.log(f"[bold red]API Client Config Error:[/bold red] {error_msg}")
+        log.error(f"[bold red]API Client Config Error:[/bold red] {error_msg}")
         yield error_msg
         return
 
@@ -62,7 +64,7 @@ def generate_response(messages: list, stream: bool = False, model: str = None, t
         if layanan == "fireworks":
             payload["response_format"] = response_format
         else:
-            console.log(f"[yellow]Warning:[/yellow] Parameter 'response_format' is not supported by service '{layanan}' and will be ignored.")
+            log.warning(f"[yellow]Warning:[/yellow] Parameter 'response_format' is not supported by service '{layanan}' and will be ignored.")
         
     headers["Accept"] = "text/event-stream" if stream else "application/json"
 
@@ -95,10 +97,10 @@ def generate_response(messages: list, stream: bool = False, model: str = None, t
 
     # --- Error Handling ---
     except requests.exceptions.RequestException as e:
-        console.log(f"[bold red]{layanan.capitalize()} API Client Error:[/bold red] Failed to connect to API. Details: {e}")
+        log.error(f"[bold red]{layanan.capitalize()} API Client Error:[/bold red] Failed to connect to API. Details: {e}")
         yield f"\n[ERROR] Sorry, there's a connection problem to {layanan.capitalize()} server. Please try again later."
     except Exception as e:
-        console.log(f"[bold red]{layanan.capitalize()} API Client Critical Error:[/bold red] {e}")
+        log.error(f"[bold red]{layanan.capitalize()} API Client Critical Error:[/bold red] {e}")
         yield f"\n[ERROR] An unexpected error occurred in the system."
 
 def get_current_model_config():
@@ -113,14 +115,14 @@ def update_model_config(model_path: str, provider: str):
     global CURRENT_MODEL, CURRENT_PROVIDER
     
     if provider not in CONFIG:
-        console.log(f"[red]Error: Provider '{provider}' not available. Available: {list(CONFIG.keys())}[/red]")
+        log.error(f"[red]Error: Provider '{provider}' not available. Available: {list(CONFIG.keys())}[/red]")
         return False
     
     try:
         CURRENT_MODEL = model_path
         CURRENT_PROVIDER = provider
-        console.log(f"[green]Model configuration updated: {provider}/{model_path.split('/')[-1]}[/green]")
+        log.info(f"[green]Model configuration updated: {provider}/{model_path.split('/')[-1]}[/green]")
         return True
     except Exception as e:
-        console.log(f"[red]Error updating model config: {e}[/red]")
+        log.error(f"[red]Error updating model config: {e}[/red]")
         return False
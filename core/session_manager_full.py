@@ -6,10 +6,13 @@ from InquirerPy import inquirer
 from InquirerPy.base.control import Choice
 import chromadb
 from tools.shared_console import console
+from tools.structured_log import get_logger
 from .fireworks_api_client import generate_response
 import chromadb
 from chromadb.config import Settings
 
+log = get_logger("core.session_manager_full")
+
 chromadb.Client(Settings(anonymized_telemetry=False))
 
 SESSION_DIR = ".sessions"
@@ -24,9 +27,9 @@ class LongTermMemory:
             try:
                 client = chromadb.PersistentClient(path=MEMORY_DB_PATH)
                 cls._instance.collection = client.get_or_create_collection(name="cross_session_memory")
-                console.log("[green]Long Term Memory (ChromaDB) connected.[/green]")
+                log.info("[green]Long Term Memory (ChromaDB) connected.[/green]")
             except Exception as e:
-                console.log(f"[red]Failed to connect to ChromaDB: {e}[/red]")
+                log.error(f"[red]Failed to connect to ChromaDB: {e}[/red]")
                 cls._instance.collection = None
         return cls._instance
 
@@ -46,7 +49,7 @@ class LongTermMemory:
                 ids=[doc_id]
             )
         except Exception as e:
-            console.log(f"[red]Failed to add ChromaDB memory: {e}[/red]")
+            log.error(f"[red]Failed to add ChromaDB memory: {e}[/red]")
 
     def recall_memory(self, query: str, n_results: int = 3) -> list:
         if not self.collection: return []
@@ -54,7 +57,7 @@ class LongTermMemory:
             results = self.collection.query(query_texts=[query], n_results=n_results)
             return results['documents'][0] if results and results['documents'] else []
         except Exception as e:
-            console.log(f"[red]Failed to recall from ChromaDB: {e}[/red]")
+            log.error(f"[red]Failed to recall from ChromaDB: {e}[/red]")
             return []
 
 def list_linear_sessions() -> list:
@@ -80,11 +83,11 @@ def save_linear_session(messages: list, filename: str):
         with open(os.path.join(SESSION_DIR, filename), 'w') as f:
             json.dump(messages, f, indent=2)
     except IOError as e:
-        console.log(f"[Warning] Failed to save linear session: {e}")
+        log.warning(f"Failed to save linear session: {e}")
 
 def recall_and_synthesize(query: str):
 
-    console.log(f"[magenta]🧠 Memory Persona activated. Recalling about: '{query}'[/magenta]")
+    log.info(f"[magenta]🧠 Memory Persona activated. Recalling about: '{query}'[/magenta]")
     ltm = LongTermMemory()
     
     recalled_memories = ltm.recall_memory(query, n_results=4)
@@ -114,7 +117,7 @@ def recall_and_synthesize(query: str):
     try:
         yield from generate_response(messages, stream=True, temperature=0.1)
     except Exception as e:
-        console.log(f"[red]Failed to synthesize memory: {e}[/red]")
+        log.error(f"[red]Failed to synthesize memory: {e}[/red]")
         yield "Sorry, I found relevant memories but failed to summarize them."
 
 def prompt_session_choice() -> tuple[list, str, str]:
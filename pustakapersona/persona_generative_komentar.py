@@ -1,24 +1,20 @@
-from tools.shared_console import console
+from tools.structured_log import get_logger
 import json
 import os
 from typing import List, Dict, Optional
 from tools.lang_utils import detect_target_language_from_messages
 
+log = get_logger("pustakapersona.persona_generative_komentar")
+
 try:
     from tools.tweeter_toolkit.twettgetdesc import TweetScraper
     from tools.tweeter_toolkit.credential import load_credentials
     from core.fireworks_api_client import generate_response
 except ImportError as e:
-    console.log(f"[red]Import error: {e}[/red]")
+    log.error(f"[red]Import error: {e}[/red]")
     def load_credentials(path): return None
     def generate_response(messages, stream, temperature): return ["Error: LLM client not found."]
 
-VERBOSE = False
-
-def _vlog(message: str):
-    if VERBOSE:
-        console.log(message)
-
 def validate_credentials(credentials):
     if not credentials:
         return False, "Credentials object is None or empty"
@@ -50,22 +46,22 @@ def load_and_validate_credentials():
         os.path.expanduser("~/.twitter_credentials.json")
     ]
     
-    _vlog("[yellow]Attempting to load credentials from multiple paths...[/yellow]")
+    log.debug("[yellow]Attempting to load credentials from multiple paths...[/yellow]")
     
     for path in credential_paths:
         if os.path.exists(path):
-            _vlog(f"[blue]Trying to load from: {path}[/blue]")
+            log.debug("[blue]Trying to load from: %s[/blue]", path)
             try:
                 credentials = load_credentials(path)
                 if credentials:
                     is_valid, message = validate_credentials(credentials)
                     if is_valid:
-                        _vlog(f"[green]✓ Valid credentials loaded from: {path}[/green]")
+                        log.debug("[green]✓ Valid credentials loaded from: %s[/green]", path)
                         return credentials, None
                     else:
-                        _vlog(f"[yellow]Invalid credentials in {path}: {message}[/yellow]")
+                        log.debug("[yellow]Invalid credentials in %s: %s[/yellow]", path, message)
             except Exception as e:
-                console.log(f"[red]Error loading {path}: {e}[/red]")
+                log.error(f"[red]Error loading {path}: {e}[/red]")
     
     return None, "No valid credentials found in any of the expected paths"
 
@@ -74,21 +70,21 @@ def _detect_target_language(messages: Optional[List[Dict]]) -> str:
 
 def run_generative_commenter(tweet_id: str, messages: Optional[List[Dict]] = None):
 
-    _vlog(f"[green]Persona 'generative_commenter' v2.0 starting to process Tweet ID: {tweet_id}[/green]")
+    log.debug("[green]Persona 'generative_commenter' v2.0 starting to process Tweet ID: %s[/green]", tweet_id)
     
     try:
-        _vlog("[yellow]Loading and validating Twitter credentials...[/yellow]")
+        log.debug("[yellow]Loading and validating Twitter credentials...[/yellow]")
         credentials, error_msg = load_and_validate_credentials()
         
         if not credentials:
-            console.log(f"[red]Failed to load valid credentials: {error_msg}[/red]")
+            log.error(f"[red]Failed to load valid credentials: {error_msg}[/red]")
             yield f"Sorry, I could not load valid Twitter credentials. Error: `{error_msg}`\n\n"
             yield f"Please ensure your result.json file exists with: authorization, x-csrf-token, cookie, user-agent"
             return
         
-        _vlog("[green]✓ All credentials validated successfully[/green]")
+        log.debug("[green]✓ All credentials validated successfully[/green]")
         
-        _vlog("[yellow]...Fetching tweet content...[/yellow]")
+        log.debug("[yellow]...Fetching tweet content...[/yellow]")
         
         yield f"### 🐦 Twitter Reply Generator\n"
         yield f"**Tweet ID:** {tweet_id}\n\n"
@@ -106,21 +102,21 @@ def run_generative_commenter(tweet_id: str, messages: Optional[List[Dict]] = Non
             
             if tweet_data["status"] != "success":
                 error_msg = tweet_data.get("message", "Unknown error")
-                console.log(f"[red]Failed to fetch tweet: {error_msg}[/red]")
+                log.error(f"[red]Failed to fetch tweet: {error_msg}[/red]")
                 yield f"\n❌ **Error:** Could not fetch tweet content. {error_msg}"
                 return
             
             tweet_description = tweet_data["description"]
-            _vlog("[green]✓ Tweet content fetched successfully[/green]")
+            log.debug("[green]✓ Tweet content fetched successfully[/green]")
             
         except Exception as e:
-            console.log(f"[red]Error fetching tweet: {e}[/red]")
+            log.error(f"[red]Error fetching tweet: {e}[/red]")
             yield f"\n❌ **Error:** Failed to fetch tweet content: {str(e)}"
             return
         
         yield f"\n**Original Tweet:**\n> {tweet_description}\n\n"
         
-        _vlog("[yellow]...Generating intelligent reply suggestions...[/yellow]")
+        log.debug("[yellow]...Generating intelligent reply suggestions...[/yellow]")
         yield f"**Generating reply suggestions...**\n"
         
         target_language = _detect_target_language(messages)
@@ -168,16 +164,16 @@ def run_generative_commenter(tweet_id: str, messages: Optional[List[Dict]] = Non
                     yield chunk
             
             if not ai_response.strip():
-                console.log("[red]AI response is empty[/red]")
+                log.error("[red]AI response is empty[/red]")
                 yield "\n❌ **Error:** AI failed to generate reply suggestions"
                 return
                 
         except Exception as e:
-            console.log(f"[red]Error generating AI response: {e}[/red]")
+            log.error(f"[red]Error generating AI response: {e}[/red]")
             yield f"\n❌ **Error:** Failed to generate suggestions: {str(e)}"
             return
         
-        _vlog("[green]✓ Reply suggestions streamed successfully[/green]")
+        log.debug("[green]✓ Reply suggestions streamed successfully[/green]")
         
         yield f"\n\n---\n\n**📝 How to Use:**\n"
         yield f"1. Choose your preferred reply from the streamed list above\n"
@@ -186,12 +182,12 @@ def run_generative_commenter(tweet_id: str, messages: Optional[List[Dict]] = Non
         yield f"4. Paste and post manually\n\n"
         yield f"**💡 Tips:** Choose replies that match your voice; consider timing for engagement.\n\n"
         
-        _vlog(f"[green]Generative commenter v2.0 successfully processed Tweet ID: {tweet_id}[/green]")
+        log.debug("[green]Generative commenter v2.0 successfully processed Tweet ID: %s[/green]", tweet_id)
         
         yield f"---\n\n**Source:** https://x.com/anyuser/status/{tweet_id}"
         
     except Exception as e:
-        console.log(f"[red]Critical error in generative_commenter persona for Tweet ID '{tweet_id}': {e}[/red]")
+        log.error(f"[red]Critical error in generative_commenter persona for Tweet ID '{tweet_id}': {e}[/red]")
         yield f"Sorry, a critical error occurred while processing Tweet ID `{tweet_id}`: {str(e)}"
 
 def run_reply_commentar_persona(tweet_id: str):
@@ -202,12 +198,12 @@ def main():
     import sys
     
     if len(sys.argv) < 2:
-        console.log("[red]Usage: python persona_generative_komentar.py <tweet_id>[/red]")
-        console.log("[yellow]Example: python persona_generative_komentar.py 1942670167894548763[/yellow]")
+        log.error("[red]Usage: python persona_generative_komentar.py <tweet_id>[/red]")
+        log.info("[yellow]Example: python persona_generative_komentar.py 1942670167894548763[/yellow]")
         return
     
     tweet_id = sys.argv[1]
-    console.log(f"[blue]Testing generative_commenter persona with Tweet ID: {tweet_id}[/blue]")
+    log.info(f"[blue]Testing generative_commenter persona with Tweet ID: {tweet_id}[/blue]")
     
     for output in run_generative_commenter(tweet_id):
         print(output, end="")
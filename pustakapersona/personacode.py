@@ -1,4 +1,5 @@
 from tools.shared_console import console
+from tools.structured_log import get_logger
 from core.fireworks_api_client import generate_response
 from tools.lang_utils import detect_target_language_from_messages
 from typing import List, Dict, Generator, Optional
@@ -9,14 +10,16 @@ import os
 import subprocess
 import tempfile
 
+log = get_logger("pustakapersona.personacode")
+
 def run_code_persona(user_request: str, messages: List[Dict]) -> Generator[str, None, None]:
 
-    console.log(f"[yellow]💻 Persona 'code' streaming v2.4 starting... Request: '{user_request}'[/yellow]")
+    log.info(f"[yellow]💻 Persona 'code' streaming v2.4 starting... Request: '{user_request}'[/yellow]")
     
     try:
         language = _detect_language(user_request)
         target_language = detect_target_language_from_messages(messages)
-        console.log(f"[green]...Language detected: {language}[/green]")
+        log.debug("[green]...Language detected: %s[/green]", language)
         
         recent_context = "\n".join([f"{m['role']}: {m['content']}" for m in messages[-4:]])
         
@@ -43,26 +46,26 @@ Format your response in markdown for better display.
         
         messages_for_llm = [{"role": "user", "content": code_gen_prompt}]
         
-        console.log(f"[yellow]...Code generation in progress for {language}...[/yellow]")
+        log.debug("[yellow]...Code generation in progress for %s...[/yellow]", language)
         
         for chunk in generate_response(messages_for_llm, stream=True, temperature=0.1):
             if chunk:
                 yield chunk
         
-        console.log(f"[green]✅ Code streaming completed for {language}[/green]")
+        log.info(f"[green]✅ Code streaming completed for {language}[/green]")
 
     except Exception as e:
-        console.log(f"[red]❌ Critical error in code persona streaming: {e}[/red]")
+        log.error(f"[red]❌ Critical error in code persona streaming: {e}[/red]")
         yield f"**Error**: Sorry, a critical error occurred while generating code: {str(e)}"
 
 def run_code_persona_non_streaming(user_request: str, messages: List[Dict]):
 
-    console.log(f"[yellow]💻 Persona 'code' non-streaming v2.4 starting... Request: '{user_request}'[/yellow]")
+    log.info(f"[yellow]💻 Persona 'code' non-streaming v2.4 starting... Request: '{user_request}'[/yellow]")
     
     try:
         language = _detect_language(user_request)
         target_language = detect_target_language_from_messages(messages)
-        console.log(f"[green]...Language detected: {language}[/green]")
+        log.debug("[green]...Language detected: %s[/green]", language)
         
         recent_context = "\n".join([f"{m['role']}: {m['content']}" for m in messages[-4:]])
         
@@ -86,7 +89,7 @@ CRITICAL INSTRUCTIONS:
         
         messages_for_llm = [{"role": "user", "content": code_gen_prompt}]
         
-        console.log(f"[yellow]...Code generation in progress for {language}...[/yellow]")
+        log.debug("[yellow]...Code generation in progress for %s...[/yellow]", language)
         
         code_chunks = []
         for chunk in generate_response(messages_for_llm, stream=True, temperature=0.1):
@@ -100,12 +103,12 @@ CRITICAL INSTRUCTIONS:
         if raw_code.endswith("```"): raw_code = raw_code[:-3]
         raw_code = raw_code.strip()
 
-        console.log(f"[green]✅ Code generation successful. Length: {len(raw_code)} chars.[/green]")
+        log.info(f"[green]✅ Code generation successful. Length: {len(raw_code)} chars.[/green]")
         
         return {"language": language, "code": raw_code}
 
     except Exception as e:
-        console.log(f"[red]❌ Critical error in code persona: {e}[/red]")
+        log.error(f"[red]❌ Critical error in code persona: {e}[/red]")
         return {"language": "text", "code": f"Sorry, an error occurred while creating code: {e}"}
 
 def post_code_interaction(code: str, language: str, context: List[Dict]):
@@ -132,7 +135,7 @@ def post_code_interaction(code: str, language: str, context: List[Dict]):
             _edit_code(code, language)
 
     except Exception as e:
-        console.log(f"[yellow]⚠️  Cannot display interactive menu: {e}[/yellow]")
+        log.warning(f"[yellow]⚠️  Cannot display interactive menu: {e}[/yellow]")
 
 def _save_code(code: str, language: str, context: List[Dict]):
     suggested_name = _generate_filename(code, context)
@@ -175,7 +178,7 @@ def _edit_code(code: str, language: str):
             os.unlink(temp_path)
 
 def _generate_filename(code: str, context: List[Dict]) -> str:
-    console.log("[grey50]🧠 Generating suggested filename...[/grey50]")
+    log.debug("[grey50]🧠 Generating suggested filename...[/grey50]")
     context_str = "\n".join([f"{m['role']}: {m['content']}" for m in context[-5:]])
     prompt = f"""
     Based on the following conversation context and the generated code, suggest a concise, single, snake_case filename without the extension.
@@ -1,44 +1,73 @@
-from tools.shared_console import console
+from tools.structured_log import get_logger
 try:
     from tools.readle import scrape_manual
     from core.fireworks_api_client import generate_response
 except ImportError:
-    def scrape_manual(url: str): return {"error": "Core function not found."}
+    def scrape_manual(url: str, **kwargs): return {"error": "Core function not found."}
     def generate_response(messages, stream, temperature): return ["Error: LLM client not found."]
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from typing import List, Dict, Optional
+from urllib.parse import urlparse
 from tools.lang_utils import detect_target_language_from_messages
+from tools.text_utils import chunk_by_tokens, estimate_tokens
+from tools.pagination import scrape_paginated
+from tools.textrank import extractive_summary
 
-VERBOSE = False
+log = get_logger("pustakapersona.personareadle")
 
-def _vlog(message: str):
-    if VERBOSE:
-        console.log(message)
+# Pages over `threshold_tokens` are summarized map-reduce style: the text is cut
+# into `chunk_tokens` chunks, up to `max_concurrency` chunks are condensed into
+# notes at once, and the final summary is streamed from the combined notes.
+# Chunks past `max_chunks` are dropped; notes not back within `map_timeout`
+# seconds are left out of the reduce step, and so are parts whose notes still
+# come back as an LLM error after `map_retries` more tries. `max_concurrency`
+# bounds the map calls of every page being summarized at once (batch readle
+# summarizes several), not of each page.
+LONG_DOCUMENT_CONFIG = {
+    'enabled': True, 'threshold_tokens': 6000, 'chunk_tokens': 2500,
+    'max_concurrency': 4, 'max_chunks': 24, 'map_timeout': 90.0, 'map_retries': 1
+}
 
+# Local extractive pre-summary (TextRank): pages between `min_tokens` and
+# `max_tokens` are cut down to their `budget_tokens` most central sentences
+# before the LLM sees them, for a much shorter prompt and faster first token.
+# Longer pages keep the map-reduce path above, which reads all of the text:
+# `max_tokens` never reaches past its `threshold_tokens`.
+PRESUMMARY_CONFIG = {'enabled': True, 'min_tokens': 2500, 'budget_tokens': 2000, 'max_tokens': 6000}
+
+# Batch readle: at most `max_urls` links per request, `max_workers` pages
+# fetched and summarized at once and no more than `per_host` of them from the
+# same host at a time.
+BATCH_CONFIG = {'max_urls': 20, 'max_workers': 6, 'per_host': 2}
+
+_map_slots = threading.BoundedSemaphore(LONG_DOCUMENT_CONFIG['max_concurrency'])
+LONG_DOCUMENT_FAILED = "Sorry, this page is too long to summarize in one go and summarizing its parts failed. Please try again later."
+
+# Multi-page articles (`?page=N`, `/page/N/`, `rel="next"`): up to `max_pages`
+# pages, `max_workers` fetched at once, `max_bytes` downloaded across all of
+# them and at most `max_tokens` of stitched text.
+PAGINATION_CONFIG = {
+    'enabled': True, 'max_pages': 5, 'max_workers': 3,
+    'max_bytes': 8 * 1024 * 1024, 'max_tokens': 40000
+}
+
+_URL_RE = re.compile(r"https?://[^\s<>\"'\])]+")
 
 def _detect_target_language(messages: Optional[List[Dict]]) -> str:
     return detect_target_language_from_messages(messages)
 
-def run_readle_persona(url: str, messages: Optional[List[Dict]] = None):
-    _vlog(f"[green]Persona 'readle' v2.0 starting to process URL: {url}[/green]")
-    
-    try:
-        scraped_data = scrape_manual(url)
-        if not scraped_data or 'error' in scraped_data or not scraped_data.get('content'):
-            error_message = scraped_data.get('error', 'Content could not be extracted.')
-            console.log(f"[red]Readle scrape failed for {url}: {error_message}[/red]")
-            yield f"Sorry, I could not fetch data from that URL. Error: `{error_message}`"
-            return
-        
-        _vlog(f"[yellow]...Scraping successful. Now generating intelligent summary...[/yellow]")
-        
-        title = scraped_data.get('title', 'No Title')
-        raw_content = scraped_data.get('content', '')
-        target_language = _detect_target_language(messages)
-        summarization_prompt = f"""
+def _summarization_prompt(raw_content: str, target_language: str, from_notes: bool = False) -> str:
+    source = "NOTES TAKEN FROM EACH PART OF A LONG WEB PAGE" if from_notes else "RAW TEXT FROM WEBSITE"
+    return f"""
         You are a highly skilled business and technology analyst.
         Your task is to read raw text extracted from a web page and transform it into a clear, insightful, and easy-to-understand summary.
         
-        RAW TEXT FROM WEBSITE:
+        {source}:
         ---
         {raw_content}
         ---
@@ -52,21 +81,215 @@ def run_readle_persona(url: str, messages: Optional[List[Dict]] = None):
         
         YOUR ANALYSIS RESULT:
         """
+
+def _stream_summary(prompt: str):
+    messages = [{"role": "user", "content": prompt}]
+    for chunk in generate_response(messages, stream=True, temperature=0.2):
+        if chunk:
+            yield chunk
+
+def _failed_reply(text: str) -> bool:
+    """Whether a non-streamed reply is the error text the LLM client returns
+    in place of an answer ("[ERROR] ..." or "Error: ...")."""
+    return not text or text.startswith(("[ERROR]", "Error:"))
+
+def _failed_summary(summary: str) -> bool:
+    """Whether a joined `_summarize_content` output is (or ends in) an error
+    rather than a summary: the client appends "[ERROR] ..." when a stream
+    breaks off."""
+    return _failed_reply(summary) or summary == LONG_DOCUMENT_FAILED or summary.rsplit("\n", 1)[-1].startswith("[ERROR]")
+
+def _chunk_notes(title: str, chunk: str, index: int, total: int, retries: int = 0, deadline: Optional[float] = None) -> str:
+    prompt = f"""You are reading part {index} of {total} of a long web page titled "{title}".
+
+PART {index}:
+---
+{chunk}
+---
+
+Write compact notes (at most 12 bullet points) with every important fact, figure, name and claim in this part. Keep numbers and proper nouns exact. Do not add commentary or anything not in the text. Write the notes in the language of the text."""
+    messages = [{"role": "user", "content": prompt}]
+    for attempt in range(retries + 1):
+        wait_for = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not _map_slots.acquire(timeout=wait_for):
+            raise TimeoutError(f"no free LLM slot for part {index} before the map deadline")
+        try:
+            notes = "".join(part for part in generate_response(messages, stream=False, temperature=0.1) if part).strip()
+        finally:
+            _map_slots.release()
+        if not _failed_reply(notes):
+            return notes
+        log.warning(f"[yellow]Notes for part {index} failed (try {attempt + 1} of {retries + 1}): {notes[:120] or 'empty reply'}[/yellow]")
+    raise RuntimeError(notes or "empty reply from the LLM")
+
+def _summarize_long_document(title: str, raw_content: str, target_language: str, config: Dict):
+    chunks = chunk_by_tokens(raw_content, config['chunk_tokens'])
+    if len(chunks) > config['max_chunks']:
+        log.warning(f"[yellow]Page split into {len(chunks)} parts; summarizing the first {config['max_chunks']}[/yellow]")
+        chunks = chunks[:config['max_chunks']]
+    log.info(f"[cyan]Long page (~{estimate_tokens(raw_content)} tokens): summarizing {len(chunks)} parts with up to {config['max_concurrency']} at once[/cyan]")
+
+    deadline = time.monotonic() + config['map_timeout']
+    executor = ThreadPoolExecutor(max_workers=max(1, config['max_concurrency']))
+    try:
+        futures = [executor.submit(_chunk_notes, title, chunk, i, len(chunks), config.get('map_retries', 0), deadline)
+                   for i, chunk in enumerate(chunks, 1)]
+        done, not_done = wait(futures, timeout=config['map_timeout'])
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    notes = []
+    for i, future in enumerate(futures, 1):
+        if future not in done:
+            continue
+        try:
+            part_notes = future.result()
+        except Exception as e:
+            log.error(f"[red]Summarizing part {i} failed: {e}[/red]")
+            continue
+        if part_notes:
+            notes.append(f"[PART {i}/{len(chunks)}]\n{part_notes}")
+    if not_done:
+        log.warning(f"[yellow]{len(not_done)} parts missed the {config['map_timeout']:.0f}s limit and were left out[/yellow]")
+
+    if not notes:
+        log.error(f"[red]None of the {len(chunks)} parts of the long page could be summarized[/red]")
+        yield LONG_DOCUMENT_FAILED
+        return
+    yield from _stream_summary(_summarization_prompt("\n\n".join(notes), target_language, from_notes=True))
+
+def _summarize_content(title: str, raw_content: str, target_language: str):
+    presummary = PRESUMMARY_CONFIG
+    config = LONG_DOCUMENT_CONFIG
+    max_tokens = presummary['max_tokens']
+    if config['enabled']:
+        max_tokens = min(max_tokens, config['threshold_tokens'])
+    if presummary['enabled'] and presummary['min_tokens'] < estimate_tokens(raw_content) <= max_tokens:
+        raw_content = extractive_summary(raw_content, presummary['budget_tokens'])
+    if config['enabled'] and estimate_tokens(raw_content) > config['threshold_tokens']:
+        yield from _summarize_long_document(title, raw_content, target_language, config)
+    else:
+        yield from _stream_summary(_summarization_prompt(raw_content, target_language))
+
+def _scrape(url: str) -> Dict:
+    config = PAGINATION_CONFIG
+    if not config['enabled']:
+        return scrape_manual(url)
+    return scrape_paginated(url, scrape_manual, max_pages=config['max_pages'], max_workers=config['max_workers'],
+                            max_bytes=config['max_bytes'], max_tokens=config['max_tokens'])
+
+def run_readle_persona(url: str, messages: Optional[List[Dict]] = None):
+    log.debug("[green]Persona 'readle' v2.0 starting to process URL: %s[/green]", url)
+    
+    try:
+        scraped_data = _scrape(url)
+        if not scraped_data or 'error' in scraped_data or not scraped_data.get('content'):
+            error_message = scraped_data.get('error', 'Content could not be extracted.')
+            log.error(f"[red]Readle scrape failed for {url}: {error_message}[/red]")
+            yield f"Sorry, I could not fetch data from that URL. Error: `{error_message}`"
+            return
+        
+        log.debug("[yellow]...Scraping successful. Now generating intelligent summary...[/yellow]")
         
-        messages = [{"role": "user", "content": summarization_prompt}]
+        title = scraped_data.get('title', 'No Title')
+        raw_content = scraped_data.get('content', '')
+        target_language = _detect_target_language(messages)
 
         yield f"### 📖 Intelligent Analysis from Web Page\n\n"
         yield f"**Title:** {title}\n\n"
+        if len(scraped_data.get('pages', [])) > 1:
+            yield f"**Pages read:** {len(scraped_data['pages'])}\n\n"
         yield f"**Analytical Summary:**\n"
 
-        for chunk in generate_response(messages, stream=True, temperature=0.2):
-            if chunk:
-                yield chunk
+        yield from _summarize_content(title, raw_content, target_language)
 
-        _vlog(f"[green]Readle v2.0 successfully summarized {url}[/green]")
+        log.debug("[green]Readle v2.0 successfully summarized %s[/green]", url)
 
         yield f"\n\n---\n\n**Source:** {url}"
         
     except Exception as e:
-        console.log(f"[red]Critical error in readle persona for '{url}': {e}[/red]")
+        log.error(f"[red]Critical error in readle persona for '{url}': {e}[/red]")
         yield f"Sorry, a critical error occurred while running readle persona: {str(e)}"
+
+
+def extract_urls(source: str) -> List[str]:
+    """URLs from chat text, or from a file when `source` is a path to one; duplicates dropped, order kept."""
+    text = source or ""
+    path = os.path.expanduser(text.strip())
+    if path and "\n" not in path and os.path.isfile(path):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    return list(dict.fromkeys(url.rstrip(".,;:!?") for url in _URL_RE.findall(text)))
+
+def _read_and_summarize(url: str, target_language: str, host_slots: Dict[str, threading.BoundedSemaphore]) -> Dict:
+    with host_slots[urlparse(url).netloc.lower()]:
+        scraped_data = scrape_manual(url)
+    if not scraped_data or 'error' in scraped_data or not scraped_data.get('content'):
+        return {"url": url, "error": (scraped_data or {}).get('error', 'Content could not be extracted.')}
+    title = scraped_data.get('title', 'No Title')
+    summary = "".join(_summarize_content(title, scraped_data['content'], target_language)).strip()
+    if _failed_summary(summary):
+        reason = summary.rsplit("\n", 1)[-1][:200] or "empty reply"
+        return {"url": url, "error": f"Summarizing failed: {reason}"}
+    return {"url": url, "title": title, "summary": summary}
+
+def _digest_prompt(sections: List[Dict], target_language: str) -> str:
+    summaries = "\n\n".join(f"[{i}] {s['title']} ({s['url']})\n{s['summary']}" for i, s in enumerate(sections, 1))
+    return f"""You have summaries of {len(sections)} web pages a researcher asked you to read together.
+
+PAGE SUMMARIES:
+---
+{summaries}
+---
+
+Write a combined digest: the main themes across the pages, where they agree or disagree, and the most important facts, citing pages by their [number]. Finish with one short paragraph on what the set of pages shows as a whole.
+
+LANGUAGE: {target_language} (write the digest in this language)"""
+
+def run_batch_readle_persona(source: str, messages: Optional[List[Dict]] = None):
+    """Read many URLs (from chat text or a file of links) concurrently, stream a
+    section per page as soon as it is summarized, then a combined digest."""
+    urls = extract_urls(source)
+    if not urls:
+        yield "Sorry, I could not find any URLs to read. Paste the links or give the path to a file that lists them."
+        return
+    config = BATCH_CONFIG
+    if len(urls) > config['max_urls']:
+        log.warning(f"[yellow]Batch readle got {len(urls)} URLs; reading the first {config['max_urls']}[/yellow]")
+        urls = urls[:config['max_urls']]
+
+    log.info(f"[cyan]Batch readle: {len(urls)} URLs with {config['max_workers']} workers[/cyan]")
+    target_language = _detect_target_language(messages)
+    host_slots: Dict[str, threading.BoundedSemaphore] = defaultdict(lambda: threading.BoundedSemaphore(config['per_host']))
+    for url in urls:
+        host_slots[urlparse(url).netloc.lower()]  # create every semaphore before the workers race for them
+
+    yield f"### 📚 Batch Reading: {len(urls)} Web Pages\n\n"
+    sections: List[Dict] = []
+    failures: List[Dict] = []
+    executor = ThreadPoolExecutor(max_workers=max(1, min(config['max_workers'], len(urls))))
+    try:
+        futures = {executor.submit(_read_and_summarize, url, target_language, host_slots): url for url in urls}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"url": futures[future], "error": str(e)}
+            if 'error' in result:
+                log.error(f"[red]Batch readle failed for {result['url']}: {result['error']}[/red]")
+                failures.append(result)
+                yield f"#### ⚠️ {result['url']}\nCould not read this page: `{result['error']}`\n\n"
+                continue
+            sections.append(result)
+            yield f"#### {len(sections)}. {result['title']}\n{result['summary']}\n\n*Source:* {result['url']}\n\n"
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if len(sections) > 1:
+        yield "---\n\n### 🧭 Combined Digest\n\n"
+        try:
+            yield from _stream_summary(_digest_prompt(sections, target_language))
+        except Exception as e:
+            log.error(f"[red]Batch digest failed: {e}[/red]")
+            yield f"Could not write the combined digest: {e}"
+    yield f"\n\n---\n\n**Read {len(sections)} of {len(urls)} pages.**"
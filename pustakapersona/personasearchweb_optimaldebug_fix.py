@@ -1,19 +1,27 @@
 import json
 import re
 import hashlib
+import time
 import numpy as np
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.text import Text
 from rich.table import Table
 from rich.tree import Tree
 from typing import List, Dict, Tuple, Optional, Set
-from dataclasses import dataclass
-from tools.shared_console import console
+from dataclasses import dataclass, replace
+from tools.structured_log import get_logger
 from tools.config_styles import custom_colorsUX
 from tools.lang_utils import detect_target_language_from_text
+from tools.result_scoring import ResultScorer
+from tools.bm25 import BM25RelevanceModel, CorpusStats
+from tools.domain_trust import DomainTrustTable
+from tools.near_duplicates import collapse_near_duplicates
+from tools.page_enrichment import enrich_results
+from tools.semantic_rerank import SemanticReranker
+from tools.search_backends import create_search_backend
 
 try:
     from core.fireworks_api_client import generate_response
@@ -23,12 +31,11 @@ except ImportError:
         if kwargs.get('stream'): yield "[FALLBACK] LLM Error"
         else: return ["[FALLBACK] LLM Error"]
 
-try:
-    from tools.upgradescraper import brave_search
-except ImportError:
-    print("[ERROR] Missing brave_search")
-    def brave_search(query, limit=4):
-        return {'organic_results': []}
+
+log = get_logger("pustakapersona.personasearchweb_optimaldebug_fix")
+
+SEARCH_LIMIT = 5
+SEARCH_CACHE_TTL = timedelta(hours=1)
 
 @dataclass
 class SearchResult:
@@ -41,76 +48,109 @@ class SearchResult:
     source_quality: float = 0.5
     final_score: float = 0.0
     intent_match: float = 0.0
+    semantic_score: float = 0.0
 
 class EnhancedSearchPersona:
     def __init__(self):
-        self.base_trusted_domains = {
-            'github.com': 0.95, 'stackoverflow.com': 0.90, 'docs.python.org': 0.95,
-            'readthedocs.io': 0.90, 'pypi.org': 0.90, 'npmjs.com': 0.85,
-            'developer.mozilla.org': 0.90, 'w3schools.com': 0.75,
-            
-            'coinmarketcap.com': 0.85, 'coingecko.com': 0.85, 'coindesk.com': 0.80,
-            'binance.com': 0.80, 'coinbase.com': 0.80, 'cointelegraph.com': 0.75,
-            'blockchain.com': 0.80, 'kraken.com': 0.80,
-            
-            'reuters.com': 0.90, 'bloomberg.com': 0.85, 'techcrunch.com': 0.80,
-            'wired.com': 0.80, 'arstechnica.com': 0.85, 'theverge.com': 0.75,
-            'cnn.com': 0.70, 'bbc.com': 0.85, 'cnbc.com': 0.75,
-            
-            'arxiv.org': 0.95, 'scholar.google.com': 0.90, 'researchgate.net': 0.85,
-            'ieee.org': 0.90, 'acm.org': 0.90, 'nature.com': 0.95,
-            
-            'sec.gov': 0.90, 'nasdaq.com': 0.85, 'forbes.com': 0.75,
-            'wsj.com': 0.85, 'ft.com': 0.85, 'marketwatch.com': 0.70,
-            
-            'medium.com': 0.60, 'dev.to': 0.70, 'hackernoon.com': 0.60,
-            'reddit.com': 0.45, 'quora.com': 0.40, 'youtube.com': 0.50,
-            
-            'gov': 0.90, '.edu': 0.85, '.org': 0.75,
-            
-            'wikipedia.org': 0.80
-        }
+        self.domain_trust = DomainTrustTable.load()
         
         self.intent_patterns = {
             'programming': {
-                'keywords': ['library', 'package', 'framework', 'api', 'documentation', 'python', 'javascript', 'npm', 'pip', 'install', 'import', 'code', 'developer', 'programming', 'software', 'github', 'repository', 'version', 'release'],
-                'boost_domains': ['github.com', 'readthedocs.io', 'pypi.org', 'npmjs.com', 'stackoverflow.com', 'docs.python.org', 'developer.mozilla.org'],
-                'penalty_domains': ['coinmarketcap.com', 'coingecko.com', 'binance.com', 'coinbase.com']
+                'keywords': ['library', 'package', 'framework', 'api', 'documentation', 'python', 'javascript', 'npm', 'pip', 'install', 'import', 'code', 'developer', 'programming', 'software', 'github', 'repository', 'version', 'release']
             },
             'crypto': {
-                'keywords': ['price', 'trading', 'coin', 'token', 'crypto', 'cryptocurrency', 'bitcoin', 'ethereum', 'blockchain', 'exchange', 'wallet', 'mining', 'defi', 'nft', 'market cap', 'volume'],
-                'boost_domains': ['coinmarketcap.com', 'coingecko.com', 'binance.com', 'coinbase.com', 'coindesk.com', 'cointelegraph.com'],
-                'penalty_domains': ['github.com', 'readthedocs.io', 'pypi.org']
+                'keywords': ['price', 'trading', 'coin', 'token', 'crypto', 'cryptocurrency', 'bitcoin', 'ethereum', 'blockchain', 'exchange', 'wallet', 'mining', 'defi', 'nft', 'market cap', 'volume']
             },
             'news': {
-                'keywords': ['news', 'breaking', 'latest', 'today', 'yesterday', 'report', 'article', 'story', 'journalist', 'media', 'press', 'announcement'],
-                'boost_domains': ['reuters.com', 'bloomberg.com', 'techcrunch.com', 'cnn.com', 'bbc.com', 'cnbc.com'],
-                'penalty_domains': []
+                'keywords': ['news', 'breaking', 'latest', 'today', 'yesterday', 'report', 'article', 'story', 'journalist', 'media', 'press', 'announcement']
             },
             'academic': {
-                'keywords': ['research', 'study', 'paper', 'journal', 'academic', 'university', 'scholar', 'thesis', 'publication', 'peer review', 'citation'],
-                'boost_domains': ['arxiv.org', 'scholar.google.com', 'researchgate.net', 'ieee.org', 'acm.org', 'nature.com'],
-                'penalty_domains': ['reddit.com', 'quora.com', 'medium.com']
+                'keywords': ['research', 'study', 'paper', 'journal', 'academic', 'university', 'scholar', 'thesis', 'publication', 'peer review', 'citation']
             },
             'business': {
-                'keywords': ['company', 'business', 'corporate', 'earnings', 'revenue', 'financial', 'stock', 'market', 'investment', 'ipo', 'merger', 'acquisition'],
-                'boost_domains': ['sec.gov', 'nasdaq.com', 'forbes.com', 'wsj.com', 'ft.com', 'bloomberg.com'],
-                'penalty_domains': []
+                'keywords': ['company', 'business', 'corporate', 'earnings', 'revenue', 'financial', 'stock', 'market', 'investment', 'ipo', 'merger', 'acquisition']
             },
             'health': {
-                'keywords': ['health', 'medical', 'medicine', 'treatment', 'disease', 'symptom', 'drug', 'clinical', 'patient', 'doctor', 'hospital'],
-                'boost_domains': ['nih.gov', 'who.int', 'mayoclinic.org', 'webmd.com', 'healthline.com'],
-                'penalty_domains': ['reddit.com', 'quora.com']
+                'keywords': ['health', 'medical', 'medicine', 'treatment', 'disease', 'symptom', 'drug', 'clinical', 'patient', 'doctor', 'hospital']
             },
             'general': {
-                'keywords': [],
-                'boost_domains': ['wikipedia.org', 'britannica.com'],
-                'penalty_domains': []
+                'keywords': []
             }
         }
         
+        self.quality_indicators = ['official', 'documentation', 'whitepaper', 'announcement', 'research', 'study', 'report', 'guide', 'tutorial']
+        self.spam_indicators = ['click here', 'amazing', 'shocking', 'you won\'t believe', 'one weird trick', 'download now', 'free download']
+        self.cross_intent_terms = {
+            'programming': ['coin', 'crypto', 'trading', 'price usd'],
+            'crypto': ['python library', 'documentation', 'install pip']
+        }
+
+        # BM25 is the lexical relevance term. `tokenizer` takes a name registered in
+        # tools.bm25.TOKENIZERS or a callable; corpus statistics from past searches
+        # are persisted so IDF stays meaningful for small result batches.
+        self.relevance_config = {'tokenizer': 'default', 'k1': 1.2, 'b': 0.75, 'persist_corpus_stats': True}
+        self.relevance_model = BM25RelevanceModel(
+            tokenizer=self.relevance_config['tokenizer'],
+            k1=self.relevance_config['k1'],
+            b=self.relevance_config['b'],
+            corpus_stats=CorpusStats.load() if self.relevance_config['persist_corpus_stats'] else None
+        )
+
+        self.result_scorer = ResultScorer(
+            self.intent_patterns,
+            self.domain_trust,
+            self.quality_indicators,
+            self.spam_indicators,
+            self.cross_intent_terms,
+            self.relevance_model
+        )
+        
+        # Progressive mode: synthesis starts once `quorum` results scoring at least
+        # `min_score` are in, instead of waiting for every query. Queries still
+        # running at that point either feed a follow-up refinement ('refine') or are
+        # dropped ('drop'); nothing is waited for past `deadline` seconds.
+        self.progressive_config = {
+            'default': {'enabled': True, 'quorum': 4, 'min_score': 0.55, 'deadline': 8.0, 'late_results': 'refine'},
+            'crypto': {'quorum': 3, 'deadline': 5.0},
+            'news': {'quorum': 3, 'deadline': 6.0},
+            'general': {'quorum': 3, 'min_score': 0.45}
+        }
+        
+        # Search backend, built from tools.search_backends.SEARCH_BACKENDS: 'brave'
+        # (scraper), 'searxng' (JSON API, see SEARXNG_URL), 'fixture' (offline) or
+        # 'race' to query the backends listed in 'race' at once and keep the first
+        # non-empty answer. 'options' holds per-backend constructor arguments.
+        self.search_backend_config = {
+            'backend': 'brave', 'race': ['brave', 'searxng'], 'race_timeout': 10.0, 'options': {}
+        }
+        self.search_backend = create_search_backend(self.search_backend_config)
+        
+        # Adaptive fan-out: the primary query (plus any query already cached) goes out
+        # first; further templated queries are issued `expand_step` at a time only
+        # while fewer than `target_results` unique results score >= `target_score`.
+        self.fanout_config = {
+            'enabled': True, 'max_queries': 4, 'target_results': 3, 'target_score': 0.8, 'expand_step': 3
+        }
+        
+        # Optional enrichment: fetch the top-k ranked pages with the readle extractor
+        # and add their best passages to the synthesis prompt, within a token budget.
+        self.enrichment_config = {
+            'enabled': False, 'top_k': 3, 'max_workers': 3, 'total_timeout': 8.0, 'token_budget': 1500
+        }
+        
+        # Optional second stage: embed the query and the top-n snippets with
+        # chromadb's CPU embedding function and blend cosine similarity into the
+        # final score. `allow_download` lets the model be fetched on first use;
+        # otherwise reranking only runs when the model is already cached locally.
+        self.rerank_config = {
+            'enabled': False, 'top_n': 10, 'weight': 0.3, 'cache_size': 2048, 'allow_download': False
+        }
+        self.semantic_reranker = None
+        
         self.search_cache = {}
         self.last_search_results = []
+        self.last_answer_language = "english"
+        self.last_fanout = {}
 
     def _detect_target_language_from_text(self, text: str) -> str:
         return detect_target_language_from_text(text)
@@ -141,14 +181,14 @@ class EnhancedSearchPersona:
         if intent_scores:
             best_intent = max(intent_scores, key=intent_scores.get)
             confidence = intent_scores[best_intent]
-            console.log(f"[cyan]Intent detected:[/cyan] {best_intent} (confidence: {confidence:.2f})")
+            log.info(f"[cyan]Intent detected:[/cyan] {best_intent} (confidence: {confidence:.2f})")
             return best_intent
         
-        console.log("[cyan]Intent detected:[/cyan] general")
+        log.info("[cyan]Intent detected:[/cyan] general")
         return 'general'
 
     def _generate_intent_based_queries(self, base_query: str, intent: str, max_queries: int = 4) -> List[str]:
-        console.log(f"[cyan]Generating queries for intent:[/cyan] {intent}")
+        log.debug("[cyan]Generating queries for intent:[/cyan] %s", intent)
         
         current_year = datetime.now().year
         
@@ -206,8 +246,6 @@ class EnhancedSearchPersona:
             
         config = self.intent_patterns.get(intent, {})
         keywords = config.get('keywords', [])
-        boost_domains = config.get('boost_domains', [])
-        penalty_domains = config.get('penalty_domains', [])
         
         content = f"{result.title} {result.snippet}".lower()
         score = 0.0
@@ -216,56 +254,43 @@ class EnhancedSearchPersona:
         if keywords:
             score += (keyword_matches / len(keywords)) * 0.5
         
-        domain_lower = result.domain.lower()
-        for boost_domain in boost_domains:
-            if boost_domain in domain_lower:
-                score += 0.4
-                break
-                
-        for penalty_domain in penalty_domains:
-            if penalty_domain in domain_lower:
-                score -= 0.6
-                break
+        trust = self.domain_trust.lookup(result.domain)
+        if intent in trust.boost_intents:
+            score += 0.4
+        if intent in trust.penalty_intents:
+            score -= 0.6
         
         return max(-1.0, min(1.0, score))
 
     def _calculate_source_quality(self, url: str, title: str, snippet: str, intent: str) -> float:
         domain = self._get_domain_from_url(url)
-        base_score = self.base_trusted_domains.get(domain, 0.5)
-        
-        for trusted_domain, score in self.base_trusted_domains.items():
-            if trusted_domain in domain and domain != trusted_domain:
-                base_score = max(base_score, score * 0.8)
+        trust = self.domain_trust.lookup(domain)
+        base_score = trust.base_score()
         
         content = f"{title} {snippet}".lower()
         
-        quality_indicators = ['official', 'documentation', 'whitepaper', 'announcement', 'research', 'study', 'report', 'guide', 'tutorial']
-        spam_indicators = ['click here', 'amazing', 'shocking', 'you won\'t believe', 'one weird trick', 'download now', 'free download']
-        
-        for indicator in quality_indicators:
+        for indicator in self.quality_indicators:
             if indicator in content:
                 base_score += 0.05
                 
-        for spam in spam_indicators:
+        for spam in self.spam_indicators:
             if spam in content:
                 base_score -= 0.3
         
-        if intent in self.intent_patterns:
-            config = self.intent_patterns[intent]
-            if domain in config.get('boost_domains', []):
-                base_score += 0.2
-            elif domain in config.get('penalty_domains', []):
-                base_score -= 0.3
+        if intent in trust.boost_intents:
+            base_score += 0.2
+        elif intent in trust.penalty_intents:
+            base_score -= 0.3
         
         return max(0.1, min(1.0, base_score))
 
-    def _calculate_relevance_score(self, result: SearchResult, query: str, intent: str) -> float:
+    def _calculate_relevance_score(self, result: SearchResult, query: str, intent: str, lexical_score: float) -> float:
+        # BM25 is a batch statistic: `lexical_score` is this result's entry in
+        # relevance_model.score_batch over the whole batch it was found in.
         query_terms = set(query.lower().split())
         content = f"{result.title} {result.snippet}".lower()
-        content_terms = set(content.split())
         
-        exact_matches = len(query_terms.intersection(content_terms))
-        base_relevance = exact_matches / len(query_terms) if query_terms else 0
+        base_relevance = lexical_score if query_terms else 0
         
         semantic_bonus = 0.0
         if intent in self.intent_patterns:
@@ -298,40 +323,54 @@ class EnhancedSearchPersona:
         
         content_lower = f"{result.title} {result.snippet}".lower()
         
-        if intent == 'programming' and any(term in content_lower for term in ['coin', 'crypto', 'trading', 'price usd']):
-            final_score *= 0.3
-        elif intent == 'crypto' and any(term in content_lower for term in ['python library', 'documentation', 'install pip']):
+        cross_terms = self.cross_intent_terms.get(intent, [])
+        if any(term in content_lower for term in cross_terms):
             final_score *= 0.3
         
         return max(0.0, min(1.0, final_score))
 
+    def _build_raw_data_tree(self, query: str, intent: str, raw_results: List[Dict]) -> Tree:
+        debug_tree = Tree(f"🔍 RAW DATA VIEWER | Query: '{query}' | Intent: {intent}", style="red bold")
+        
+        for i, result in enumerate(raw_results, 1):
+            title = result.get('title', '')
+            link = result.get('link', '')
+            snippet = result.get('snippet', '')
+            
+            result_branch = debug_tree.add(f"📄 RESULT #{i}", style="yellow bold")
+            result_branch.add(f"🏷️  Title: {title}", style="white")
+            result_branch.add(f"🔗 Link: {link}", style="blue")
+            result_branch.add(f"📝 Snippet: {snippet}", style="dim white")
+        
+        return debug_tree
+
+    def _search_cache_key(self, query: str, intent: str) -> str:
+        return hashlib.md5(f"{query}_{intent}".encode()).hexdigest()
+
+    def _cached_search(self, cache_key: str) -> Optional[List[SearchResult]]:
+        if cache_key in self.search_cache:
+            cache_time, cached_results = self.search_cache[cache_key]
+            if datetime.now() - cache_time < SEARCH_CACHE_TTL:
+                return cached_results
+        return None
+
+    def _is_query_cached(self, query: str, intent: str) -> bool:
+        return self._cached_search(self._search_cache_key(query, intent)) is not None or self.search_backend.is_cached(query, SEARCH_LIMIT)
+
     def _enhanced_search_with_validation(self, query: str, intent: str) -> List[SearchResult]:
-        console.log(f"[yellow]Searching:[/yellow] '{query}' (intent: {intent})")
+        log.debug("[yellow]Searching:[/yellow] '%s' (intent: %s)", query, intent)
         
         try:
-            cache_key = hashlib.md5(f"{query}_{intent}".encode()).hexdigest()
-            if cache_key in self.search_cache:
-                cache_time, cached_results = self.search_cache[cache_key]
-                if datetime.now() - cache_time < timedelta(hours=1):
-                    return cached_results
+            cache_key = self._search_cache_key(query, intent)
+            cached_results = self._cached_search(cache_key)
+            if cached_results is not None:
+                return cached_results
 
-            search_response = brave_search(query, limit=5)
+            search_response = self.search_backend.search(query, limit=SEARCH_LIMIT)
             raw_results = search_response.get('organic_results', [])
 
             if raw_results:
-                debug_tree = Tree(f"🔍 RAW DATA VIEWER | Query: '{query}' | Intent: {intent}", style="red bold")
-                
-                for i, result in enumerate(raw_results, 1):
-                    title = result.get('title', '')
-                    link = result.get('link', '')
-                    snippet = result.get('snippet', '')
-                    
-                    result_branch = debug_tree.add(f"📄 RESULT #{i}", style="yellow bold")
-                    result_branch.add(f"🏷️  Title: {title}", style="white")
-                    result_branch.add(f"🔗 Link: {link}", style="blue")
-                    result_branch.add(f"📝 Snippet: {snippet}", style="dim white")
-                
-                console.print(debug_tree)
+                log.view(lambda: self._build_raw_data_tree(query, intent, raw_results))
 
             if not raw_results:
                 return []
@@ -345,44 +384,90 @@ class EnhancedSearchPersona:
                 if not url or len(snippet) < 10:
                     continue
                 
-                domain = self._get_domain_from_url(url)
-                
-                search_result = SearchResult(
+                processed_results.append(SearchResult(
                     title=title,
                     url=url,
                     snippet=snippet,
-                    domain=domain,
+                    domain=self._get_domain_from_url(url),
                     relevance_score=0.0,
                     source_quality=0.0,
                     intent_match=0.0
-                )
-                
-                search_result.source_quality = self._calculate_source_quality(url, title, snippet, intent)
-                search_result.relevance_score = self._calculate_relevance_score(search_result, query, intent)
-                search_result.intent_match = self._calculate_intent_match_score(search_result, query, intent)
-                search_result.final_score = self._calculate_final_score(search_result, query, intent)
-                
-                processed_results.append(search_result)
+                ))
+            
+            self.result_scorer.score_batch(processed_results, query, intent)
+            self.relevance_model.record([f"{res.title} {res.snippet}" for res in processed_results])
             
             self.search_cache[cache_key] = (datetime.now(), processed_results)
-            console.log(f"[green]Found {len(processed_results)} validated results[/green]")
+            log.debug("[green]Found %d validated results[/green]", len(processed_results))
             return processed_results
             
         except Exception as e:
-            console.log(f"[red]Search error for '{query}': {e}[/red]")
+            log.error(f"[red]Search error for '{query}': {e}[/red]")
             return []
 
-    def _synthesize_results(self, all_results: List[SearchResult], user_query: str, intent: str, stream: bool = True):
-        if not all_results:
-            nores = "Sorry, no relevant information was found. Please try different keywords or search terms."
-            if stream:
-                yield nores
-                return
-            return nores
-
-        unique_results = {res.url: res for res in all_results}
-        ranked_results = sorted(unique_results.values(), key=lambda x: x.final_score, reverse=True)
+    def _format_result_block(self, index: int, result: SearchResult, passages: Optional[List[str]] = None) -> str:
+        block = f"""
+[RESULT {index}]
+Title: {result.title}
+URL: {result.url}
+Domain: {result.domain}
+Final Score: {result.final_score:.2f}
+Intent Match: {result.intent_match:.2f}
+Content: {result.snippet}
+"""
+        if passages:
+            block += "Page Extracts:\n" + "\n".join(f"- {p}" for p in passages) + "\n"
+        return block
+
+    def _enrich_final_results(self, final_results: List[SearchResult], user_query: str) -> Dict[str, List[str]]:
+        config = self.enrichment_config
+        if not config.get('enabled'):
+            return {}
+        try:
+            return enrich_results(
+                [res.url for res in final_results[:config['top_k']]],
+                user_query,
+                max_workers=config['max_workers'],
+                total_timeout=config['total_timeout'],
+                token_budget=config['token_budget']
+            )
+        except Exception as e:
+            log.error(f"[red]Enrichment error: {e}[/red]")
+            return {}
+
+    def _semantic_rerank(self, ranked_results: List[SearchResult], user_query: str):
+        config = self.rerank_config
+        if not config.get('enabled') or not ranked_results:
+            return ranked_results, None
+        if self.semantic_reranker is None:
+            self.semantic_reranker = SemanticReranker(
+                cache_size=config['cache_size'],
+                allow_download=config['allow_download']
+            )
 
+        blended, similarities, report = self.semantic_reranker.rerank(
+            ranked_results,
+            user_query,
+            text_of=lambda res: f"{res.title} {res.snippet}",
+            score_of=lambda res: res.final_score,
+            top_n=config['top_n'],
+            weight=config['weight']
+        )
+        if not report.reranked:
+            return ranked_results, report
+
+        # Results are shared with the search cache, so blend into copies.
+        reranked = [
+            replace(res, final_score=float(score), semantic_score=float(similarity))
+            for res, score, similarity in zip(ranked_results, blended, similarities)
+        ]
+        # Only the head was blended; the tail keeps its place below it.
+        head = sorted(reranked[:report.reranked], key=lambda x: x.final_score, reverse=True)
+        reranked = head + reranked[report.reranked:]
+        log.info(f"[cyan]Semantic rerank: {report.reranked} results in {report.latency * 1000:.0f}ms ({report.cache_hits} cached embeddings)[/cyan]")
+        return reranked, report
+
+    def _build_ranking_table(self, ranked_results: List[SearchResult], intent: str, collapse_report, rerank_report) -> Table:
         ranking_table = Table(
             title=f"🎯 SIMPLE RE-RANKING RESULTS | Intent: {intent.upper()}",
             title_style="bold cyan",
@@ -398,6 +483,9 @@ class EnhancedSearchPersona:
         ranking_table.add_column("Rel", style="yellow", width=5, justify="center")
         ranking_table.add_column("Qual", style="blue", width=5, justify="center")
         ranking_table.add_column("Intent", style="magenta", width=6, justify="center")
+        show_semantic = bool(rerank_report and rerank_report.reranked)
+        if show_semantic:
+            ranking_table.add_column("Sem", style="cyan", width=5, justify="center")
         ranking_table.add_column("Domain", style="dim white", width=25, justify="left")
         ranking_table.add_column("Title", style="white", justify="left")
         
@@ -408,25 +496,53 @@ class EnhancedSearchPersona:
                 f"{res.relevance_score:.2f}",
                 f"{res.source_quality:.2f}",
                 f"{res.intent_match:.2f}",
+                *([f"{res.semantic_score:.2f}"] if show_semantic else []),
                 res.domain[:25],
                 res.title[:50] + ("..." if len(res.title) > 50 else "")
             )
         
-        console.print(ranking_table)
+        captions = []
+        if collapse_report.removed:
+            captions.append(f"Near-duplicates collapsed: {collapse_report.removed} (~{collapse_report.tokens_saved} tokens saved)")
+        if rerank_report is not None:
+            if rerank_report.reranked:
+                captions.append(f"Semantic rerank: top {rerank_report.reranked} in {rerank_report.latency * 1000:.0f}ms ({rerank_report.cache_hits} cached)")
+            else:
+                captions.append(f"Semantic rerank skipped: {rerank_report.error}")
+        if captions:
+            ranking_table.caption = " | ".join(captions)
+        
+        return ranking_table
+
+    def _synthesize_results(self, all_results: List[SearchResult], user_query: str, intent: str, stream: bool = True):
+        if not all_results:
+            nores = "Sorry, no relevant information was found. Please try different keywords or search terms."
+            if stream:
+                yield nores
+                return
+            return nores
+
+        unique_results = {res.url: res for res in all_results}
+        ranked_results = sorted(unique_results.values(), key=lambda x: x.final_score, reverse=True)
+        ranked_results, rerank_report = self._semantic_rerank(ranked_results, user_query)
+        ranked_results, collapse_report = collapse_near_duplicates(
+            ranked_results,
+            text_of=lambda res: res.snippet,
+            score_of=lambda res: res.final_score,
+            block_of=lambda res: self._format_result_block(0, res)
+        )
+        if collapse_report.removed:
+            log.info(f"[cyan]Collapsed {collapse_report.removed} near-duplicate results in {collapse_report.clusters} clusters (~{collapse_report.tokens_saved} prompt tokens saved)[/cyan]")
+
+        log.view(lambda: self._build_ranking_table(ranked_results, intent, collapse_report, rerank_report))
 
         final_results = ranked_results[:6]
 
-        context_parts = []
-        for i, result in enumerate(final_results, 1):
-            context_parts.append(f"""
-[RESULT {i}]
-Title: {result.title}
-URL: {result.url}
-Domain: {result.domain}
-Final Score: {result.final_score:.2f}
-Intent Match: {result.intent_match:.2f}
-Content: {result.snippet}
-""")
+        page_passages = self._enrich_final_results(final_results, user_query)
+        context_parts = [
+            self._format_result_block(i, result, page_passages.get(result.url))
+            for i, result in enumerate(final_results, 1)
+        ]
         
         combined_context = "\n".join(context_parts)
         
@@ -539,6 +655,7 @@ Content: {result.snippet}
         
         compact_context_text = f"{user_query}\n\n" + "\n".join([f"{r.title} {r.snippet}" for r in final_results])
         target_language = self._detect_target_language_from_text(compact_context_text)
+        self.last_answer_language = target_language
 
         if stream:
             yield f"### 🔎 Intelligent Web Search Analysis\n\n"
@@ -594,35 +711,191 @@ Generate a structured response that synthesizes ALL relevant information from th
                 sources_block = "\n".join([f"- {res.title} ({res.url})" for res in final_results])
                 return f"### 🔎 Intelligent Web Search Analysis\n\n{body}\n\n---\n\n**Sources:**\n{sources_block}"
         except Exception as e:
-            console.log(f"[red]Synthesis error: {e}[/red]")
+            log.error(f"[red]Synthesis error: {e}[/red]")
             err = f"Error during synthesis. Please try your search again. Technical error: {str(e)}"
             if stream:
                 yield err
                 return
             return err
 
+    def _progressive_settings(self, intent: str) -> Dict:
+        settings = dict(self.progressive_config['default'])
+        settings.update(self.progressive_config.get(intent, {}))
+        return settings
+
+    def _count_strong_results(self, results: List[SearchResult], min_score: float) -> int:
+        return len({res.url for res in results if res.final_score >= min_score})
+
+    def _collect_search_future(self, future, query: str, all_results: List[SearchResult]):
+        try:
+            results = future.result()
+            all_results.extend(results)
+            log.debug("[green]Completed search for:[/green] '%s' - %d results", query, len(results))
+        except Exception as e:
+            log.error(f"[red]Search failed for '{query}': {e}[/red]")
+
+    def _plan_fanout(self, search_queries: List[str], intent: str) -> Tuple[List[str], List[str], int]:
+        """Split queries into the first wave and a reserve for expansion.
+
+        The first wave is the primary query plus every query whose results are
+        already cached, since those cost nothing to issue.
+        """
+        cached = [query for query in search_queries if self._is_query_cached(query, intent)]
+        if not self.fanout_config.get('enabled') or len(search_queries) <= 1:
+            return list(search_queries), [], len(cached)
+        first_wave = [search_queries[0]] + [query for query in search_queries[1:] if query in cached]
+        reserve = [query for query in search_queries[1:] if query not in first_wave]
+        return first_wave, reserve, len(cached)
+
+    def _fanout_satisfied(self, results: List[SearchResult]) -> bool:
+        config = self.fanout_config
+        return self._count_strong_results(results, config['target_score']) >= config['target_results']
+
+    def _next_wave(self, reserve: List[str]) -> Tuple[List[str], List[str]]:
+        step = max(1, self.fanout_config['expand_step'])
+        return reserve[:step], reserve[step:]
+
+    def _record_fanout(self, planned: int, used: int, cached: int, waves: int):
+        self.last_fanout = {'planned': planned, 'used': used, 'cached': cached, 'waves': waves}
+        log.info("[cyan]Query fan-out[/cyan]", **self.last_fanout)
+
+    def _submit_searches(self, executor: ThreadPoolExecutor, queries: List[str], intent: str, future_to_query: Dict) -> Set:
+        futures = {executor.submit(self._enhanced_search_with_validation, query, intent): query for query in queries}
+        future_to_query.update(futures)
+        return set(futures)
+
+    def _progressive_search(self, user_query: str, search_queries: List[str], intent: str, settings: Dict):
+        executor = ThreadPoolExecutor(max_workers=len(search_queries))
+        try:
+            first_wave, reserve, cached = self._plan_fanout(search_queries, intent)
+            future_to_query: Dict = {}
+            pending = self._submit_searches(executor, first_wave, intent, future_to_query)
+            waves = 1
+            all_results: List[SearchResult] = []
+            deadline = time.monotonic() + settings['deadline']
+
+            while True:
+                strong = self._count_strong_results(all_results, settings['min_score'])
+                if not pending:
+                    if not reserve or strong >= settings['quorum'] or self._fanout_satisfied(all_results):
+                        break
+                    wave, reserve = self._next_wave(reserve)
+                    log.info(f"[blue]Expanding search with {len(wave)} more queries ({strong} strong results so far)[/blue]")
+                    pending = self._submit_searches(executor, wave, intent, future_to_query)
+                    waves += 1
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._collect_search_future(future, future_to_query[future], all_results)
+
+                strong = self._count_strong_results(all_results, settings['min_score'])
+                if pending and strong >= settings['quorum']:
+                    log.info(f"[blue]Quorum reached ({strong} results >= {settings['min_score']:.2f}); synthesizing with {len(pending)} queries still running[/blue]")
+                    break
+
+            self._record_fanout(len(search_queries), len(future_to_query), cached, waves)
+
+            if pending and time.monotonic() >= deadline:
+                log.warning(f"[yellow]Deadline of {settings['deadline']:.1f}s reached; dropping {len(pending)} unfinished queries[/yellow]")
+                pending = set()
+
+            answer_parts: List[str] = []
+            for chunk in self._synthesize_results(all_results, user_query, intent, stream=True):
+                answer_parts.append(chunk)
+                yield chunk
+
+            if not pending:
+                return
+
+            late_results: List[SearchResult] = []
+            done, still_pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()))
+            for future in done:
+                self._collect_search_future(future, future_to_query[future], late_results)
+            if still_pending:
+                log.warning(f"[yellow]Dropping {len(still_pending)} queries that missed the {settings['deadline']:.1f}s deadline[/yellow]")
+
+            if settings['late_results'] == 'refine':
+                yield from self._refine_with_late_results(late_results, user_query, intent, "".join(answer_parts), settings)
+            elif late_results:
+                log.debug("[dim]Dropped %d late results (late_results='drop')[/dim]", len(late_results))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _refine_with_late_results(self, late_results: List[SearchResult], user_query: str, intent: str, previous_answer: str, settings: Dict):
+        used_urls = {res.url for res in self.last_search_results}
+        fresh = {res.url: res for res in late_results if res.url not in used_urls and res.final_score >= settings['min_score']}
+        if not fresh:
+            log.debug("[dim]No new high-scoring late results; skipping refinement[/dim]")
+            return
+
+        extra_results = sorted(fresh.values(), key=lambda x: x.final_score, reverse=True)[:3]
+        log.info(f"[blue]Refining answer with {len(extra_results)} late results[/blue]")
+
+        late_context = "\n".join(
+            f"[LATE RESULT {i}]\nTitle: {res.title}\nURL: {res.url}\nContent: {res.snippet}\n"
+            for i, res in enumerate(extra_results, 1)
+        )
+        refinement_prompt = f"""You already answered the question below. More search results arrived afterwards.
+
+USER QUESTION: {user_query}
+SEARCH INTENT: {intent}
+
+YOUR PREVIOUS ANSWER:
+{previous_answer[-4000:]}
+
+NEW SEARCH RESULTS:
+{late_context}
+
+List ONLY facts from the new results that add to or correct the previous answer, as short markdown bullet points with the source name in parentheses. If nothing new is relevant, reply with a single line saying the new sources confirm the answer.
+
+LANGUAGE: {self.last_answer_language} (write the entire response in this language)"""
+
+        messages = [
+            {"role": "system", "content": "You are a helpful research analyst who provides accurate, well-sourced information."},
+            {"role": "user", "content": refinement_prompt}
+        ]
+        try:
+            yield "\n\n---\n\n**Update from additional sources:**\n\n"
+            for chunk in generate_response(messages, stream=True, temperature=0.2):
+                if chunk:
+                    yield chunk
+            self.last_search_results = list(self.last_search_results) + extra_results
+            sources_block = "\n".join([f"- {res.title} ({res.url})" for res in extra_results])
+            yield f"\n\n**Additional Sources:**\n{sources_block}"
+        except Exception as e:
+            log.error(f"[red]Refinement error: {e}[/red]")
+
     def search_with_context(self, user_query: str, search_query: str, previous_context: Optional[str] = None, stream: bool = True):        
         intent = self._classify_query_intent(search_query)
         
-        search_queries = self._generate_intent_based_queries(search_query, intent)
+        search_queries = self._generate_intent_based_queries(search_query, intent, max_queries=self.fanout_config['max_queries'])
         
-        console.log("[blue]Executing parallel searches with intent-aware queries...[/blue]")
+        log.info("[blue]Executing parallel searches with intent-aware queries...[/blue]")
+
+        settings = self._progressive_settings(intent)
+        if stream and settings['enabled']:
+            return self._progressive_search(user_query, search_queries, intent, settings)
         
         all_results = []
+        wave, reserve, cached = self._plan_fanout(search_queries, intent)
+        used = waves = 0
         with ThreadPoolExecutor(max_workers=len(search_queries)) as executor:
-            future_to_query = {
-                executor.submit(self._enhanced_search_with_validation, query, intent): query 
-                for query in search_queries
-            }
-            
-            for future in as_completed(future_to_query):
-                query = future_to_query[future]
-                try:
-                    results = future.result()
-                    all_results.extend(results)
-                    console.log(f"[green]Completed search for:[/green] '{query}' - {len(results)} results")
-                except Exception as e:
-                    console.log(f"[red]Search failed for '{query}': {e}[/red]")
+            while wave:
+                future_to_query: Dict = {}
+                self._submit_searches(executor, wave, intent, future_to_query)
+                used += len(wave)
+                waves += 1
+                
+                for future in as_completed(future_to_query):
+                    self._collect_search_future(future, future_to_query[future], all_results)
+                
+                if not reserve or self._fanout_satisfied(all_results):
+                    break
+                wave, reserve = self._next_wave(reserve)
+        self._record_fanout(len(search_queries), used, cached, waves)
 
         return self._synthesize_results(all_results, user_query, intent, stream=stream)
 
@@ -637,7 +910,7 @@ def run_enhanced_search_persona(user_prompt: str, query_for_web: str, previous_c
         for chunk in generator:
             yield chunk
     except Exception as e:
-        console.log(f"[red]Critical error in search persona: {e}[/red]")
+        log.error(f"[red]Critical error in search persona: {e}[/red]")
         yield f"Sorry, a critical error occurred during the search. Error: {str(e)}"
 
 def run_search_persona(user_prompt: str, query_for_web: str):
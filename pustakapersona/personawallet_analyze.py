@@ -1,10 +1,13 @@
 import json
-from tools.shared_console import console
+import time
+from tools.structured_log import get_logger
 from rich.panel import Panel
 from rich.markdown import Markdown
 from typing import List, Dict, Optional
 from tools.lang_utils import detect_target_language_from_messages
 
+log = get_logger("pustakapersona.personawallet_analyze")
+
 def _detect_lang_prioritize_last(messages: Optional[List[Dict]]) -> str:
     try:
         if messages:
@@ -38,7 +41,7 @@ def _detect_lang_prioritize_last(messages: Optional[List[Dict]]) -> str:
 
 from tools.searchAddrsClean import SearchAddrsInfo
 from core.fireworks_api_client import generate_response
-from tools.wallet_cache_handler import save_to_cache
+from tools.wallet_cache_handler import get_wallet_data
 
 
 def create_intelligent_summary(result_dict: dict, top_n_assets=15) -> dict:
@@ -125,19 +128,25 @@ LANGUAGE: {target_language} (write the entire report in this language)
 """
     return prompt
 
-def run_wallet_analysis_persona(address: str, messages: Optional[List[Dict]] = None):
+def _freshness_note(lookup: Dict) -> str:
+    if lookup["status"] == "fetched":
+        return ""
+    minutes = int((time.time() - lookup["fetched_at"]) // 60)
+    age = f"{minutes} min ago" if minutes else "just now"
+    note = f"_Cached {lookup.get('source', 'wallet')} data from {age}"
+    return note + ("; refreshing in the background._\n\n" if lookup["status"] == "stale" else "._\n\n")
+
+def run_wallet_analysis_persona(address: str, messages: Optional[List[Dict]] = None, force_refresh: bool = False):
     
     try:
-        searcher = SearchAddrsInfo()
-        raw_data_dict = searcher.query(address)
+        lookup = get_wallet_data(address, SearchAddrsInfo().query, force_refresh=force_refresh)
+        raw_data_dict = lookup["data"]
 
         if not raw_data_dict or not isinstance(raw_data_dict, dict) or not raw_data_dict.get('portfolio'):
             return {
                 "report_markdown": f"No portfolio data found for address `{address}`.", 
                 "cache_ready": False
             }
- 
-        save_to_cache(address, raw_data_dict)
 
         intelligent_summary = create_intelligent_summary(raw_data_dict)
         summary_json_str = json.dumps(intelligent_summary, indent=2, ensure_ascii=False)
@@ -148,7 +157,7 @@ def run_wallet_analysis_persona(address: str, messages: Optional[List[Dict]] = N
         
         trader_analysis_md = "".join(generate_response(messages, temperature=0.2))
 
-        final_report = f"# 📈 Trader Analysis Report for `{address}`\n\n{trader_analysis_md}"
+        final_report = f"# 📈 Trader Analysis Report for `{address}`\n\n{_freshness_note(lookup)}{trader_analysis_md}"
         
 
         return {
@@ -158,25 +167,27 @@ def run_wallet_analysis_persona(address: str, messages: Optional[List[Dict]] = N
         }
 
     except Exception as e:
-        console.log(f"[red]Error in wallet_analyzer persona for '{address}': {e}[/red]")
+        log.error(f"[red]Error in wallet_analyzer persona for '{address}': {e}[/red]")
         return {
             "report_markdown": f"Sorry, an internal error occurred while analyzing address `{address}`.",
             "cache_ready": False
         }
 
-def run_wallet_analysis_persona_stream(address: str, messages: Optional[List[Dict]] = None):
+def run_wallet_analysis_persona_stream(address: str, messages: Optional[List[Dict]] = None, force_refresh: bool = False):
     try:
         yield f"# 📈 Trader Analysis Report for `{address}`\n\n"
 
-        searcher = SearchAddrsInfo()
-        raw_data_dict = searcher.query(address)
+        lookup = get_wallet_data(address, SearchAddrsInfo().query, force_refresh=force_refresh)
+        raw_data_dict = lookup["data"]
 
         if not raw_data_dict or not isinstance(raw_data_dict, dict) or not raw_data_dict.get('portfolio'):
-            console.log(f"[red]No portfolio data for: {address}[/red]")
+            log.error(f"[red]No portfolio data for: {address}[/red]")
             yield f"[yellow]No portfolio data found for address `{address}`.[/yellow]"
             return
 
-        save_to_cache(address, raw_data_dict)
+        note = _freshness_note(lookup)
+        if note:
+            yield note
 
         intelligent_summary = create_intelligent_summary(raw_data_dict)
         summary_json_str = json.dumps(intelligent_summary, indent=2, ensure_ascii=False)
@@ -195,13 +206,13 @@ def run_wallet_analysis_persona_stream(address: str, messages: Optional[List[Dic
                     continue
                 yield chunk if isinstance(chunk, str) else str(chunk)
         except Exception as stream_err:
-            console.log(f"[red]Streaming error: {stream_err}[/red]")
+            log.error(f"[red]Streaming error: {stream_err}[/red]")
             yield "\n\n[red]Streaming terminated due to an internal error.[/red]"
             return
 
-        console.log(f"[green]Streaming analysis completed for: {address}[/green]")
+        log.info(f"[green]Streaming analysis completed for: {address}[/green]")
         yield "\n\n---\n\nAnalysis complete."
 
     except Exception as e:
-        console.log(f"[red]Error in wallet_analyzer (stream) for '{address}': {e}[/red]")
+        log.error(f"[red]Error in wallet_analyzer (stream) for '{address}': {e}[/red]")
         yield f"Sorry, an internal error occurred while analyzing address `{address}`."
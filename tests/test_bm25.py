@@ -0,0 +1,68 @@
+import json
+import time
+
+import numpy as np
+
+from tools.bm25 import BM25Index, BM25RelevanceModel, CorpusStats
+
+
+def test_corpus_stats_round_trip(tmp_path):
+    path = str(tmp_path / "stats" / "bm25_corpus.json")
+    stats = CorpusStats(path=path)
+    stats.add_documents([["python", "release"], ["python", "python", "docs"]])
+    stats.save()
+
+    loaded = CorpusStats.load(path)
+
+    assert (loaded.doc_count, loaded.total_length) == (2, 5)
+    assert loaded.doc_freq == {"python": 2, "release": 1, "docs": 1}
+    assert not (tmp_path / "stats" / "bm25_corpus.json.tmp").exists()
+
+
+def test_missing_or_corrupt_stats_load_empty(tmp_path):
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text("{not json")
+
+    for path in (str(tmp_path / "missing.json"), str(corrupt)):
+        stats = CorpusStats.load(path)
+        assert (stats.doc_count, stats.doc_freq, stats.path) == (0, {}, path)
+
+
+def test_records_are_saved_together_after_the_delay(tmp_path, monkeypatch):
+    path = tmp_path / "bm25_corpus.json"
+    stats = CorpusStats(path=str(path))
+    saves = []
+    save = stats.save
+    monkeypatch.setattr(stats, "save", lambda: saves.append(1) or save())
+    model = BM25RelevanceModel(corpus_stats=stats)
+
+    stats.save_soon(delay=0.05)
+    model.record(["first snippet"])
+    model.record(["second snippet"])
+    assert not path.exists()
+
+    deadline = time.monotonic() + 2.0
+    while not saves and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats.flush()
+    assert saves == [1]
+    assert json.loads(path.read_text())["doc_count"] == 2
+
+
+def test_matching_documents_rank_first():
+    index = BM25Index(["python packaging guide", "cooking pasta at home", "python release notes for packaging"])
+
+    scores = index.normalized_scores("python packaging")
+
+    assert scores[1] == 0.0
+    assert scores[0] > 0 and scores[2] > 0
+    assert np.all((scores >= 0) & (scores <= 1))
+
+
+def test_corpus_stats_lower_the_idf_of_common_terms():
+    stats = CorpusStats()
+    stats.add_documents([["python"]] * 50 + [["rust"]])
+    index = BM25Index(["python rust"], corpus_stats=stats)
+
+    assert index.idf("python") < index.idf("rust")
+
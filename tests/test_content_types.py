@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from tools.content_types import classify, extract_non_html
+from tools.page_fetch import FetchedPage, sniff_charset
+
+LATIN1_FEED = """<?xml version="1.0" encoding="ISO-8859-1"?>
+<rss version="2.0"><channel><title>Café naïve</title>
+<item><title>Résumé des marchés</title><link>https://news.example/1</link>
+<description>Le déficit a baissé en février.</description></item>
+</channel></rss>""".encode("latin-1")
+
+
+def page(body: bytes, content_type: str, url: str = "https://news.example/feed") -> FetchedPage:
+    return FetchedPage(url=url, status_code=200, content=body, encoding=sniff_charset(body[:1024], content_type),
+                       headers={"Content-Type": content_type}, cache_status="miss")
+
+
+@pytest.mark.parametrize("content_type", ["application/rss+xml", "text/xml", ""])
+def test_latin1_feed_keeps_its_accents(content_type):
+    result = extract_non_html(page(LATIN1_FEED, content_type))
+
+    assert result["content_type"] == "feed"
+    assert result["title"] == "Café naïve"
+    assert result["content"].startswith("## Résumé des marchés")
+    assert "Le déficit a baissé en février." in result["content"]
+
+
+def test_utf8_atom_feed_lists_entries():
+    body = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Blog — notes</title>
+<entry><title>First</title><link href="https://blog.example/1"/><updated>2024-01-02</updated>
+<summary>Hello über world</summary></entry></feed>""".encode("utf-8")
+
+    result = extract_non_html(page(body, "application/atom+xml"))
+
+    assert result["title"] == "Blog — notes"
+    assert result["content"] == "## First\n2024-01-02\nhttps://blog.example/1\nHello über world"
+
+
+def test_html_and_json_are_classified_by_type():
+    assert classify(page(b"<html><body>x</body></html>", "text/html")) == "html"
+    assert extract_non_html(page(b"<html></html>", "text/html")) is None
+    result = extract_non_html(page(json.dumps({"title": "Doc"}).encode(), "application/json"))
+    assert result["title"] == "Doc"
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.gold_text import GOLD, gold_text
+from tools import density_extract, lxml_extract
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "html"
+
+pytestmark = pytest.mark.skipif(not density_extract.available(), reason="lxml is not installed")
+
+
+def extract(html: str) -> str:
+    return density_extract.density_content(lxml_extract.parse_html(html))
+
+
+@pytest.mark.parametrize("name", sorted(GOLD))
+def test_fixture_text_matches_the_gold_file(name):
+    html = (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+
+    assert extract(html) + "\n" == (FIXTURES / f"{name}.expected.txt").read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("name", sorted(GOLD))
+def test_gold_files_are_up_to_date(name):
+    container, drop = GOLD[name]
+    html = (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+
+    assert gold_text(html, container, drop) == (FIXTURES / f"{name}.expected.txt").read_text(encoding="utf-8")
+
+
+PARAGRAPH = ("The council approved the budget for the new library after a long debate, and construction "
+             "is expected to start in the spring, according to the city planning office.")
+
+
+def test_inline_markup_inside_links_is_kept():
+    html = f"""<html><body><div class="content">
+        <p>{PARAGRAPH}</p>
+        <p>Officials said <a href="/r"><span class="meta">revenue</span></a> from the levy, about
+        <a href="/n"><strong class="share">twelve</strong></a> million, will cover the running costs.</p>
+        <p>{PARAGRAPH}</p>
+    </div></body></html>"""
+
+    text = extract(html)
+
+    assert "Officials said revenue from the levy, about twelve million, will cover the running costs." in text
+
+
+def test_link_lists_and_negative_blocks_are_dropped():
+    html = f"""<html><body><div class="post">
+        <p>{PARAGRAPH}</p>
+        <ul><li><a href="/a">Related story one</a></li><li><a href="/b">Related story two</a></li></ul>
+        <div class="share-tools">Share this on your favourite network today</div>
+        <p>{PARAGRAPH}</p>
+    </div><nav><a href="/">Home</a></nav></body></html>"""
+
+    text = extract(html)
+
+    assert text.count("The council approved") == 2
+    assert "Related story" not in text
+    assert "Share this" not in text
+    assert "Home" not in text
+
+
+def test_page_without_paragraphs_yields_nothing():
+    assert extract("<html><body><div><a href='/'>Home</a> <a href='/x'>More</a></div></body></html>") == ""
@@ -0,0 +1,50 @@
+import json
+
+from tools.domain_trust import SUFFIX_MATCH_FACTOR, DomainTrustTable
+
+TABLE = DomainTrustTable(
+    {"github.com": 0.9, "ft.com": 0.8, "gov": 0.85, "docs.python.org": 0.95},
+    {"programming": {"boost": ["github.com"], "penalty": ["pinterest.com"]}},
+)
+
+
+def test_exact_and_subdomain_matches():
+    assert TABLE.base_score("github.com") == 0.9
+    assert TABLE.base_score("GitHub.com:443") == 0.9
+    assert TABLE.base_score("gist.github.com") == 0.9 * SUFFIX_MATCH_FACTOR
+    assert TABLE.base_score("data.census.gov") == 0.85 * SUFFIX_MATCH_FACTOR
+
+
+def test_suffixes_match_whole_labels_only():
+    assert TABLE.lookup("microsoft.com").suffix_score is None
+    assert TABLE.base_score("microsoft.com") == 0.5
+    assert TABLE.base_score("python.org", default=0.3) == 0.3
+
+
+def test_intent_sets_cover_subdomains():
+    assert TABLE.is_boosted("api.github.com", "programming")
+    assert not TABLE.is_boosted("api.github.com", "news")
+    assert TABLE.is_penalized("www.pinterest.com", "programming")
+
+
+def test_update_replaces_cached_lookups():
+    table = DomainTrustTable({"example.com": 0.6}, {})
+    assert table.base_score("example.com") == 0.6
+
+    table.update({"example.com": 0.2}, {})
+
+    assert table.base_score("example.com") == 0.2
+
+
+def test_load_merges_override_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("TRUSTED_DOMAINS_FILE", raising=False)
+    override = tmp_path / "extra.json"
+    override.write_text(json.dumps({"domains": {"intranet.example": 0.99}}))
+    broken = tmp_path / "broken.json"
+    broken.write_text("{")
+
+    table = DomainTrustTable.load(extra_paths=[override, broken])
+
+    assert table.base_score("intranet.example") == 0.99
+    assert table.base_score("wiki.intranet.example") == 0.99 * SUFFIX_MATCH_FACTOR
@@ -0,0 +1,97 @@
+import os
+import time
+
+import pytest
+
+from tools.extraction_cache import ExtractionCache, LayerTimings, content_hash, extract_with_cache
+
+URL = "https://blog.example/post"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(cache_dir=str(tmp_path), max_age=60)
+
+
+class Extractor:
+    def __init__(self, result=None):
+        self.calls = 0
+        self.result = result
+
+    def __call__(self, url, html):
+        self.calls += 1
+        return self.result or {"title": "Post", "content": html.upper(), "source": url, "layer": "density"}
+
+
+def test_unchanged_body_is_served_from_cache(cache):
+    extract = Extractor()
+
+    first = extract_with_cache(URL, b"<p>v1</p>", "<p>v1</p>", extract, cache=cache)
+    second = extract_with_cache(URL, b"<p>v1</p>", "<p>v1</p>", extract, cache=cache)
+
+    assert extract.calls == 1
+    assert "cached" not in first
+    assert second["cached"] and second["content"] == "<P>V1</P>" and second["layer"] == "density"
+
+
+def test_changed_body_changes_the_key(cache):
+    extract = Extractor()
+    assert content_hash(b"<p>v1</p>") != content_hash(b"<p>v2</p>")
+
+    extract_with_cache(URL, b"<p>v1</p>", "<p>v1</p>", extract, cache=cache)
+    result = extract_with_cache(URL, b"<p>v2</p>", "<p>v2</p>", extract, cache=cache)
+
+    assert extract.calls == 2
+    assert result["content"] == "<P>V2</P>"
+
+
+def test_variants_and_urls_are_cached_separately(cache):
+    extract = Extractor()
+
+    extract_with_cache(URL, b"same", "same", extract, variant="v1", cache=cache)
+    extract_with_cache(URL, b"same", "same", extract, variant="v2", cache=cache)
+    extract_with_cache(URL + "?page=2", b"same", "same", extract, variant="v1", cache=cache)
+
+    assert extract.calls == 3
+
+
+def test_errors_and_untagged_results_are_not_cached(cache):
+    for result in ({"error": "blocked", "content": "x", "layer": "layer1"}, {"title": "T", "content": "text"}):
+        extract = Extractor(result)
+        extract_with_cache(URL, b"body", "body", extract, cache=cache)
+        extract_with_cache(URL, b"body", "body", extract, cache=cache)
+        assert extract.calls == 2
+
+
+def test_expired_entries_are_dropped(cache):
+    cache.put(URL, "hash", "T", "content", "layer1")
+    path = cache._path(URL, "hash", "")
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+    assert cache.get(URL, "hash") is None
+    assert not os.path.exists(path)
+
+
+def test_prune_evicts_the_oldest_entries_over_the_size_cap(tmp_path):
+    cache = ExtractionCache(cache_dir=str(tmp_path))
+    for i in range(4):
+        cache.put(f"{URL}/{i}", "hash", "T", "x" * 150, "layer1")
+        os.utime(cache._path(f"{URL}/{i}", "hash", ""), (1000 + i, time.time() - 10 + i))
+    cache.max_bytes = 2 * os.path.getsize(cache._path(f"{URL}/0", "hash", "")) + 10
+
+    cache.prune()
+
+    assert [cache.get(f"{URL}/{i}", "hash") is not None for i in range(4)] == [False, False, True, True]
+
+
+def test_layer_timings_summarize_each_layer():
+    timings = LayerTimings()
+    for _ in range(3):
+        with timings.measure("density", URL):
+            pass
+
+    snapshot = timings.snapshot()
+
+    assert snapshot["density"]["count"] == 3
+    assert snapshot["density"]["max_ms"] >= snapshot["density"]["mean_ms"] >= 0
@@ -0,0 +1,68 @@
+import pytest
+
+from tools import readle_layers
+from tools.extractor_memory import ExtractorMemory
+
+
+@pytest.fixture
+def memory(tmp_path):
+    return ExtractorMemory(path=str(tmp_path / "extractor_domains.json"), min_streak=2, revalidate_every=3)
+
+
+def test_layer_is_preferred_after_a_winning_streak(memory):
+    memory.record("Blog.example", "v2", "density")
+    assert memory.preferred("blog.example", "v2") is None
+
+    memory.record("blog.example", "v2", "density")
+    assert memory.preferred("blog.example", "v2") == "density"
+    assert memory.preferred("blog.example", "v1") is None
+
+
+def test_new_winner_restarts_the_streak(memory):
+    memory.record("blog.example", "v2", "density")
+    memory.record("blog.example", "v2", "density")
+    memory.record("blog.example", "v2", "trafilatura")
+
+    assert memory.preferred("blog.example", "v2") is None
+    assert memory.snapshot()["v2:blog.example"]["streak"] == 1
+
+
+def test_every_nth_page_runs_every_layer_again(memory):
+    memory.record("blog.example", "v2", "layer1")
+    memory.record("blog.example", "v2", "layer1")
+
+    picks = [memory.preferred("blog.example", "v2") for _ in range(4)]
+    assert picks == ["layer1", "layer1", "layer1", None]
+
+    memory.record("blog.example", "v2", "layer1")
+    assert memory.preferred("blog.example", "v2") == "layer1"
+
+
+def test_memory_survives_a_restart_and_ignores_failed_pages(memory):
+    memory.record("blog.example", "v2", "density")
+    memory.record("blog.example", "v2", "density")
+    memory.record("blog.example", "v2", None)
+
+    reloaded = ExtractorMemory(path=memory.path, min_streak=2)
+
+    assert reloaded.preferred("blog.example", "v2") == "density"
+
+
+def test_layers_fall_back_to_a_full_run_when_the_learned_layer_comes_up_short(memory, monkeypatch):
+    monkeypatch.setattr(readle_layers, "extractor_memory", memory)
+    layers = readle_layers.ReadleLayers("v2", rules=None, include_tables=False,
+                                        layer1_bs4=lambda html: ("Title", "too short"))
+    memory.record("blog.example", "v2", "layer1")
+    memory.record("blog.example", "v2", "layer1")
+    full_runs = []
+
+    def extract_all_layers(url, html, backend):
+        full_runs.append(url)
+        return {"title": "Title", "content": "x" * 600, "layer": "density"}
+
+    result = layers.extract_layers("https://blog.example/post", "<p>too short</p>", extract_all_layers, backend="bs4")
+
+    assert result["layer"] == "density"
+    assert full_runs == ["https://blog.example/post"]
+    entry = memory.snapshot()["v2:blog.example"]
+    assert (entry["layer"], entry["streak"]) == ("density", 1)
@@ -0,0 +1,65 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.host_scheduler import DEFAULT_LIMIT, HOST_LIMITS, HostLimit, HostScheduler, host_of
+
+
+def test_limits_match_hosts_and_their_subdomains():
+    scheduler = HostScheduler(limits={"x.com": HostLimit(1.0, 1, 0.0)})
+
+    assert host_of("https://API.X.com:443/v1") == "api.x.com"
+    assert scheduler.limit_for("api.x.com").max_concurrency == 1
+    assert scheduler.limit_for("notx.com") is DEFAULT_LIMIT
+    assert scheduler.limit_for("com") is DEFAULT_LIMIT
+
+
+def test_requests_to_one_host_are_spaced():
+    scheduler = HostScheduler(limits={"slow.example": HostLimit(min_interval=0.05, max_concurrency=3, jitter=0.0)})
+    starts = []
+
+    def request(_):
+        with scheduler.slot("https://slow.example/page"):
+            starts.append(time.monotonic())
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(request, range(3)))
+
+    starts.sort()
+    assert all(later - earlier >= 0.045 for earlier, later in zip(starts, starts[1:]))
+    assert scheduler.snapshot()["slow.example"]["requests"] == 3
+
+
+def test_concurrency_cap_holds_and_other_hosts_are_not_delayed():
+    scheduler = HostScheduler(default_limit=HostLimit(0.0, 3, 0.0),
+                              limits={"busy.example": HostLimit(min_interval=0.0, max_concurrency=1, jitter=0.0)})
+    inside = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def busy(_):
+        with scheduler.slot("https://busy.example/"):
+            with lock:
+                inside["now"] += 1
+                inside["peak"] = max(inside["peak"], inside["now"])
+            time.sleep(0.05)
+            with lock:
+                inside["now"] -= 1
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        busy_runs = [pool.submit(busy, i) for i in range(3)]
+        time.sleep(0.01)
+        with scheduler.slot("https://other.example/") as waited:
+            assert waited < 0.01
+        for run in busy_runs:
+            run.result()
+
+    assert inside["peak"] == 1
+    assert scheduler.snapshot()["busy.example"]["delayed"] >= 2
+
+
+def test_brave_burst_fits_the_search_deadlines():
+    limit = HOST_LIMITS["search.brave.com"]
+
+    # four fan-out queries, all within the concurrency cap, start within 1.5 s
+    assert limit.max_concurrency >= 4
+    assert 3 * (limit.min_interval + limit.jitter) <= 1.5
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from tools import lxml_extract, readle, readle_v2
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "html"
+# html.parser and lxml repair broken markup differently, so layer-1 parity is
+# only expected on well-formed pages.
+WELL_FORMED = sorted(path.stem for path in FIXTURES.glob("*.html") if path.stem != "malformed")
+
+pytestmark = pytest.mark.skipif(not lxml_extract.available(), reason="lxml is not installed")
+
+
+@pytest.mark.parametrize("module", [readle, readle_v2], ids=["readle", "readle_v2"])
+@pytest.mark.parametrize("name", WELL_FORMED)
+def test_lxml_layer1_matches_the_bs4_backend(module, name):
+    html = (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+
+    assert module.layers.layer1(html, "lxml")[:2] == module.layers.layer1(html, "bs4")[:2]
+
+
+def test_selectors_pick_the_first_matching_area():
+    tree = lxml_extract.parse_html("""<html><head><title> Page </title></head><body>
+        <div class="sidebar"><p>Sidebar text that is long enough to count.</p></div>
+        <div class="post-content main"><p>Body text that is long enough to count here.</p>
+        <script>var ignored = "script text that is long enough";</script></div></body></html>""")
+
+    assert lxml_extract.page_title(tree) == "Page"
+    assert lxml_extract.main_area(tree, (".missing", ".post-content")).get("class") == "post-content main"
+    assert lxml_extract.layer1_content(tree, lxml_extract.READLE_V2_RULES) == "Body text that is long enough to count here."
+
+
+def test_collecting_lines_leaves_the_tree_unchanged():
+    html = (FIXTURES / "blog-article.html").read_text(encoding="utf-8")
+    tree = lxml_extract.parse_html(html)
+    before = lxml_extract.etree.tostring(tree)
+
+    lxml_extract.layer1_content(tree, lxml_extract.READLE_V2_RULES)
+
+    assert lxml_extract.etree.tostring(tree) == before
+
+
+def test_page_without_title_or_body():
+    tree = lxml_extract.parse_html("<html><head></head></html>")
+
+    assert lxml_extract.page_title(tree) == "(no title)"
@@ -0,0 +1,38 @@
+from tools.near_duplicates import cluster_near_duplicates, collapse_near_duplicates, hamming_distance, simhash
+
+STORY = ("The central bank raised interest rates by a quarter point on Wednesday, citing persistent inflation "
+         "in services and a tight labour market, and signalled that further increases remain possible this year.")
+SYNDICATED = STORY.replace("Wednesday", "Wednesday afternoon")
+OTHER = "A new open source library makes it easier to parse PDF files in Python, with support for tables and forms."
+
+
+def test_near_identical_texts_have_close_fingerprints():
+    assert hamming_distance(simhash(STORY), simhash(SYNDICATED)) <= 7
+    assert hamming_distance(simhash(STORY), simhash(OTHER)) > 7
+    assert simhash("") == 0
+
+
+def test_clusters_group_only_close_fingerprints():
+    ones = (1 << 64) - 1
+    assert cluster_near_duplicates([0b0, ones, 0b11, ones ^ 0b100], threshold=2) == [[0, 2], [1, 3]]
+
+
+def test_collapse_keeps_the_highest_scored_duplicate_in_place():
+    items = [("syndicated", SYNDICATED, 0.4), ("other", OTHER, 0.9), ("original", STORY, 0.7)]
+
+    kept, report = collapse_near_duplicates(items, text_of=lambda item: item[1], score_of=lambda item: item[2],
+                                            block_of=lambda item: item[1])
+
+    assert [item[0] for item in kept] == ["other", "original"]
+    assert (report.clusters, report.removed) == (1, 1)
+    assert report.members == {2: [0]}
+    assert report.tokens_saved > 0
+
+
+def test_collapse_breaks_score_ties_by_position():
+    items = [("first", STORY, 0.5), ("second", SYNDICATED, 0.5)]
+
+    kept, _ = collapse_near_duplicates(items, text_of=lambda item: item[1], score_of=lambda item: item[2],
+                                       block_of=lambda item: item[1])
+
+    assert [item[0] for item in kept] == ["first"]
@@ -0,0 +1,129 @@
+import io
+
+import pytest
+import requests
+
+from tools.page_fetch import ContentRejected, PageFetcher, sniff_charset
+
+URL = "https://news.example/story"
+HTML = {"Content-Type": "text/html; charset=utf-8"}
+
+
+def response(status=200, body=b"", headers=None):
+    result = requests.Response()
+    result.status_code = status
+    result.url = URL
+    result.headers.update(headers or {})
+    result.raw = io.BytesIO(body)
+    return result
+
+
+class FakeSession:
+    """Answers GETs from a queue of responses and records the request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def get(self, url, headers=None, proxies=None, timeout=None, stream=False):
+        self.sent.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    fetcher = PageFetcher(cache_dir=str(tmp_path))
+
+    def serve(*responses):
+        session = FakeSession(*responses)
+        monkeypatch.setattr(fetcher, "session_for", lambda url: session)
+        return session
+    fetcher.serve = serve
+    return fetcher
+
+
+def test_fresh_page_is_served_from_disk(fetcher):
+    session = fetcher.serve(response(body=b"<p>hello</p>", headers={**HTML, "Cache-Control": "max-age=600"}))
+
+    first = fetcher.fetch(URL)
+    second = fetcher.fetch(URL)
+
+    assert (first.cache_status, second.cache_status) == ("miss", "hit")
+    assert second.content == b"<p>hello</p>"
+    assert len(session.sent) == 1
+
+
+def test_stale_page_is_revalidated_with_its_etag(fetcher):
+    session = fetcher.serve(
+        response(body=b"<p>v1</p>", headers={**HTML, "Cache-Control": "no-cache", "ETag": '"v1"'}),
+        response(status=304, headers={"ETag": '"v1"'}),
+    )
+
+    fetcher.fetch(URL)
+    page = fetcher.fetch(URL)
+
+    assert page.cache_status == "revalidated"
+    assert page.content == b"<p>v1</p>"
+    assert page.text == "<p>v1</p>"
+    assert session.sent[1]["If-None-Match"] == '"v1"'
+    assert fetcher.metrics.snapshot()["revalidated"] == 1
+
+
+def test_304_without_a_cached_copy_is_refetched_unconditionally(fetcher):
+    session = fetcher.serve(response(status=304), response(body=b"<p>full</p>", headers=HTML))
+
+    page = fetcher.fetch(URL, headers={"If-None-Match": '"old"', "User-Agent": "test"})
+
+    assert page.cache_status == "miss"
+    assert page.content == b"<p>full</p>"
+    assert "If-None-Match" not in session.sent[1]
+    assert session.sent[1]["User-Agent"] == "test"
+
+
+def test_repeated_304_without_a_cached_copy_is_an_error(fetcher):
+    fetcher.serve(response(status=304), response(status=304))
+
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch(URL, headers={"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+
+def test_truncated_body_is_not_reused_under_a_larger_cap(fetcher):
+    body = b"x" * 100
+    session = fetcher.serve(
+        response(body=body, headers={**HTML, "Cache-Control": "max-age=600"}),
+        response(body=body, headers={**HTML, "Cache-Control": "max-age=600"}),
+    )
+
+    small = fetcher.fetch(URL, max_bytes=10)
+    assert small.truncated and small.content == b"x" * 10
+    assert fetcher.fetch(URL, max_bytes=5).cache_status == "hit"
+
+    full = fetcher.fetch(URL, max_bytes=1000)
+    assert full.cache_status == "miss" and full.content == body and not full.truncated
+    assert len(session.sent) == 2
+
+
+def test_no_store_and_binary_responses(fetcher):
+    session = fetcher.serve(
+        response(body=b"secret", headers={**HTML, "Cache-Control": "no-store"}),
+        response(body=b"secret", headers={**HTML, "Cache-Control": "no-store"}),
+        response(body=b"%PDF", headers={"Content-Type": "application/pdf"}),
+    )
+
+    fetcher.fetch(URL)
+    assert fetcher.fetch(URL).cache_status == "miss"
+    with pytest.raises(ContentRejected):
+        fetcher.fetch(URL, force_refresh=True)
+    assert len(session.sent) == 3
+
+
+@pytest.mark.parametrize("head, content_type, expected", [
+    (b"\xef\xbb\xbf<html>", None, "utf-8"),
+    (b"<html>", "text/html; charset=ISO-8859-1", "iso8859-1"),
+    (b'<?xml version="1.0" encoding="windows-1252"?><rss/>', None, "cp1252"),
+    (b'<meta charset="shift_jis">', "text/html", "shift_jis"),
+    ("café au lait".encode("latin-1"), "text/html", "cp1252"),
+    ("trailing é".encode("utf-8")[:-1], "text/html", "utf-8"),
+])
+def test_sniff_charset(head, content_type, expected):
+    assert sniff_charset(head, content_type) == expected
@@ -0,0 +1,55 @@
+from tools.pagination import page_links, scrape_paginated
+
+
+def test_numbered_page_links_are_followed_in_order():
+    html = """<a href="/story?page=3">3</a> <a href="/story?page=2">2</a>
+              <a href="/other?page=2">other story</a> <a href="/story/">1</a>"""
+
+    assert page_links("https://news.example/story", html) == [
+        "https://news.example/story?page=2",
+        "https://news.example/story?page=3",
+    ]
+
+
+def test_path_page_links_are_followed():
+    html = '<a href="https://blog.example/guide/page/2/">Next</a>'
+
+    assert page_links("https://blog.example/guide/", html) == ["https://blog.example/guide/page/2/"]
+
+
+def test_wordpress_post_ids_are_not_pages():
+    html = """<a href="/?p=124">Next post</a> <a href="/?p=125">Another post</a>
+              <a href="/?p=122">Previous post</a>"""
+
+    assert page_links("https://blog.example/?p=123", html) == []
+
+
+def test_wordpress_post_is_paged_with_page_param():
+    html = '<a href="/?p=123&page=2">2</a> <a href="/?p=124">Next post</a>'
+
+    assert page_links("https://blog.example/?p=123", html) == [
+        "https://blog.example/?p=123&page=2",
+    ]
+
+
+def test_rel_next_is_used_when_no_numbered_links():
+    html = '<link rel="next" href="/read?pg=2"> <a href="/read?pg=9">last</a>'
+
+    assert page_links("https://docs.example/read", html) == ["https://docs.example/read?pg=2"]
+
+
+def test_scrape_paginated_stitches_pages_and_drops_repeats():
+    site = {
+        "https://a.example/s": {"content": "one", "page_links": ["https://a.example/s?page=2", "https://a.example/s?page=3"]},
+        "https://a.example/s?page=2": {"content": "two", "page_links": []},
+        "https://a.example/s?page=3": {"content": "one", "page_links": []},
+    }
+
+    def scrape(url, max_bytes=None, with_page_links=False):
+        return dict(site[url], title="S")
+
+    result = scrape_paginated("https://a.example/s", scrape)
+
+    assert result["content"] == "one\n\ntwo"
+    assert result["pages"] == ["https://a.example/s", "https://a.example/s?page=2"]
+    assert "page_links" not in result
@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pustakapersona import personareadle as readle
+from tools.text_utils import CHARS_PER_TOKEN
+
+CONFIG = dict(readle.LONG_DOCUMENT_CONFIG, chunk_tokens=50, max_concurrency=2, map_timeout=10.0, map_retries=1)
+TEXT = "\n\n".join(f"Paragraph {i} says the company raised {i} million dollars from investors." * 8 for i in range(4))
+
+
+class FakeLLM:
+    """Answers map calls with `notes(part)` and records the reduce prompt."""
+
+    def __init__(self, notes):
+        self.notes = notes
+        self.calls = {}
+        self.reduce_prompt = None
+
+    def __call__(self, messages, stream=False, temperature=0.7, **kwargs):
+        prompt = messages[0]["content"]
+        if stream:
+            self.reduce_prompt = prompt
+            yield "summary"
+            return
+        part = int(prompt.split("part ", 1)[1].split(" ", 1)[0])
+        self.calls[part] = self.calls.get(part, 0) + 1
+        yield self.notes(part, self.calls[part])
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    def install(notes):
+        fake = FakeLLM(notes)
+        monkeypatch.setattr(readle, "generate_response", fake)
+        return fake
+    return install
+
+
+def summarize():
+    return "".join(readle._summarize_long_document("Page", TEXT, "English", CONFIG))
+
+
+def test_error_replies_are_left_out_of_the_reduce_step(llm):
+    fake = llm(lambda part, call: "\n[ERROR] Sorry, there's a connection problem." if part == 1 else f"- notes {part}")
+
+    assert summarize() == "summary"
+    assert fake.calls[1] == 2
+    assert "[ERROR]" not in fake.reduce_prompt
+    assert "[PART 1/" not in fake.reduce_prompt
+    assert "- notes 2" in fake.reduce_prompt
+
+
+def test_failed_part_is_retried(llm):
+    fake = llm(lambda part, call: "Error: LLM client not found." if call == 1 else f"- notes {part}")
+
+    assert summarize() == "summary"
+    assert all(calls == 2 for calls in fake.calls.values())
+    assert "[PART 1/" in fake.reduce_prompt
+
+
+def test_error_is_surfaced_when_every_part_fails(llm):
+    fake = llm(lambda part, call: "\n[ERROR] An unexpected error occurred in the system.")
+
+    output = summarize()
+
+    assert output.startswith("Sorry")
+    assert fake.reduce_prompt is None
+
+
+def page_of(tokens):
+    sentence = "The company raised new funding from investors in the region this year. "
+    return sentence * (tokens * CHARS_PER_TOKEN // len(sentence) + 1)
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    taken = []
+    monkeypatch.setattr(readle, "extractive_summary", lambda text, budget: taken.append("presummary") or text[:budget * CHARS_PER_TOKEN])
+    monkeypatch.setattr(readle, "_summarize_long_document", lambda *args: iter(taken.append("map-reduce") or ["long"]))
+    monkeypatch.setattr(readle, "_stream_summary", lambda prompt: iter(taken.append("single") or ["short"]))
+    return taken
+
+
+def test_ten_thousand_token_page_goes_through_map_reduce(routes):
+    content = page_of(10000)
+    assert readle.estimate_tokens(content) > readle.LONG_DOCUMENT_CONFIG['threshold_tokens']
+
+    assert "".join(readle._summarize_content("Page", content, "English")) == "long"
+    assert routes == ["map-reduce"]
+
+
+def test_mid_sized_page_is_presummarized(routes):
+    assert "".join(readle._summarize_content("Page", page_of(4000), "English")) == "short"
+    assert routes == ["presummary", "single"]
+
+
+def test_map_calls_are_bounded_across_concurrent_pages(monkeypatch):
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def slow_llm(messages, stream=False, temperature=0.7, **kwargs):
+        if stream:
+            yield "summary"
+            return
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.02)
+        with lock:
+            running["now"] -= 1
+        yield "- notes"
+
+    monkeypatch.setattr(readle, "generate_response", slow_llm)
+    monkeypatch.setattr(readle, "_map_slots", threading.BoundedSemaphore(2))
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        outputs = list(pool.map(lambda _: summarize(), range(3)))
+
+    assert outputs == ["summary"] * 3
+    assert running["peak"] <= 2
+
+
+def test_batch_page_whose_summary_failed_is_reported_as_error(monkeypatch):
+    monkeypatch.setattr(readle, "scrape_manual", lambda url: {"title": "Page", "content": "Short page text."})
+    monkeypatch.setattr(readle, "_stream_summary", lambda prompt: iter(["Partial answer", "\n[ERROR] Sorry, there's a connection problem."]))
+    slots = defaultdict(lambda: threading.BoundedSemaphore(1))
+
+    result = readle._read_and_summarize("https://a.example/x", "English", slots)
+
+    assert result["url"] == "https://a.example/x"
+    assert "connection problem" in result["error"]
+    assert "summary" not in result
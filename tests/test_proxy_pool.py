@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from tools import proxy_pool, readle_v2
+from tools.proxy_pool import CLOSED, HALF_OPEN, OPEN, ProxyPool, is_proxy_failure
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+@pytest.mark.parametrize("error, expected", [
+    (requests.ConnectTimeout("connect timed out"), True),
+    (requests.ReadTimeout("read timed out"), True),
+    (requests.exceptions.ProxyError("tunnel failed"), True),
+    (requests.ConnectionError("refused"), True),
+    (http_error(407), True),
+    (http_error(502), True),
+    (http_error(404), False),
+    (http_error(500), False),
+    (ValueError("bad body"), False),
+])
+def test_only_transport_and_proxy_errors_count_against_a_proxy(error, expected):
+    assert is_proxy_failure(error) is expected
+
+
+class FailingFetcher:
+    """Raises `error` for proxied requests and answers direct ones."""
+
+    def __init__(self, error):
+        self.error = error
+
+    def cached(self, url, max_bytes=None):
+        return None
+
+    def fetch(self, url, headers=None, proxies=None, timeout=None, max_bytes=None):
+        if proxies:
+            raise self.error
+        return "direct"
+
+
+@pytest.mark.parametrize("error, state", [(http_error(404), CLOSED), (requests.ConnectTimeout("timed out"), OPEN)])
+def test_readle_fallback_reports_only_proxy_failures(monkeypatch, error, state):
+    pool = ProxyPool(proxies=["10.0.0.1:8080"], failure_threshold=1)
+    monkeypatch.setattr(readle_v2, "get_proxy_pool", lambda: pool)
+    monkeypatch.setattr(readle_v2, "get_page_fetcher", lambda: FailingFetcher(error))
+
+    assert readle_v2.make_request_with_fallback("https://a.example/missing") == "direct"
+    assert pool.proxies[0].state == state
+
+
+def test_circuit_opens_after_consecutive_failures_and_half_opens_after_cooldown(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(proxy_pool, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    pool = ProxyPool(proxies=["10.0.0.1:8080"], failure_threshold=2, cooldown=60)
+    proxy = pool.proxies[0]
+
+    pool.report(proxy, False)
+    assert proxy.state == CLOSED
+    pool.report(proxy, False)
+    assert proxy.state == OPEN
+    assert pool.choose() is None
+
+    clock[0] += 60
+    assert pool.choose() is proxy
+    assert proxy.state == HALF_OPEN
+
+    pool.report(proxy, False)
+    assert proxy.state == OPEN
+    clock[0] += 60
+    pool.choose()
+    pool.report(proxy, True, 0.5)
+    assert proxy.state == CLOSED
+    assert proxy.consecutive_failures == 0
+
+
+def test_choose_prefers_fast_reliable_proxies(monkeypatch):
+    pool = ProxyPool(proxies=["10.0.0.1:8080", "10.0.0.2:8080"], alpha=0.5)
+    fast, slow = pool.proxies
+    for _ in range(5):
+        pool.report(fast, True, 0.2)
+        pool.report(slow, True, 4.0)
+
+    assert fast.latency < 0.3 and slow.latency > 3.5
+    assert pool.weight(fast) > 10 * pool.weight(slow)
+    heaviest = lambda candidates, weights: [candidates[weights.index(max(weights))]]
+    monkeypatch.setattr(proxy_pool, "random", SimpleNamespace(choices=heaviest))
+    assert pool.choose() is fast
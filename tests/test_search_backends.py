@@ -0,0 +1,33 @@
+import pytest
+
+from tools import search_backends
+from tools.search_backends import SearchBackend, create_search_backend, register_search_backend
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(search_backends, "SEARCH_BACKENDS", dict(search_backends.SEARCH_BACKENDS))
+
+
+def test_backend_without_search_is_refused_at_registration():
+    class Incomplete(SearchBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="search"):
+        register_search_backend("incomplete", Incomplete)
+    assert "incomplete" not in search_backends.SEARCH_BACKENDS
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_complete_backend_can_be_registered_and_built():
+    class Echo(SearchBackend):
+        name = "echo"
+
+        def search(self, query, limit=12):
+            return {"status": "success", "organic_results": [{"title": query}]}
+
+    register_search_backend("echo", Echo)
+
+    backend = create_search_backend({"backend": "echo"})
+    assert backend.search("q")["organic_results"] == [{"title": "q"}]
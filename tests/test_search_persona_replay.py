@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from benchmarks import bench_search_persona as bench
+from tools.search_backends import FixtureBackend
+
+CASES = json.loads((bench.FIXTURE_DIR / "manifest.json").read_text(encoding="utf-8"))["cases"]
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["id"] for case in CASES])
+def test_recorded_case_replays_offline(case):
+    run = bench.run_case(case, speed=0.0)
+
+    assert run["intent"] == case["intent"]
+    assert run["ranking"]
+    assert run["answer_chars"] > 0
+    assert all(value is None or value >= 0 for value in run["stages"].values())
+
+
+def test_recorded_backend_serves_pages_by_query():
+    case = CASES[0]
+    clock = bench.StageClock()
+    backend = bench.RecordedPageBackend({"recorded query": dict(case["pages"][0], latency_ms=0)}, 0.0, clock)
+
+    page = backend.search("recorded query")
+
+    assert page["status"] == "success" and page["organic_results"]
+    assert clock.totals["parse"] > 0
+    assert backend.search("unrecorded query")["organic_results"] == []
+
+
+def test_fixture_backend_prefers_inline_responses_and_falls_back_to_default(tmp_path):
+    (tmp_path / "default.json").write_text(json.dumps([{"title": "Default", "link": "https://d.example"}]), encoding="utf-8")
+    backend = FixtureBackend(directory=str(tmp_path), responses={"inline": [{"title": "Inline", "link": "https://i.example"}]})
+
+    assert backend.search("inline")["organic_results"][0]["title"] == "Inline"
+    assert backend.search("anything else")["organic_results"][0]["title"] == "Default"
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from pustakapersona.personasearchweb_optimaldebug_fix import EnhancedSearchPersona, SearchResult
+from tools.semantic_rerank import SemanticReranker
+
+# Two-dimensional "embeddings": the query points along x, so a text's
+# similarity is its x component.
+VECTORS = {"query": [1.0, 0.0], "on topic": [1.0, 0.0], "off topic": [0.0, 1.0], "tail": [1.0, 0.0]}
+
+
+def embed(texts):
+    return [VECTORS[text.strip()] for text in texts]
+
+
+def result(snippet, score):
+    return SearchResult(title="", url=f"https://a.example/{snippet}", snippet=snippet, domain="a.example",
+                        relevance_score=score, final_score=score)
+
+
+def test_rerank_blends_only_the_head():
+    reranker = SemanticReranker(embedding_function=embed)
+    items = [("off topic", 0.9), ("on topic", 0.8), ("tail", 0.7)]
+
+    blended, similarities, report = reranker.rerank(items, "query", text_of=lambda item: item[0],
+                                                    score_of=lambda item: item[1], top_n=2, weight=0.5)
+
+    assert report.reranked == 2
+    assert np.allclose(similarities, [0.0, 1.0, 0.0])
+    assert np.allclose(blended, [0.45, 0.9, 0.7])
+
+
+@pytest.fixture
+def persona():
+    persona = EnhancedSearchPersona()
+    persona.rerank_config = dict(persona.rerank_config, enabled=True, top_n=2, weight=0.5)
+    persona.semantic_reranker = SemanticReranker(embedding_function=embed)
+    return persona
+
+
+def test_unblended_tail_stays_below_the_reranked_head(persona):
+    ranked = [result("off topic", 0.9), result("on topic", 0.8), result("tail", 0.7)]
+
+    reranked, report = persona._semantic_rerank(ranked, "query")
+
+    # "off topic" drops to 0.45, under the tail's unblended 0.7, yet the tail
+    # was never compared on the blended scale and stays last.
+    assert [res.snippet for res in reranked] == ["on topic", "off topic", "tail"]
+    assert [res.final_score for res in ranked] == [0.9, 0.8, 0.7]
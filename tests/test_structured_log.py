@@ -0,0 +1,53 @@
+import logging
+
+import pytest
+
+from tools import structured_log
+from tools.structured_log import configure, get_logger, strip_markup
+
+
+@pytest.fixture(autouse=True)
+def restore_settings():
+    level, profile = structured_log._settings.level, structured_log._settings.profile
+    yield
+    configure(level=level)
+    structured_log._settings.profile = profile
+
+
+def test_filtered_messages_are_never_formatted():
+    configure(level="info")
+    calls = []
+
+    class Expensive:
+        def __str__(self):
+            calls.append("str")
+            return "expensive"
+
+    log = get_logger("tests.lazy")
+    log.debug("value %s", Expensive())
+    log.debug(lambda: calls.append("callable") or "built")
+
+    assert calls == []
+
+
+def test_quiet_profile_writes_plain_lines_with_fields(caplog):
+    configure(level="debug", profile="quiet")
+    logging.getLogger("pustaka").addHandler(caplog.handler)
+    try:
+        get_logger("tests.quiet").warning("[yellow]Retrying %s[/yellow]", "[ERROR] page", attempt=2)
+    finally:
+        logging.getLogger("pustaka").removeHandler(caplog.handler)
+
+    assert caplog.records[-1].getMessage() == "Retrying [ERROR] page attempt=2"
+
+
+@pytest.mark.parametrize("marked, plain", [
+    ("[bold red]Failed:[/bold red] timeout", "Failed: timeout"),
+    ("[dim]cached[/] [link=https://a.example/x]https://a.example/x[/link]", "cached https://a.example/x"),
+    ("[#ff8800 on black]warm[/]", "warm"),
+    ("[ERROR] Sorry, there's a connection problem.", "[ERROR] Sorry, there's a connection problem."),
+    ("expected list[int], got [PART 1/2]", "expected list[int], got [PART 1/2]"),
+    ("[yellow]notes for [3] parts[/yellow]", "notes for [3] parts"),
+])
+def test_strip_markup_removes_only_rich_style_tags(marked, plain):
+    assert strip_markup(marked) == plain
@@ -0,0 +1,55 @@
+import numpy as np
+
+from tools.text_utils import estimate_tokens
+from tools.textrank import extractive_summary, pagerank, similarity_matrix, split_sentences
+
+TOPIC = [
+    "The startup raised new funding from investors to expand its battery factory.",
+    "Investors said the battery factory funding shows strong demand for storage.",
+    "The battery factory will double output after the new funding round closes.",
+    "Funding for battery storage has grown as investors look for steady returns.",
+]
+ASIDE = [
+    "Our office cat enjoys sleeping near the window in the afternoon sun.",
+    "Click here to subscribe to the weekly newsletter for more updates today.",
+]
+
+
+def test_split_sentences_keeps_line_numbers():
+    text = "First sentence here. Second one follows!\n\nThird line? Yes. e.g. not split"
+
+    assert split_sentences(text) == [
+        (0, "First sentence here."), (0, "Second one follows!"), (2, "Third line?"), (2, "Yes. e.g. not split"),
+    ]
+
+
+def test_similarity_is_symmetric_with_zero_diagonal():
+    similarity = similarity_matrix(TOPIC + ASIDE)
+
+    assert np.allclose(similarity, similarity.T)
+    assert np.all(np.diag(similarity) == 0)
+    assert similarity[0, 1] > similarity[0, 4]
+
+
+def test_pagerank_favours_connected_sentences():
+    scores = pagerank(similarity_matrix(TOPIC + ASIDE))
+
+    assert abs(scores.sum() - 1.0) < 1e-6
+    assert min(scores[:4]) > max(scores[4:])
+
+
+def test_summary_keeps_central_sentences_in_order_within_budget():
+    text = "\n".join(ASIDE[:1] + TOPIC + ASIDE[1:])
+
+    summary = extractive_summary(text, max_tokens=40)
+
+    lines = summary.splitlines()
+    assert estimate_tokens(summary) <= 45
+    assert all(line in TOPIC for line in lines)
+    assert lines == sorted(lines, key=TOPIC.index)
+
+
+def test_text_within_budget_is_unchanged():
+    text = "\n".join(TOPIC)
+
+    assert extractive_summary(text, max_tokens=estimate_tokens(text)) == text
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from tools import wallet_cache_handler as cache
+
+ADDRESS = "0xAbC0000000000000000000000000000000000001"
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+def wallet(value):
+    return {"portfolio": {"total_usd": value}}
+
+
+class FakeArkham:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self, address):
+        self.calls += 1
+        return wallet(self.value)
+
+
+def wait_for_refresh(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with cache._refreshing_lock:
+            if not cache._refreshing:
+                return
+        time.sleep(0.01)
+    raise AssertionError("background refresh did not finish")
+
+
+def test_fresh_entry_is_served_without_fetching():
+    cache.save_to_cache(ADDRESS, wallet(1))
+    fetch = FakeArkham(2)
+
+    lookup = cache.get_wallet_data(ADDRESS, fetch, ttl=60)
+
+    assert lookup["status"] == "fresh"
+    assert lookup["data"] == wallet(1)
+    assert fetch.calls == 0
+
+
+def test_stale_entry_is_served_then_refreshed_in_background():
+    cache.save_to_cache(ADDRESS, wallet(1))
+    fetch = FakeArkham(2)
+
+    stale = cache.get_wallet_data(ADDRESS, fetch, ttl=0)
+    assert stale["status"] == "stale"
+    assert stale["data"] == wallet(1)
+
+    wait_for_refresh()
+    assert fetch.calls == 1
+    refreshed = cache.get_wallet_data(ADDRESS, fetch, ttl=60)
+    assert refreshed["status"] == "fresh"
+    assert refreshed["data"] == wallet(2)
+    assert fetch.calls == 1
+
+
+def test_force_refresh_bypasses_a_fresh_entry():
+    cache.save_to_cache(ADDRESS, wallet(1))
+    fetch = FakeArkham(2)
+
+    lookup = cache.get_wallet_data(ADDRESS, fetch, ttl=60, force_refresh=True)
+
+    assert lookup["status"] == "fetched"
+    assert lookup["data"] == wallet(2)
+    assert fetch.calls == 1
+    assert cache.load_from_cache(ADDRESS) == wallet(2)
+
+
+def test_missing_entry_is_fetched_and_error_results_are_not_cached():
+    lookup = cache.get_wallet_data(ADDRESS, lambda address: {"error": "rate limited"}, ttl=60)
+
+    assert lookup["status"] == "fetched"
+    assert cache.load_entry(ADDRESS) is None
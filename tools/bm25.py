@@ -0,0 +1,238 @@
+import atexit
+import json
+import math
+import os
+import threading
+from functools import lru_cache
+from itertools import chain
+import numpy as np
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from tools.structured_log import get_logger
+from tools.text_utils import word_tokens
+
+log = get_logger("tools.bm25")
+
+Tokenizer = Callable[[str], List[str]]
+
+CORPUS_STATS_FILE = os.path.join(".search_cache", "bm25_corpus.json")
+MAX_CORPUS_TERMS = 100_000
+# Batches recorded within this many seconds share one write of the stats file.
+SAVE_DELAY = 30.0
+
+_SUFFIXES = ("ational", "tional", "ations", "ation", "ness", "ment", "ings", "ing", "edly", "ies", "ied", "ers", "ed", "es", "er", "ly", "s")
+
+
+@lru_cache(maxsize=65536)
+def light_stem(token: str) -> str:
+    """Strip one common English suffix; cheap and conservative (keeps at least 3 chars)."""
+    if len(token) <= 3 or token.isdigit():
+        return token
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            stem = token[:-len(suffix)]
+            if suffix in ("ies", "ied"):
+                stem += "y"
+            return stem
+    return token
+
+
+def simple_tokenizer(text: str) -> List[str]:
+    return word_tokens(text)
+
+
+def stemming_tokenizer(text: str) -> List[str]:
+    return list(map(light_stem, word_tokens(text)))
+
+
+TOKENIZERS: Dict[str, Tokenizer] = {
+    "default": stemming_tokenizer,
+    "simple": simple_tokenizer,
+}
+
+
+def register_tokenizer(name: str, tokenizer: Tokenizer):
+    TOKENIZERS[name] = tokenizer
+
+
+def get_tokenizer(tokenizer: Union[str, Tokenizer, None]) -> Tokenizer:
+    if callable(tokenizer):
+        return tokenizer
+    return TOKENIZERS.get(tokenizer or "default", stemming_tokenizer)
+
+
+class CorpusStats:
+    """Document-frequency statistics carried over from past searches, so IDF is
+    meaningful even when a single result batch holds only a handful of snippets."""
+
+    def __init__(self, doc_count: int = 0, total_length: int = 0, doc_freq: Optional[Dict[str, int]] = None,
+                 path: Optional[str] = None):
+        self.doc_count = doc_count
+        self.total_length = total_length
+        self.doc_freq: Dict[str, int] = doc_freq or {}
+        self.path = path
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._exit_hook = False
+
+    @classmethod
+    def load(cls, path: str = CORPUS_STATS_FILE) -> "CorpusStats":
+        try:
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    data = json.load(f)
+                return cls(data.get("doc_count", 0), data.get("total_length", 0), data.get("doc_freq", {}), path=path)
+        except (OSError, json.JSONDecodeError) as e:
+            log.error(f"[red]Failed to load BM25 corpus stats: {e}[/red]")
+        return cls(path=path)
+
+    def save(self):
+        """Write the stats now (atomically); the JSON is built outside the stats lock."""
+        if not self.path:
+            return
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._dirty = False
+            data = {"doc_count": self.doc_count, "total_length": self.total_length, "doc_freq": dict(self.doc_freq)}
+        with self._write_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                log.error(f"[red]Failed to save BM25 corpus stats: {e}[/red]")
+
+    def save_soon(self, delay: float = SAVE_DELAY):
+        """Save within `delay` seconds on a background timer, coalescing every
+        change made meanwhile; anything still unsaved is written at exit."""
+        if not self.path:
+            return
+        with self._lock:
+            self._dirty = True
+            if not self._exit_hook:
+                atexit.register(self.flush)
+                self._exit_hook = True
+            if self._timer is None:
+                self._timer = threading.Timer(delay, self.save)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Save now if anything changed since the last save."""
+        if self._dirty:
+            self.save()
+
+    def add_documents(self, tokenized: Sequence[List[str]]):
+        with self._lock:
+            for tokens in tokenized:
+                self.doc_count += 1
+                self.total_length += len(tokens)
+                for term in set(tokens):
+                    self.doc_freq[term] = self.doc_freq.get(term, 0) + 1
+            if len(self.doc_freq) > MAX_CORPUS_TERMS:
+                self.doc_freq = {t: c for t, c in self.doc_freq.items() if c > 1}
+
+
+class BM25Index:
+    """Compact inverted index over one batch of documents (term -> doc ids, term freqs)."""
+
+    def __init__(self, documents: Sequence[str], tokenizer: Union[str, Tokenizer, None] = None,
+                 k1: float = 1.2, b: float = 0.75, corpus_stats: Optional[CorpusStats] = None):
+        self.tokenizer = get_tokenizer(tokenizer)
+        self.k1 = k1
+        self.b = b
+        self.corpus_stats = corpus_stats
+
+        self.tokenized = [self.tokenizer(doc) for doc in documents]
+        lengths = np.fromiter(map(len, self.tokenized), dtype=np.int64, count=len(self.tokenized))
+        self.doc_lengths = lengths.astype(np.float64)
+
+        # Postings for every term at once: one (term id, doc id) key per token,
+        # counted with np.unique, which sorts them by term and then by doc.
+        width = max(len(self.tokenized), 1)
+        self.vocabulary: Dict[str, int] = {}
+        term_ids = np.fromiter((self.vocabulary.setdefault(t, len(self.vocabulary)) for t in chain.from_iterable(self.tokenized)),
+                               dtype=np.int64, count=int(lengths.sum()))
+        doc_ids = np.repeat(np.arange(len(self.tokenized), dtype=np.int64), lengths)
+        keys, tf = np.unique(term_ids * width + doc_ids, return_counts=True)
+        self._posting_docs = keys % width
+        self._posting_tf = tf.astype(np.float64)
+        self._posting_starts = np.searchsorted(keys // width, np.arange(len(self.vocabulary) + 1))
+
+        doc_count = len(self.tokenized)
+        total_length = float(self.doc_lengths.sum())
+        if corpus_stats is not None:
+            doc_count += corpus_stats.doc_count
+            total_length += corpus_stats.total_length
+        self.doc_count = doc_count
+        self.avg_length = (total_length / doc_count) if doc_count else 0.0
+
+    def __len__(self) -> int:
+        return len(self.tokenized)
+
+    def postings(self, term: str):
+        """(doc ids, term frequencies) of `term`, or None when no document has it."""
+        term_id = self.vocabulary.get(term)
+        if term_id is None:
+            return None
+        start, end = self._posting_starts[term_id], self._posting_starts[term_id + 1]
+        return self._posting_docs[start:end], self._posting_tf[start:end]
+
+    def idf(self, term: str) -> float:
+        term_id = self.vocabulary.get(term)
+        df = int(self._posting_starts[term_id + 1] - self._posting_starts[term_id]) if term_id is not None else 0
+        if self.corpus_stats is not None:
+            df += self.corpus_stats.doc_freq.get(term, 0)
+        return math.log(1.0 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    def scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.tokenized))
+        if not len(self.tokenized) or not self.avg_length:
+            return scores
+        norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths / self.avg_length)
+        for term in set(self.tokenizer(query)):
+            posting = self.postings(term)
+            if posting is None:
+                continue
+            doc_ids, tf = posting
+            scores[doc_ids] += self.idf(term) * tf * (self.k1 + 1.0) / (tf + norm[doc_ids])
+        return scores
+
+    def normalized_scores(self, query: str) -> np.ndarray:
+        """BM25 divided by the score of a document holding every query term once at
+        average length (the sum of their IDFs), clipped to [0, 1]."""
+        ideal = sum(self.idf(term) for term in set(self.tokenizer(query)))
+        if ideal <= 0:
+            return np.zeros(len(self.tokenized))
+        return np.clip(self.scores(query) / ideal, 0.0, 1.0)
+
+
+class BM25RelevanceModel:
+    def __init__(self, tokenizer: Union[str, Tokenizer, None] = "default", k1: float = 1.2, b: float = 0.75,
+                 corpus_stats: Optional[CorpusStats] = None):
+        self.tokenizer = get_tokenizer(tokenizer)
+        self.k1 = k1
+        self.b = b
+        self.corpus_stats = corpus_stats
+
+    def index(self, documents: Sequence[str]) -> BM25Index:
+        return BM25Index(documents, self.tokenizer, self.k1, self.b, self.corpus_stats)
+
+    def score_batch(self, documents: Sequence[str], query: str) -> np.ndarray:
+        return self.index(documents).normalized_scores(query)
+
+    def record(self, documents: Sequence[str], persist: bool = True):
+        """Fold a batch into the corpus statistics; with `persist`, the file is
+        rewritten shortly afterwards (see CorpusStats.save_soon), not inline."""
+        if self.corpus_stats is None or not documents:
+            return
+        self.corpus_stats.add_documents([self.tokenizer(doc) for doc in documents])
+        if persist:
+            self.corpus_stats.save_soon()
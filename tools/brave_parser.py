@@ -0,0 +1,258 @@
+import re
+from typing import Dict, Iterator, List, Optional
+
+from bs4 import BeautifulSoup
+
+from tools.structured_log import get_logger
+from tools.text_utils import NON_TEXT_CONTAINERS
+
+log = get_logger("tools.brave_parser")
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+try:
+    from lxml import etree
+    import lxml.html
+except ImportError:
+    etree = None
+
+RESULT_CLASSES = ["snippet", "news-snippet", "video-snippet", "card"]
+TITLE_CLASSES = ["title", "snippet-title"]
+SNIPPET_CLASSES = ["snippet-content", "description", "snippet-description"]
+DATE_CLASSES = ["age", "date", "time", "snippet-age"]
+
+# Everything before the results container (head, inline scripts and styles,
+# navigation) is skipped, unless a result-class element appears before it.
+# Script and style bodies are stepped over so markup inside JS strings counts
+# for neither.
+_PREFIX_SCAN = re.compile(
+    r"""<(?P<raw>script|style)\b"""
+    r"""|(?P<container><(?:div|main|section)\b[^>]*\bid\s*=\s*["']?results\b)"""
+    r"""|(?P<result><div\b[^>]*\bclass\s*=\s*["']?[^"'>]*\b(?:%s)\b)""" % "|".join(map(re.escape, RESULT_CLASSES)),
+    re.IGNORECASE
+)
+_RAW_TEXT_END = {tag: re.compile(f"</{tag}", re.IGNORECASE) for tag in ("script", "style")}
+
+
+def clean_text(text: str) -> str:
+    return ' '.join(text.strip().split()) if text else ""
+
+
+def results_fragment(html: str) -> str:
+    """Slice the page from the results container onwards when that cannot drop a result."""
+    position = 0
+    while True:
+        match = _PREFIX_SCAN.search(html, position)
+        if match is None or match.group("result"):
+            return html
+        if match.group("container"):
+            return html[match.start():]
+        end = _RAW_TEXT_END[match.group("raw").lower()].search(html, match.end())
+        if end is None:
+            return html
+        position = end.start()
+
+
+class Bs4Backend:
+    """The original scan: BeautifulSoup's html.parser over the whole page."""
+
+    name = "bs4"
+
+    def items(self, html: str):
+        soup = BeautifulSoup(html, "html.parser")
+        return soup.find_all("div", class_=RESULT_CLASSES)
+
+    def link(self, item) -> Optional[str]:
+        a_tag = item.find("a", href=True)
+        return a_tag['href'] if a_tag else None
+
+    def title(self, item) -> str:
+        title_elem = item.find("div", class_=TITLE_CLASSES) or item.find("a", href=True)
+        return title_elem.get_text(strip=True)
+
+    def snippet(self, item) -> Optional[str]:
+        snippet_elem = item.find("div", class_=SNIPPET_CLASSES)
+        return snippet_elem.get_text(strip=True) if snippet_elem else None
+
+    def text(self, item) -> str:
+        return item.get_text(separator=' ', strip=True)
+
+    def date(self, item) -> Optional[str]:
+        date_elem = item.find("span", class_=DATE_CLASSES)
+        return date_elem.get_text(strip=True) if date_elem else None
+
+
+def _class_test(classes: List[str]) -> str:
+    return " or ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {c} ')" for c in classes)
+
+
+def _lxml_strings(element) -> Iterator[str]:
+    """Stripped, non-empty text nodes below `element` in document order."""
+    if element.text and element.tag not in NON_TEXT_CONTAINERS:
+        text = element.text.strip()
+        if text:
+            yield text
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_CONTAINERS:
+            yield from _lxml_strings(child)
+        if child.tail:
+            tail = child.tail.strip()
+            if tail:
+                yield tail
+
+
+class LxmlBackend:
+    """libxml2 parse of the results fragment with precompiled XPath selectors."""
+
+    name = "lxml"
+
+    def __init__(self):
+        self._items = etree.XPath(f"//div[{_class_test(RESULT_CLASSES)}]")
+        self._link = etree.XPath("(.//a[@href])[1]")
+        self._title = etree.XPath(f"(.//div[{_class_test(TITLE_CLASSES)}])[1]")
+        self._snippet = etree.XPath(f"(.//div[{_class_test(SNIPPET_CLASSES)}])[1]")
+        self._date = etree.XPath(f"(.//span[{_class_test(DATE_CLASSES)}])[1]")
+
+    def items(self, html: str):
+        fragment = results_fragment(html)
+        if not fragment.strip():
+            return []
+        return self._items(lxml.html.document_fromstring(fragment))
+
+    def link(self, item) -> Optional[str]:
+        links = self._link(item)
+        return links[0].get("href") if links else None
+
+    def title(self, item) -> str:
+        titles = self._title(item) or self._link(item)
+        return "".join(_lxml_strings(titles[0]))
+
+    def snippet(self, item) -> Optional[str]:
+        snippets = self._snippet(item)
+        return "".join(_lxml_strings(snippets[0])) if snippets else None
+
+    def text(self, item) -> str:
+        return " ".join(_lxml_strings(item))
+
+    def date(self, item) -> Optional[str]:
+        dates = self._date(item)
+        return "".join(_lxml_strings(dates[0])) if dates else None
+
+
+def _selectolax_strings(node) -> Iterator[str]:
+    for child in node.traverse(include_text=True):
+        if child.tag != "-text":
+            continue
+        parent = child.parent
+        if parent is not None and parent.tag in NON_TEXT_CONTAINERS:
+            continue
+        text = (child.text_content or "").strip()
+        if text:
+            yield text
+
+
+class SelectolaxBackend:
+    """Lexbor parse of the results fragment with CSS selectors."""
+
+    name = "selectolax"
+
+    items_selector = ", ".join(f"div.{c}" for c in RESULT_CLASSES)
+    title_selector = ", ".join(f"div.{c}" for c in TITLE_CLASSES)
+    snippet_selector = ", ".join(f"div.{c}" for c in SNIPPET_CLASSES)
+    date_selector = ", ".join(f"span.{c}" for c in DATE_CLASSES)
+
+    def items(self, html: str):
+        tree = SelectolaxParser(results_fragment(html))
+        return tree.body.css(self.items_selector) if tree.body is not None else []
+
+    def link(self, item) -> Optional[str]:
+        link = item.css_first("a[href]")
+        return (link.attributes.get("href") or "") if link is not None else None
+
+    def title(self, item) -> str:
+        title = item.css_first(self.title_selector)
+        if title is None:
+            title = item.css_first("a[href]")
+        return "".join(_selectolax_strings(title))
+
+    def snippet(self, item) -> Optional[str]:
+        snippet = item.css_first(self.snippet_selector)
+        return "".join(_selectolax_strings(snippet)) if snippet is not None else None
+
+    def text(self, item) -> str:
+        return " ".join(_selectolax_strings(item))
+
+    def date(self, item) -> Optional[str]:
+        date = item.css_first(self.date_selector)
+        return "".join(_selectolax_strings(date)) if date is not None else None
+
+
+PARSER_BACKENDS: Dict[str, object] = {"bs4": Bs4Backend()}
+if etree is not None:
+    PARSER_BACKENDS["lxml"] = LxmlBackend()
+if SelectolaxParser is not None:
+    PARSER_BACKENDS["selectolax"] = SelectolaxBackend()
+
+BACKEND_PREFERENCE = ("selectolax", "lxml", "bs4")
+
+
+def default_backend() -> str:
+    return next(name for name in BACKEND_PREFERENCE if name in PARSER_BACKENDS)
+
+
+def _build_results(backend, html: str, limit: int, filter_domain: Optional[str]) -> List[Dict]:
+    organic_results = []
+    for item in backend.items(html):
+        if len(organic_results) >= limit:
+            break
+
+        result_url = backend.link(item)
+        if not result_url or not result_url.startswith(("http://", "https://")):
+            continue
+        if filter_domain and filter_domain not in result_url:
+            continue
+
+        title = clean_text(backend.title(item))
+        snippet = backend.snippet(item)
+        snippet = clean_text(snippet) if snippet is not None else clean_text(backend.text(item))
+        date = backend.date(item)
+        date = clean_text(date) if date is not None else None
+
+        if len(snippet) < 30 or len(title) < 5:
+            continue
+
+        result = {
+            "position": len(organic_results) + 1,
+            "title": title,
+            "link": result_url,
+            "snippet": snippet,
+            "domain": result_url.split("/")[2]
+        }
+        if date:
+            result["date"] = date
+
+        organic_results.append(result)
+    return organic_results
+
+
+def parse_organic_results(html: str, limit: int = 12, filter_domain: Optional[str] = None,
+                          backend: Optional[str] = None) -> List[Dict]:
+    """Extract Brave organic results from a results page.
+
+    `backend` is one of PARSER_BACKENDS (default: the fastest installed). All
+    backends produce the same results as the original BeautifulSoup scan; if a
+    fast backend fails on a page, the BeautifulSoup backend is used instead.
+    """
+    name = backend or default_backend()
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown Brave parser backend '{name}', available: {sorted(PARSER_BACKENDS)}")
+    try:
+        return _build_results(PARSER_BACKENDS[name], html, limit, filter_domain)
+    except Exception as e:
+        if name == "bs4":
+            raise
+        log.warning(f"[yellow]Brave parser backend '{name}' failed ({e}); falling back to bs4[/yellow]")
+        return _build_results(PARSER_BACKENDS["bs4"], html, limit, filter_domain)
@@ -0,0 +1,129 @@
+import json
+import re
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from tools.structured_log import get_logger
+from tools.page_fetch import FetchedPage
+
+log = get_logger("tools.content_types")
+
+HTML_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+FEED_TYPES = frozenset({"application/rss+xml", "application/atom+xml", "application/feed+xml"})
+XML_TYPES = frozenset({"text/xml", "application/xml"})
+MARKDOWN_TYPES = frozenset({"text/markdown", "text/x-markdown"})
+MARKDOWN_SUFFIXES = (".md", ".markdown", ".mdown")
+FEED_ITEMS = 30
+
+_TAGS = re.compile(r"<[^>]+>")
+_HEADING = re.compile(r"^\s{0,3}#\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_XML_DECLARATION = re.compile(r"^\ufeff?\s*<\?xml[^>]*\?>")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _child_text(element, *names: str) -> str:
+    for child in element:
+        if _local(child.tag) in names:
+            return " ".join(_TAGS.sub(" ", "".join(child.itertext())).split())
+    return ""
+
+
+def _plain_text(text: str) -> Tuple[str, str]:
+    lines = [line.strip() for line in text.splitlines()]
+    title = next((line for line in lines if line), "(no title)")[:120]
+    return title, "\n".join(lines).strip()
+
+
+def _markdown(text: str) -> Tuple[str, str]:
+    heading = _HEADING.search(text)
+    return (heading.group(1) if heading else _plain_text(text)[0]), text.strip()
+
+
+def _json(text: str) -> Tuple[str, str]:
+    data = json.loads(text)
+    title = "(JSON document)"
+    if isinstance(data, dict):
+        title = next((str(data[key]) for key in ("title", "name", "id") if isinstance(data.get(key), (str, int))), title)
+    return title, json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _feed(text: str) -> Tuple[str, str]:
+    # `text` is already decoded with the charset page_fetch sniffed (BOM,
+    # header, then this declaration); a declaration left in would make the
+    # parser decode it a second time.
+    root = ET.fromstring(_XML_DECLARATION.sub("", text, count=1))
+    channel = next((child for child in root if _local(child.tag) == "channel"), root)
+    title = _child_text(channel, "title") or "(feed)"
+    entries: List[str] = []
+    for item in channel.iter():
+        if _local(item.tag) not in ("item", "entry"):
+            continue
+        link = _child_text(item, "link")
+        if not link:
+            link_element = next((child for child in item if _local(child.tag) == "link"), None)
+            link = link_element.get("href", "") if link_element is not None else ""
+        parts = [
+            f"## {_child_text(item, 'title') or '(untitled)'}",
+            _child_text(item, "pubdate", "published", "updated", "date"),
+            link,
+            _child_text(item, "description", "summary", "content"),
+        ]
+        entries.append("\n".join(part for part in parts if part))
+        if len(entries) >= FEED_ITEMS:
+            break
+    return title, "\n\n".join(entries)
+
+
+FAST_PATHS: Dict[str, Callable[[str], Tuple[str, str]]] = {
+    "text": _plain_text,
+    "markdown": _markdown,
+    "json": _json,
+    "feed": _feed,
+}
+
+
+def classify(page: FetchedPage) -> str:
+    """"html" or one of FAST_PATHS, from the media type, the URL suffix and,
+    for generic XML and untyped bodies, the first bytes."""
+    kind = page.content_type
+    path = urlparse(page.url).path.lower()
+    if kind in HTML_TYPES:
+        return "html"
+    if kind in FEED_TYPES:
+        return "feed"
+    if kind in MARKDOWN_TYPES or (kind == "text/plain" and path.endswith(MARKDOWN_SUFFIXES)):
+        return "markdown"
+    if kind == "application/json" or kind.endswith("+json"):
+        return "json"
+    head = page.content[:512].lstrip().lower()
+    if kind in XML_TYPES or (not kind and head.startswith(b"<?xml")):
+        return "feed" if (b"<rss" in head or b"<feed" in head or b"<rdf:rdf" in head) else "html"
+    if kind == "text/plain":
+        return "text"
+    return "html"
+
+
+def extract_non_html(page: FetchedPage) -> Optional[Dict]:
+    """Title and content for text, Markdown, JSON and RSS/Atom responses, or
+    None when the page should go through the HTML pipeline (or a fast path
+    fails to parse)."""
+    kind = classify(page)
+    if kind == "html":
+        return None
+    try:
+        title, content = FAST_PATHS[kind](page.text)
+    except (ValueError, ET.ParseError) as e:
+        log.warning(f"[yellow]{kind} fast path failed for {page.url} ({e}); using the HTML pipeline[/yellow]")
+        return None
+    log.debug("[green]Content-type fast path:[/green] %s", kind, url=page.url, chars=len(content))
+    return {
+        "title": title,
+        "content": content,
+        "source": page.url,
+        "domain": urlparse(page.url).netloc,
+        "content_type": kind,
+    }
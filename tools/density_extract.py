@@ -0,0 +1,195 @@
+import re
+from typing import Dict, List
+
+from tools.structured_log import get_logger
+from tools.text_utils import NON_TEXT_CONTAINERS
+
+log = get_logger("tools.density_extract")
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Readability-style weights: class/id hints, per-tag starting scores and the
+# elements whose text counts as a paragraph for its ancestors.
+POSITIVE_HINTS = re.compile(r"article|body|content|entry|hentry|main|page|post|text|blog|story", re.I)
+NEGATIVE_HINTS = re.compile(r"comment|combx|contact|foot|footer|footnote|masthead|media|meta|menu|nav|outbrain|promo|"
+                            r"related|scroll|share|shoutbox|sidebar|skyscraper|sponsor|shopping|tags|tool|widget|banner|ad-", re.I)
+TAG_SCORES = {"div": 5, "article": 10, "main": 10, "section": 3, "pre": 3, "td": 3, "blockquote": 3,
+              "address": -3, "ol": -3, "ul": -3, "dl": -3, "dd": -3, "dt": -3, "li": -3, "form": -3,
+              "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5, "th": -5}
+PARAGRAPH_TAGS = frozenset({"p", "pre", "td", "blockquote"})
+CANDIDATE_TAGS = frozenset({"div", "article", "main", "section", "td", "blockquote", "pre", "body"})
+# Never part of the extracted text.
+BOILERPLATE_TAGS = frozenset({"nav", "header", "footer", "aside", "form", "button", "select", "figure", "noscript", "iframe", "svg"})
+# Boundaries that end the current output line.
+BLOCK_TAGS = frozenset({"p", "div", "section", "article", "main", "li", "ul", "ol", "dl", "dt", "dd", "pre", "blockquote",
+                        "table", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6", "br", "hr", "figcaption"})
+MIN_PARAGRAPH_CHARS = 25
+MAX_LINK_DENSITY = 0.5
+MIN_LINE_CHARS = 3
+
+
+class _Stats:
+    __slots__ = ("chars", "link_chars", "commas", "score")
+
+    def __init__(self):
+        self.chars = 0
+        self.link_chars = 0
+        self.commas = 0
+        self.score = 0.0
+
+    @property
+    def link_density(self) -> float:
+        return self.link_chars / self.chars if self.chars else 0.0
+
+
+def _class_weight(element) -> int:
+    weight = 0
+    for attr in (element.get("class"), element.get("id")):
+        if attr:
+            if NEGATIVE_HINTS.search(attr):
+                weight -= 25
+            if POSITIVE_HINTS.search(attr):
+                weight += 25
+    return weight
+
+
+def _skipped(element) -> bool:
+    return not isinstance(element.tag, str) or element.tag in NON_TEXT_CONTAINERS or element.tag in BOILERPLATE_TAGS
+
+
+def score_tree(root) -> Dict[object, _Stats]:
+    """One pass over `root`: text and link length of every element, and
+    paragraph scores credited to each paragraph's parent (in full) and
+    grandparent (in half), as Readability does."""
+    stats: Dict[object, _Stats] = {}
+    stack: List[_Stats] = []
+    links = 0
+    walker = etree.iterwalk(root, events=("start", "end"))
+    for event, element in walker:
+        if event == "start":
+            if _skipped(element) and element is not root:
+                walker.skip_subtree()
+                continue
+            entry = stats[element] = _Stats()
+            stack.append(entry)
+            if element.tag == "a":
+                links += 1
+            if element.text:
+                _add_text(entry, element.text, links)
+            continue
+        entry = stats.get(element)
+        if entry is not None and stack and stack[-1] is entry:
+            stack.pop()
+            if element.tag == "a":
+                links -= 1
+            if stack:
+                stack[-1].chars += entry.chars
+                stack[-1].link_chars += entry.link_chars
+                stack[-1].commas += entry.commas
+            if element.tag in PARAGRAPH_TAGS and entry.chars >= MIN_PARAGRAPH_CHARS:
+                _credit(element, stats, 1 + entry.commas + min(entry.chars // 100, 3))
+        if stack and element is not root and element.tail:
+            _add_text(stack[-1], element.tail, links)
+    return stats
+
+
+def _add_text(entry: _Stats, text: str, in_link: int):
+    length = len(text.strip())
+    entry.chars += length
+    if in_link:
+        entry.link_chars += length
+    entry.commas += text.count(",")
+
+
+def _credit(paragraph, stats: Dict[object, _Stats], points: float):
+    parent = paragraph.getparent()
+    for ancestor, share in ((parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)):
+        if ancestor is None or ancestor not in stats:
+            continue
+        entry = stats[ancestor]
+        if not entry.score:
+            entry.score = TAG_SCORES.get(ancestor.tag, 0) + _class_weight(ancestor)
+        entry.score += points * share
+
+
+def best_candidate(stats: Dict[object, _Stats]):
+    """The element with the highest link-density-adjusted score, or None."""
+    best, best_score = None, 0.0
+    for element, entry in stats.items():
+        if not entry.score or element.tag not in CANDIDATE_TAGS:
+            continue
+        score = entry.score * (1 - entry.link_density)
+        if score > best_score:
+            best, best_score = element, score
+    return best
+
+
+def _dropped(element, entry: _Stats) -> bool:
+    """Link-heavy or negatively hinted blocks (menus, share bars, related
+    lists). Inline elements are never dropped: they are part of a sentence."""
+    return element.tag in BLOCK_TAGS and (entry.link_density > MAX_LINK_DENSITY or _class_weight(element) < 0)
+
+
+def _render(element, stats: Dict[object, _Stats], lines: List[str], current: List[str], in_link: bool = False):
+    def flush():
+        line = " ".join(" ".join(current).split())
+        if len(line) >= MIN_LINE_CHARS:
+            lines.append(line)
+        current.clear()
+
+    block = element.tag in BLOCK_TAGS
+    if block:
+        flush()
+    if element.text:
+        current.append(element.text)
+    in_link = in_link or element.tag == "a"
+    for child in element:
+        entry = stats.get(child)
+        if entry is not None and (in_link or not _dropped(child, entry)):
+            _render(child, stats, lines, current, in_link)
+        if child.tail:
+            current.append(child.tail)
+    if block:
+        flush()
+
+
+def density_content(tree) -> str:
+    """Main text of a parsed page (see lxml_extract.parse_html), or "" when
+    no element scores as content. Reads `tree` without modifying it."""
+    body = tree.find(".//body")
+    if body is None:
+        return ""
+    stats = score_tree(body)
+    top = best_candidate(stats)
+    if top is None:
+        return ""
+    parent = top.getparent()
+    top_score = stats[top].score
+    threshold = max(10.0, top_score * 0.2)
+    # Siblings that score well (or are clean, long paragraphs) belong to the
+    # same article, split across wrappers.
+    selected = [top]
+    if parent is not None and parent in stats:
+        selected = []
+        for sibling in parent:
+            entry = stats.get(sibling)
+            if entry is None:
+                continue
+            if sibling is top or entry.score * (1 - entry.link_density) >= threshold or (
+                    sibling.tag == "p" and entry.chars > 80 and entry.link_density < 0.25):
+                selected.append(sibling)
+    lines: List[str] = []
+    for element in selected:
+        current: List[str] = []
+        _render(element, stats, lines, current)
+        line = " ".join(" ".join(current).split())
+        if len(line) >= MIN_LINE_CHARS:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def available() -> bool:
+    return etree is not None
@@ -0,0 +1,149 @@
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from tools.structured_log import get_logger
+
+log = get_logger("tools.domain_trust")
+
+DEFAULT_TRUST_FILE = Path(__file__).parent / "data" / "trusted_domains.json"
+USER_TRUST_FILE = Path(".trusted_domains.json")
+TRUST_FILE_ENV = "TRUSTED_DOMAINS_FILE"
+
+SUFFIX_MATCH_FACTOR = 0.8
+
+
+@dataclass(frozen=True)
+class DomainTrust:
+    exact_score: Optional[float]
+    suffix_score: Optional[float]
+    boost_intents: FrozenSet[str] = frozenset()
+    penalty_intents: FrozenSet[str] = frozenset()
+
+    def base_score(self, default: float = 0.5) -> float:
+        score = self.exact_score if self.exact_score is not None else default
+        if self.suffix_score is not None:
+            score = max(score, self.suffix_score * SUFFIX_MATCH_FACTOR)
+        return score
+
+
+@dataclass
+class _TrieNode:
+    children: Dict[str, "_TrieNode"] = field(default_factory=dict)
+    score: Optional[float] = None
+    boost: set = field(default_factory=set)
+    penalty: set = field(default_factory=set)
+
+
+def _labels(domain: str) -> List[str]:
+    host = domain.lower().split(":", 1)[0].strip(".")
+    return [label for label in reversed(host.split(".")) if label]
+
+
+class DomainTrustTable:
+    """Reversed-label suffix trie over trusted domains.
+
+    `github.com` is stored as com -> github, so a lookup walks the host labels
+    from the TLD inwards and only matches on whole labels: `docs.github.com`
+    matches `github.com`, `microsoft.com` does not match `ft.com`, and a bare
+    `gov` entry covers every `*.gov` host.
+    """
+
+    def __init__(self, domains: Dict[str, float], intents: Dict[str, Dict[str, Iterable[str]]]):
+        self.domains: Dict[str, float] = {}
+        self.intents: Dict[str, Dict[str, List[str]]] = {}
+        self._root = _TrieNode()
+        self._cache: Dict[str, DomainTrust] = {}
+        self.update(domains, intents)
+
+    def _node(self, domain: str) -> _TrieNode:
+        node = self._root
+        for label in _labels(domain):
+            node = node.children.setdefault(label, _TrieNode())
+        return node
+
+    def update(self, domains: Dict[str, float], intents: Dict[str, Dict[str, Iterable[str]]]):
+        for domain, score in (domains or {}).items():
+            key = ".".join(reversed(_labels(domain)))
+            self.domains[key] = float(score)
+            self._node(key).score = float(score)
+
+        for intent, sets in (intents or {}).items():
+            entry = self.intents.setdefault(intent, {"boost": [], "penalty": []})
+            for kind in ("boost", "penalty"):
+                for domain in sets.get(kind, []):
+                    key = ".".join(reversed(_labels(domain)))
+                    if key not in entry[kind]:
+                        entry[kind].append(key)
+                    getattr(self._node(key), kind).add(intent)
+
+        self._cache.clear()
+
+    @classmethod
+    def from_file(cls, path: Path) -> "DomainTrustTable":
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(data.get("domains", {}), data.get("intents", {}))
+
+    @classmethod
+    def load(cls, extra_paths: Optional[Iterable[Path]] = None) -> "DomainTrustTable":
+        """Load the bundled table, then merge user overrides from
+        `.trusted_domains.json` and `$TRUSTED_DOMAINS_FILE` when present."""
+        table = cls.from_file(DEFAULT_TRUST_FILE)
+
+        overrides = [USER_TRUST_FILE]
+        if os.getenv(TRUST_FILE_ENV):
+            overrides.append(Path(os.environ[TRUST_FILE_ENV]))
+        overrides.extend(extra_paths or [])
+
+        for path in overrides:
+            if not path.exists():
+                continue
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                table.update(data.get("domains", {}), data.get("intents", {}))
+                log.info(f"[cyan]Loaded trusted domain overrides:[/cyan] {path}")
+            except (OSError, json.JSONDecodeError) as e:
+                log.error(f"[red]Failed to load trusted domains from {path}: {e}[/red]")
+        return table
+
+    def lookup(self, domain: str) -> DomainTrust:
+        cached = self._cache.get(domain)
+        if cached is not None:
+            return cached
+
+        labels = _labels(domain)
+        node = self._root
+        exact_score = None
+        suffix_score = None
+        boost: set = set()
+        penalty: set = set()
+
+        for depth, label in enumerate(labels, 1):
+            node = node.children.get(label)
+            if node is None:
+                break
+            boost |= node.boost
+            penalty |= node.penalty
+            if node.score is None:
+                continue
+            if depth == len(labels):
+                exact_score = node.score
+            else:
+                suffix_score = node.score if suffix_score is None else max(suffix_score, node.score)
+
+        trust = DomainTrust(exact_score, suffix_score, frozenset(boost), frozenset(penalty))
+        self._cache[domain] = trust
+        return trust
+
+    def base_score(self, domain: str, default: float = 0.5) -> float:
+        return self.lookup(domain).base_score(default)
+
+    def is_boosted(self, domain: str, intent: str) -> bool:
+        return intent in self.lookup(domain).boost_intents
+
+    def is_penalized(self, domain: str, intent: str) -> bool:
+        return intent in self.lookup(domain).penalty_intents
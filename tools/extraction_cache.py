@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from tools.structured_log import get_logger
+
+log = get_logger("tools.extraction_cache")
+
+EXTRACTION_CACHE_DIR = os.path.join(".search_cache", "extractions")
+EXTRACTION_MAX_AGE = 7 * 24 * 3600
+EXTRACTION_MAX_BYTES = 100 * 1024 * 1024
+PRUNE_EVERY = 25
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class LayerTimings:
+    """Running count, total and worst time of each extraction layer."""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, layer: str, url: str = ""):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stats.setdefault(layer, {"count": 0, "total": 0.0, "max": 0.0})
+                stats["count"] += 1
+                stats["total"] += elapsed
+                stats["max"] = max(stats["max"], elapsed)
+            log.debug("[dim]Extraction layer timed[/dim]", layer=layer, elapsed_ms=f"{elapsed * 1000:.1f}", url=url)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                layer: {"count": int(s["count"]), "mean_ms": round(s["total"] / s["count"] * 1000, 2), "max_ms": round(s["max"] * 1000, 2)}
+                for layer, s in self._stats.items()
+            }
+
+
+class ExtractionCache:
+    """Extracted title/content per (URL, HTML body hash), so an unchanged page
+    is never parsed twice. Entries expire after `max_age` seconds; the oldest
+    are evicted once the directory grows past `max_bytes`."""
+
+    def __init__(self, cache_dir: Optional[str] = EXTRACTION_CACHE_DIR, max_age: float = EXTRACTION_MAX_AGE,
+                 max_bytes: int = EXTRACTION_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._stores = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str, body_hash: str, variant: str) -> str:
+        key = hashlib.sha256(f"{variant}\0{url}\0{body_hash}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, url: str, body_hash: str, variant: str = "") -> Optional[Dict]:
+        """`variant` names the extractor, so each readle keeps its own results."""
+        if not self.cache_dir:
+            return None
+        path = self._path(url, body_hash, variant)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                raise FileNotFoundError(path)
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        if entry.get("url") != url or entry.get("html_hash") != body_hash:
+            return None
+        with self._lock:
+            self.hits += 1
+        log.debug("[green]Extraction cache hit[/green] %s", url, layer=entry.get("layer"))
+        return entry
+
+    def put(self, url: str, body_hash: str, title: str, content: str, layer: str, variant: str = ""):
+        if not self.cache_dir:
+            return
+        path = self._path(url, body_hash, variant)
+        entry = {"url": url, "html_hash": body_hash, "title": title, "content": content, "layer": layer, "created": time.time()}
+        try:
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            log.error(f"[red]Failed to cache extraction for {url}: {e}[/red]")
+            return
+        with self._lock:
+            self._stores += 1
+            prune = self._stores % PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Delete expired entries, then the oldest ones until under `max_bytes`."""
+        try:
+            entries = [(entry.path, entry.stat()) for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+        except OSError:
+            return
+        now = time.time()
+        kept = []
+        for path, stat in entries:
+            if now - stat.st_mtime > self.max_age:
+                self._remove(path)
+            else:
+                kept.append((path, stat))
+        total = sum(stat.st_size for _, stat in kept)
+        for path, stat in sorted(kept, key=lambda item: item[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= stat.st_size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+extraction_cache = ExtractionCache()
+layer_timings = LayerTimings()
+
+
+def extract_with_cache(url: str, body: bytes, html: str, extract: Callable[[str, str], Dict],
+                       variant: str = "", cache: Optional[ExtractionCache] = None) -> Dict:
+    """Return the cached extraction of this exact body, or run `extract(url, html)`.
+
+    Only results tagged with the winning `layer` are stored; error and
+    placeholder results are recomputed next time.
+    """
+    cache = cache or extraction_cache
+    body_hash = content_hash(body)
+    entry = cache.get(url, body_hash, variant)
+    if entry is not None:
+        return {"title": entry["title"], "content": entry["content"], "source": url,
+                "domain": urlparse(url).netloc, "layer": entry["layer"], "cached": True}
+    result = extract(url, html)
+    if result.get("layer") and result.get("content") and "error" not in result:
+        cache.put(url, body_hash, result.get("title", ""), result["content"], result["layer"], variant)
+    return result
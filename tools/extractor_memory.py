@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from tools.structured_log import get_logger
+
+log = get_logger("tools.extractor_memory")
+
+EXTRACTOR_MEMORY_PATH = os.path.join(".search_cache", "extractor_domains.json")
+# Wins in a row before a domain goes straight to its extractor.
+MIN_STREAK = 2
+# Every Nth page of a learned domain still runs every layer, to notice redesigns.
+REVALIDATE_EVERY = 20
+# A learned extractor returning less than this falls back to every layer.
+MIN_CONTENT_CHARS = 500
+
+
+class ExtractorMemory:
+    """Which extraction layer wins on each domain, per readle variant.
+
+    `record` is called after a page went through every layer; once the same
+    layer has won `min_streak` times in a row, `preferred` names it so the
+    caller can run that layer alone. Every `revalidate_every`-th page of the
+    domain gets None again, and its full run re-confirms or replaces the
+    winner. The record is kept in a small JSON file.
+    """
+
+    def __init__(self, path: Optional[str] = EXTRACTOR_MEMORY_PATH, min_streak: int = MIN_STREAK,
+                 revalidate_every: int = REVALIDATE_EVERY):
+        self.path = path
+        self.min_streak = min_streak
+        self.revalidate_every = revalidate_every
+        self._lock = threading.Lock()
+        self._domains: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            log.warning(f"[yellow]Ignoring unreadable extractor memory {self.path}: {e}[/yellow]")
+            return {}
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(f"{self.path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(self._domains, f, indent=1)
+            os.replace(f"{self.path}.tmp", self.path)
+        except OSError as e:
+            log.error(f"[red]Failed to save extractor memory: {e}[/red]")
+
+    @staticmethod
+    def _key(domain: str, variant: str) -> str:
+        return f"{variant}:{domain.lower()}"
+
+    def preferred(self, domain: str, variant: str = "") -> Optional[str]:
+        """The layer to run alone for this domain, or None to run every layer."""
+        with self._lock:
+            entry = self._domains.get(self._key(domain, variant))
+            if not entry or entry["streak"] < self.min_streak:
+                return None
+            if entry["since_check"] >= self.revalidate_every:
+                log.debug("[cyan]Re-validating extractor[/cyan] %s", domain, layer=entry["layer"], variant=variant)
+                return None
+            entry["since_check"] += 1
+            return entry["layer"]
+
+    def record(self, domain: str, variant: str, layer: Optional[str]):
+        """Outcome of a page that went through every layer (`layer` None: nothing usable)."""
+        if not layer:
+            return
+        with self._lock:
+            key = self._key(domain, variant)
+            entry = self._domains.get(key)
+            if entry and entry["layer"] == layer:
+                entry["streak"] += 1
+            else:
+                if entry:
+                    log.debug("[yellow]Extractor winner changed[/yellow] %s", domain, old=entry["layer"], new=layer, variant=variant)
+                entry = self._domains[key] = {"layer": layer, "streak": 1}
+            entry["since_check"] = 0
+            entry["updated"] = time.time()
+            self._save()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._domains.items()}
+
+
+extractor_memory = ExtractorMemory()
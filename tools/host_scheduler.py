@@ -0,0 +1,150 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from tools.structured_log import get_logger
+
+log = get_logger("tools.host_scheduler")
+
+
+@dataclass(frozen=True)
+class HostLimit:
+    """Requests to one host start at least `min_interval` (+ up to `jitter`)
+    seconds apart, with at most `max_concurrency` in flight."""
+
+    min_interval: float = 0.25
+    max_concurrency: int = 3
+    jitter: float = 0.25
+
+
+# n requests to one host, all within max_concurrency, have all started after
+# at most (n - 1) * (min_interval + jitter) seconds. Limits are sized so that
+# callers issuing a burst to one host do not spend their deadlines queueing:
+# the default lets tools.pagination's three page workers start within a
+# second, and Brave lets the search persona's four fan-out queries start
+# within 1.5 s, well inside its progressive deadlines (5-8 s).
+DEFAULT_LIMIT = HostLimit()
+# Per-host overrides; a rule for "x.com" also covers "api.x.com".
+HOST_LIMITS: Dict[str, HostLimit] = {
+    "search.brave.com": HostLimit(min_interval=0.3, max_concurrency=4, jitter=0.2),
+    "api.arkm.com": HostLimit(min_interval=1.0, max_concurrency=1, jitter=0.5),
+    "x.com": HostLimit(min_interval=1.5, max_concurrency=1, jitter=1.0),
+}
+
+
+def host_of(target: str) -> str:
+    """Lower-cased host of a URL, or `target` itself when it is already a host."""
+    return (urlparse(target).hostname or "") if "://" in target else target.lower()
+
+
+class _HostState:
+    def __init__(self, limit: HostLimit, lock: threading.Lock):
+        self.limit = limit
+        self.ready = threading.Condition(lock)
+        self.active = 0
+        self.queued = 0
+        self.next_start = 0.0
+        self.requests = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class HostScheduler:
+    """Per-host politeness shared by every outbound scraper.
+
+    `slot(url)` waits only for earlier requests to the same host: a host at
+    its concurrency cap or inside its spacing window delays its own callers,
+    never those aimed at other hosts. Each caller reserves its start time
+    under the lock and sleeps outside it, so queued requests keep their
+    order and spacing. Queue waits are kept per host for `snapshot()`.
+    """
+
+    def __init__(self, default_limit: HostLimit = DEFAULT_LIMIT, limits: Optional[Dict[str, HostLimit]] = None):
+        self.default_limit = default_limit
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+
+    def limit_for(self, host: str) -> HostLimit:
+        labels = host.split(".")
+        for i in range(len(labels) - 1):
+            limit = self.limits.get(".".join(labels[i:]))
+            if limit is not None:
+                return limit
+        return self.default_limit
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.limit_for(host), self._lock)
+        return state
+
+    def acquire(self, target: str) -> float:
+        """Block until a request to `target`'s host may start; returns the seconds waited."""
+        host = host_of(target)
+        queued_at = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            state.queued += 1
+            while state.active >= state.limit.max_concurrency:
+                state.ready.wait()
+            state.queued -= 1
+            state.active += 1
+            start_at = max(time.monotonic(), state.next_start)
+            state.next_start = start_at + state.limit.min_interval + random.uniform(0, state.limit.jitter)
+        delay = start_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        waited = time.monotonic() - queued_at
+        with self._lock:
+            state.requests += 1
+            state.total_wait += waited
+            state.max_wait = max(state.max_wait, waited)
+            if waited >= 0.01:
+                state.delayed += 1
+        if waited >= 0.01:
+            log.debug("[dim]Host queue wait[/dim] %s", host, wait_ms=int(waited * 1000))
+        return waited
+
+    def release(self, target: str):
+        with self._lock:
+            state = self._state(host_of(target))
+            state.active = max(0, state.active - 1)
+            state.ready.notify()
+
+    @contextmanager
+    def slot(self, target: str):
+        """`with scheduler.slot(url) as waited:` around one request to `url`'s host."""
+        waited = self.acquire(target)
+        try:
+            yield waited
+        finally:
+            self.release(target)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                host: {"requests": s.requests, "delayed": s.delayed, "in_flight": s.active, "queued": s.queued,
+                       "mean_wait_ms": round(s.total_wait / s.requests * 1000, 1) if s.requests else 0.0,
+                       "max_wait_ms": round(s.max_wait * 1000, 1)}
+                for host, s in self._hosts.items()
+            }
+
+
+_default_scheduler: Optional[HostScheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_host_scheduler() -> HostScheduler:
+    """The process-wide scheduler over HOST_LIMITS."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        with _default_lock:
+            if _default_scheduler is None:
+                _default_scheduler = HostScheduler()
+    return _default_scheduler
@@ -4,6 +4,7 @@ from InquirerPy.base.control import Choice
 from rich.panel import Panel
 from rich.markdown import Markdown
 from tools.shared_console import console
+from tools.structured_log import get_logger
 from tools.wallet_cache_handler import load_from_cache
 from core.fireworks_api_client import generate_response
 from tools.config_styles import inquirerstyle
@@ -11,6 +12,8 @@ from InquirerPy import get_style
 from typing import List, Dict, Optional
 from tools.lang_utils import detect_target_language_from_messages
 
+log = get_logger("tools.interactive_explorer")
+
 def display_asset_details(assets: list):
     output_str = ""
     for i, asset in enumerate(assets, 1):
@@ -29,7 +32,7 @@ def analyze_selected_assets_with_llm(assets: list, target_language: str):
     if not assets:
         return
 
-    console.log("[yellow]... Analyzing selected assets with LLM ...[/yellow]")
+    log.info("[yellow]... Analyzing selected assets with LLM ...[/yellow]")
     
     assets_summary = json.dumps(assets, indent=2)
     
@@ -50,7 +53,7 @@ Selected Asset Data:
         llm_analysis = "".join(generate_response(messages, temperature=0.1))
         console.print(Panel(Markdown(llm_analysis), title="🧠 Smart Analysis", border_style="cyan"))
     except Exception as e:
-        console.log(f"[red]Failed to get LLM analysis: {e}[/red]")
+        log.error(f"[red]Failed to get LLM analysis: {e}[/red]")
 
 def run_interactive_session(address: str, messages: Optional[List[Dict]] = None):
     raw_data = load_from_cache(address)
@@ -95,4 +98,4 @@ def run_interactive_session(address: str, messages: Optional[List[Dict]] = None)
         if want_analysis:
             analyze_selected_assets_with_llm(selected_assets, target_language)
             
-        console.log("[bold]You can select other assets or 'Continue Chat' to exit.[/bold]")
+        console.print("[bold]You can select other assets or 'Continue Chat' to exit.[/bold]")
@@ -0,0 +1,149 @@
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import List, Sequence, Tuple
+
+from tools.structured_log import get_logger
+from tools.text_utils import NON_TEXT_CONTAINERS
+
+log = get_logger("tools.lxml_extract")
+
+try:
+    from lxml import etree
+    import lxml.html
+except ImportError:
+    etree = None
+
+# The same parser settings trafilatura uses for its own parse, so the tree can
+# be handed to trafilatura.extract unchanged.
+_PARSER = lxml.html.HTMLParser(collect_ids=False, encoding="utf-8", remove_comments=True, remove_pis=True) if etree is not None else None
+
+
+@dataclass(frozen=True)
+class Layer1Rules:
+    """The paragraph-collection layer of a readle variant.
+
+    `selectors` are tried in order for the main content area (the body when
+    none matches); subtrees in `drop_tags` are left out of every text;
+    `paragraph_tags` below the area become lines when their text measures
+    more than `min_chars`. `measure` is "stripped_strings" (length of
+    get_text(strip=True)) or "strip" (length of get_text().strip()).
+    """
+
+    selectors: Tuple[str, ...]
+    drop_tags: frozenset
+    paragraph_tags: frozenset
+    min_chars: int
+    measure: str
+
+
+READLE_RULES = Layer1Rules(
+    selectors=("article", "main"),
+    drop_tags=frozenset(),
+    paragraph_tags=frozenset({"p", "h2", "h3", "li"}),
+    min_chars=10,
+    measure="strip",
+)
+
+READLE_V2_RULES = Layer1Rules(
+    selectors=("article", "main", "[role='main']", ".content", ".post-content",
+               ".entry-content", ".article-content", "#content", ".main-content"),
+    drop_tags=frozenset({"script", "style", "nav", "header", "footer", "aside", "form"}),
+    paragraph_tags=frozenset({"p", "h2", "h3", "h4", "li", "div"}),
+    min_chars=25,
+    measure="stripped_strings",
+)
+
+
+def _selector_xpath(selector: str) -> str:
+    """XPath for the simple CSS selectors the readles use: tag, .class, #id, [attr='value']."""
+    if selector.startswith("."):
+        return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')]"
+    if selector.startswith("#"):
+        return f"//*[@id='{selector[1:]}']"
+    if selector.startswith("["):
+        name, value = selector[1:-1].split("=", 1)
+        return f"//*[@{name}={value}]"
+    return f"//{selector}"
+
+
+_SELECTOR_CACHE = {}
+
+
+def _compiled(selector: str):
+    xpath = _SELECTOR_CACHE.get(selector)
+    if xpath is None:
+        xpath = _SELECTOR_CACHE[selector] = etree.XPath(f"({_selector_xpath(selector)})[1]")
+    return xpath
+
+
+def parse_html(html: str):
+    """One lxml parse of the page, shared by every extraction layer."""
+    return lxml.html.document_fromstring(html.encode("utf-8", errors="replace"), parser=_PARSER)
+
+
+def page_title(tree) -> str:
+    title = tree.find(".//title")
+    text = (title.text or "").strip() if title is not None and len(title) == 0 else ""
+    return text or "(no title)"
+
+
+def main_area(tree, selectors: Sequence[str]):
+    for selector in selectors:
+        found = _compiled(selector)(tree)
+        if found:
+            return found[0]
+    return tree.find(".//body")
+
+
+def _text_index(root, drop_tags: frozenset):
+    """Walk `root` once, without changing it, collecting its text nodes in
+    document order and, for each element reached, the slice of those nodes
+    it contains. Dropped and non-text subtrees contribute only their tails."""
+    skipped = drop_tags | NON_TEXT_CONTAINERS
+    strings: List[str] = []
+    spans: List[list] = []
+    open_spans: List[list] = []
+    walker = etree.iterwalk(root, events=("start", "end"))
+    for event, element in walker:
+        if event == "start":
+            if element.tag in skipped and element is not root:
+                walker.skip_subtree()
+                continue
+            span = [element, len(strings), len(strings)]
+            spans.append(span)
+            open_spans.append(span)
+            if element.text:
+                strings.append(element.text)
+            continue
+        if open_spans and open_spans[-1][0] is element:
+            open_spans.pop()[2] = len(strings)
+        if element is not root and element.tail:
+            strings.append(element.tail)
+    return strings, spans
+
+
+def collect_lines(root, rules: Layer1Rules) -> List[str]:
+    """Layer-1 lines for `root`, matching the BeautifulSoup implementation:
+    one cleaned line per paragraph element, nested elements included."""
+    strings, spans = _text_index(root, rules.drop_tags)
+    stripped_lengths = [0, *accumulate(len(s.strip()) for s in strings)]
+    lines = []
+    for element, start, end in spans:
+        if element is root or element.tag not in rules.paragraph_tags:
+            continue
+        if rules.measure == "stripped_strings" and stripped_lengths[end] - stripped_lengths[start] <= rules.min_chars:
+            continue
+        text = "".join(strings[start:end])
+        if rules.measure == "strip" and len(text.strip()) <= rules.min_chars:
+            continue
+        lines.append(" ".join(text.split()))
+    return lines
+
+
+def layer1_content(tree, rules: Layer1Rules) -> str:
+    area = main_area(tree, rules.selectors)
+    return "\n".join(collect_lines(area, rules)) if area is not None else ""
+
+
+def available() -> bool:
+    return etree is not None
@@ -0,0 +1,103 @@
+import hashlib
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence, Tuple, TypeVar
+
+from tools.text_utils import estimate_tokens, word_tokens
+
+T = TypeVar("T")
+
+SHINGLE_SIZE = 2
+HAMMING_THRESHOLD = 7
+
+
+@dataclass
+class CollapseReport:
+    clusters: int = 0
+    removed: int = 0
+    tokens_saved: int = 0
+    members: Dict[int, List[int]] = field(default_factory=dict)
+
+
+def _shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    words = word_tokens(text)
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def simhash(text: str, size: int = SHINGLE_SIZE) -> int:
+    """64-bit SimHash over word shingles; near-identical texts differ in few bits."""
+    shingles = _shingles(text, size)
+    if not shingles:
+        return 0
+    digests = b"".join(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest() for s in shingles)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(len(shingles), 8), axis=1)
+    votes = (bits.astype(np.int32) * 2 - 1).sum(axis=0)
+    return int("".join("1" if v > 0 else "0" for v in votes), 2)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def cluster_near_duplicates(fingerprints: Sequence[int], threshold: int = HAMMING_THRESHOLD) -> List[List[int]]:
+    """Group indices whose fingerprints are within `threshold` bits.
+
+    The 64 bits are cut into threshold + 1 bands; by pigeonhole two hashes this
+    close agree on at least one band, so only band collisions are compared.
+    """
+    n = len(fingerprints)
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    bands = threshold + 1
+    width = 64 // bands
+    for band in range(bands):
+        shift = band * width
+        mask = (1 << (width if band < bands - 1 else 64 - shift)) - 1
+        buckets: Dict[int, List[int]] = {}
+        for i, fp in enumerate(fingerprints):
+            buckets.setdefault((fp >> shift) & mask, []).append(i)
+        for members in buckets.values():
+            for a_pos, a in enumerate(members):
+                for b in members[a_pos + 1:]:
+                    if find(a) != find(b) and hamming_distance(fingerprints[a], fingerprints[b]) <= threshold:
+                        parent[find(b)] = find(a)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+
+def collapse_near_duplicates(items: Sequence[T], text_of: Callable[[T], str], score_of: Callable[[T], float],
+                             block_of: Callable[[T], str], threshold: int = HAMMING_THRESHOLD) -> Tuple[List[T], CollapseReport]:
+    """Keep the best-scoring member of every near-duplicate cluster.
+
+    Returns the survivors in their original order plus a report; `block_of`
+    renders the prompt text an item would have cost, which is what
+    `tokens_saved` counts for the removed ones.
+    """
+    report = CollapseReport()
+    if len(items) < 2:
+        return list(items), report
+
+    fingerprints = [simhash(text_of(item)) for item in items]
+    keep = set()
+    for members in cluster_near_duplicates(fingerprints, threshold):
+        best = max(members, key=lambda i: (score_of(items[i]), -i))
+        keep.add(best)
+        if len(members) > 1:
+            report.clusters += 1
+            dropped = [i for i in members if i != best]
+            report.removed += len(dropped)
+            report.tokens_saved += sum(estimate_tokens(block_of(items[i])) for i in dropped)
+            report.members[best] = dropped
+
+    return [item for i, item in enumerate(items) if i in keep], report
@@ -0,0 +1,120 @@
+import re
+import time
+import numpy as np
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from tools.structured_log import get_logger
+from tools.text_utils import estimate_tokens, word_tokens
+
+try:
+    from tools.readle import scrape_manual
+except ImportError:
+    def scrape_manual(url: str): return {"error": "readle extractor not available."}
+
+log = get_logger("tools.page_enrichment")
+
+PASSAGE_WORDS = 120
+MIN_PASSAGE_WORDS = 20
+
+
+def split_passages(text: str, target_words: int = PASSAGE_WORDS) -> List[str]:
+    """Split extracted page text into roughly `target_words`-word passages on paragraph boundaries."""
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n|\n", text or "") if p.strip()]
+    passages: List[str] = []
+    current: List[str] = []
+    count = 0
+    for paragraph in paragraphs:
+        words = paragraph.split()
+        if count and count + len(words) > target_words:
+            passages.append(" ".join(current))
+            current, count = [], 0
+        while len(words) > target_words:
+            passages.append(" ".join(words[:target_words]))
+            words = words[target_words:]
+        current.extend(words)
+        count += len(words)
+    if current:
+        passages.append(" ".join(current))
+    return [p for p in passages if len(p.split()) >= MIN_PASSAGE_WORDS]
+
+
+def rank_passages(passages: Sequence[str], query: str) -> np.ndarray:
+    """TF-IDF cosine similarity of each passage to the query."""
+    query_terms = sorted(set(word_tokens(query)))
+    if not passages or not query_terms:
+        return np.zeros(len(passages))
+
+    column = {term: i for i, term in enumerate(query_terms)}
+    tf = np.zeros((len(passages), len(query_terms)))
+    lengths = np.zeros(len(passages))
+    for row, passage in enumerate(passages):
+        tokens = word_tokens(passage)
+        lengths[row] = len(tokens) or 1
+        for term, count in Counter(t for t in tokens if t in column).items():
+            tf[row, column[term]] = count
+
+    df = (tf > 0).sum(axis=0)
+    idf = np.log((1 + len(passages)) / (1 + df)) + 1.0
+    weights = (tf / lengths[:, None]) * idf
+    norms = np.linalg.norm(weights, axis=1) * np.linalg.norm(idf)
+    return np.divide(weights @ idf, norms, out=np.zeros(len(passages)), where=norms > 0)
+
+
+def pack_passages(candidates: Sequence[Tuple[float, str, int, str]], token_budget: int) -> Dict[str, List[str]]:
+    """Greedily take the highest-scoring (score, url, position, text) passages that fit the
+    budget, then return them per URL in page order."""
+    chosen: List[Tuple[str, int, str]] = []
+    used = 0
+    for score, url, position, text in sorted(candidates, key=lambda c: c[0], reverse=True):
+        if score <= 0:
+            break
+        cost = estimate_tokens(text)
+        if used + cost > token_budget:
+            continue
+        chosen.append((url, position, text))
+        used += cost
+
+    packed: Dict[str, List[str]] = {}
+    for url, position, text in sorted(chosen, key=lambda c: (c[0], c[1])):
+        packed.setdefault(url, []).append(text)
+    return packed
+
+
+def enrich_results(urls: Sequence[str], query: str, max_workers: int = 3, total_timeout: float = 8.0,
+                   token_budget: int = 1500, fetcher: Optional[Callable[[str], Dict]] = None) -> Dict[str, List[str]]:
+    """Fetch pages concurrently, rank their passages against the query and pack the best
+    ones under `token_budget`. Pages not fetched within `total_timeout` are skipped."""
+    if not urls or token_budget <= 0:
+        return {}
+
+    fetch = fetcher or scrape_manual
+    start = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))))
+    try:
+        futures = {executor.submit(fetch, url): url for url in urls}
+        done, not_done = wait(futures, timeout=total_timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if not_done:
+        log.warning(f"[yellow]Enrichment: {len(not_done)} pages missed the {total_timeout:.1f}s budget[/yellow]")
+
+    candidates: List[Tuple[float, str, int, str]] = []
+    for future in done:
+        url = futures[future]
+        try:
+            page = future.result()
+        except Exception as e:
+            log.warning(f"[yellow]Enrichment fetch failed for {url}: {e}[/yellow]")
+            continue
+        if not page or "error" in page:
+            continue
+        passages = split_passages(page.get("content", ""))
+        scores = rank_passages(passages, query)
+        candidates.extend((float(score), url, i, passage) for i, (score, passage) in enumerate(zip(scores, passages)))
+
+    packed = pack_passages(candidates, token_budget)
+    log.info(f"[cyan]Enrichment: {sum(len(p) for p in packed.values())} passages from {len(packed)}/{len(urls)} pages in {time.monotonic() - start:.2f}s[/cyan]")
+    return packed
@@ -0,0 +1,395 @@
+import codecs
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tools.structured_log import get_logger
+from tools.host_scheduler import HostScheduler, get_host_scheduler
+
+log = get_logger("tools.page_fetch")
+
+PAGE_CACHE_DIR = os.path.join(".search_cache", "pages")
+MAX_CACHE_ENTRIES = 2000
+# Pages whose response carries no max-age are reused this long before revalidating.
+DEFAULT_MAX_AGE = 0
+PRUNE_EVERY = 50
+# Bodies are read in chunks and cut off here; the rest of the response is never downloaded.
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+# Charset declarations must appear within this many leading bytes (the HTML spec uses 1024).
+SNIFF_BYTES = 4096
+
+# Media types no extractor can use; the download is abandoned as soon as the headers arrive.
+BINARY_TYPE_PREFIXES = ("image/", "audio/", "video/", "font/")
+BINARY_TYPES = frozenset({
+    "application/octet-stream", "application/pdf", "application/zip", "application/gzip",
+    "application/x-tar", "application/x-7z-compressed", "application/vnd.rar", "application/wasm",
+})
+
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)", re.IGNORECASE)
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+_XML_ENCODING = re.compile(rb"""^<\?xml[^>]+encoding\s*=\s*["']([\w.:-]+)""")
+_BOMS = ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+class ContentRejected(requests.RequestException):
+    """The response is a media type the extractors cannot read."""
+
+
+def media_type(content_type: Optional[str]) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def _known_codec(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def sniff_charset(head: bytes, content_type: Optional[str] = None) -> str:
+    """Charset from the first bytes of a body: BOM, then the Content-Type
+    charset, then an XML declaration or `<meta charset>`, then whether the
+    prefix is valid UTF-8 (cp1252 otherwise)."""
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return name
+    declared = _HEADER_CHARSET.search(content_type or "")
+    if declared and _known_codec(declared.group(1)):
+        return _known_codec(declared.group(1))
+    head = head[:SNIFF_BYTES]
+    match = _XML_ENCODING.match(head) or _META_CHARSET.search(head)
+    if match and _known_codec(match.group(1).decode("ascii")):
+        return _known_codec(match.group(1).decode("ascii"))
+    try:
+        # A multi-byte character may straddle the cut; only the last 3 bytes can be partial.
+        head.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        return "utf-8" if e.start >= len(head) - 3 else "cp1252"
+
+
+@dataclass
+class FetchMetrics:
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    errors: int = 0
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, outcome: str, downloaded: int = 0, saved: int = 0):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.bytes_downloaded += downloaded
+            self.bytes_saved += saved
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits, "revalidated": self.revalidated, "misses": self.misses, "errors": self.errors,
+                "bytes_downloaded": self.bytes_downloaded, "bytes_saved": self.bytes_saved,
+            }
+
+
+@dataclass
+class FetchedPage:
+    """A response body plus how it was obtained: "hit" (served from disk without
+    a request), "revalidated" (304 from the origin) or "miss" (full download)."""
+
+    url: str
+    status_code: int
+    content: bytes
+    encoding: Optional[str]
+    headers: Dict[str, str]
+    cache_status: str
+    elapsed: float = 0.0
+    truncated: bool = False
+
+    @property
+    def content_type(self) -> str:
+        return media_type(self.headers.get("Content-Type"))
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+def cache_control(headers) -> Dict[str, Optional[int]]:
+    """The parts of Cache-Control the fetcher honours: no-store, no-cache and max-age."""
+    value = headers.get("Cache-Control", "") or ""
+    directives = {part.strip().split("=")[0].lower() for part in value.split(",")}
+    match = _MAX_AGE.search(value)
+    return {
+        "no_store": "no-store" in directives,
+        "no_cache": "no-cache" in directives,
+        "max_age": int(match.group(1)) if match else None,
+    }
+
+
+class PageFetcher:
+    """Shared HTTP fetcher for the readle extractors.
+
+    Keeps one pooled `requests.Session` per host and a disk cache of response
+    bodies with their validators. A cached page younger than its `max-age` is
+    returned without a request; an older one is revalidated with
+    `If-None-Match`/`If-Modified-Since` and reused on 304. With a `scheduler`,
+    every network request waits for a per-host slot first. A body cut off
+    at `max_bytes` is only reused by calls allowing no more than that.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = PAGE_CACHE_DIR, pool_size: int = 4,
+                 max_entries: int = MAX_CACHE_ENTRIES, default_max_age: int = DEFAULT_MAX_AGE,
+                 max_bytes: int = MAX_PAGE_BYTES, scheduler: Optional[HostScheduler] = None):
+        self.cache_dir = cache_dir
+        self.scheduler = scheduler
+        self.max_bytes = max_bytes
+        self.pool_size = pool_size
+        self.max_entries = max_entries
+        self.default_max_age = default_max_age
+        self.metrics = FetchMetrics()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+        self._stores = 0
+        self._stores_lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def session_for(self, url: str) -> requests.Session:
+        host = urlparse(url).netloc.lower()
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def close(self):
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json"), os.path.join(self.cache_dir, f"{key}.body")
+
+    def _load(self, url: str) -> Optional[Dict]:
+        if not self.cache_dir:
+            return None
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                meta["content"] = f.read()
+            return meta if meta.get("url") == url else None
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _store(self, url: str, meta: Dict, content: Optional[bytes]):
+        if not self.cache_dir:
+            return
+        meta_path, body_path = self._paths(url)
+        try:
+            if content is not None:
+                with open(f"{body_path}.tmp", "wb") as f:
+                    f.write(content)
+                os.replace(f"{body_path}.tmp", body_path)
+            with open(f"{meta_path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except OSError as e:
+            log.error(f"[red]Failed to cache page {url}: {e}[/red]")
+            return
+        with self._stores_lock:
+            self._stores += 1
+            due = self._stores % PRUNE_EVERY == 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        """Drop the least recently fetched pages beyond `max_entries`."""
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            for path in (entry.path, entry.path[:-len(".json")] + ".body"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _meta_from(self, url: str, response: requests.Response, previous: Optional[Dict] = None,
+                   content: bytes = b"", truncated: bool = False, cap: Optional[int] = None) -> Dict:
+        control = cache_control(response.headers)
+        previous = previous or {}
+        max_age = control["max_age"] if control["max_age"] is not None else self.default_max_age
+        content_type = response.headers.get("Content-Type") or previous.get("content_type", "")
+        return {
+            "url": url,
+            "status_code": previous.get("status_code", response.status_code),
+            "encoding": previous.get("encoding") or sniff_charset(content[:SNIFF_BYTES], content_type),
+            "truncated": previous.get("truncated", truncated),
+            "cap": previous.get("cap", cap),
+            "content_type": content_type,
+            "etag": response.headers.get("ETag") or previous.get("etag"),
+            "last_modified": response.headers.get("Last-Modified") or previous.get("last_modified"),
+            "max_age": 0 if control["no_cache"] else max_age,
+            "fetched_at": time.time(),
+        }
+
+    @staticmethod
+    def _page(meta: Dict, content: bytes, cache_status: str, elapsed: float, cap: Optional[int] = None) -> FetchedPage:
+        truncated = meta.get("truncated", False)
+        if cap is not None and len(content) > cap:
+            content, truncated = content[:cap], True
+        return FetchedPage(
+            url=meta["url"], status_code=meta["status_code"], content=content, encoding=meta.get("encoding"),
+            headers={"Content-Type": meta.get("content_type", "")}, cache_status=cache_status, elapsed=elapsed,
+            truncated=truncated,
+        )
+
+    @staticmethod
+    def _covers(meta: Dict, cap: int) -> bool:
+        """Whether the cached body holds everything a call capped at `cap` would read."""
+        return not meta.get("truncated") or cap <= (meta.get("cap") or 0)
+
+    def cached(self, url: str, max_bytes: Optional[int] = None) -> Optional[FetchedPage]:
+        """The cached page if it is still fresh (and was not cut off below
+        `max_bytes`), without touching the network."""
+        cap = max_bytes or self.max_bytes
+        meta = self._load(url)
+        if meta is None or time.time() - meta["fetched_at"] >= meta["max_age"] or not self._covers(meta, cap):
+            return None
+        self.metrics.record("hits", saved=len(meta["content"]))
+        log.debug("[green]Page cache hit[/green] %s", url)
+        return self._page(meta, meta.pop("content"), "hit", 0.0, cap)
+
+    @staticmethod
+    def _read_capped(response: requests.Response, max_bytes: int):
+        """Read at most `max_bytes` of the (decompressed) body, then drop the connection."""
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            log.debug("[yellow]Content-Length over cap; reading only the first bytes[/yellow]", declared=declared, cap=max_bytes)
+        chunks = []
+        size = 0
+        truncated = False
+        try:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > max_bytes:
+                    truncated = True
+                    break
+        finally:
+            response.close()
+        return b"".join(chunks)[:max_bytes], truncated
+
+    def _request(self, url: str, headers: Dict[str, str], proxies: Optional[Dict[str, str]], timeout: float, cap: int):
+        """One GET in the host's slot: (response, body, truncated, elapsed); the body is empty on 304."""
+        with self.scheduler.slot(url) if self.scheduler else nullcontext():
+            start = time.monotonic()
+            try:
+                response = self.session_for(url).get(url, headers=headers, proxies=proxies, timeout=timeout, stream=True)
+                content, truncated = b"", False
+                if response.status_code != 304:
+                    response.raise_for_status()
+                    kind = media_type(response.headers.get("Content-Type"))
+                    if kind in BINARY_TYPES or kind.startswith(BINARY_TYPE_PREFIXES):
+                        response.close()
+                        raise ContentRejected(f"Unsupported content type '{kind}' at {url}")
+                    content, truncated = self._read_capped(response, cap)
+                else:
+                    response.close()
+            except requests.RequestException:
+                self.metrics.record("errors")
+                raise
+            return response, content, truncated, time.monotonic() - start
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None, proxies: Optional[Dict[str, str]] = None,
+              timeout: float = 20, force_refresh: bool = False, max_bytes: Optional[int] = None) -> FetchedPage:
+        """GET `url` through the cache, streaming at most `max_bytes` of the body.
+
+        Raises `requests.RequestException` on network errors and HTTP error
+        statuses (like `raise_for_status`), and `ContentRejected` for binary
+        media types, which are abandoned before the body is read."""
+        cap = max_bytes or self.max_bytes
+        if not force_refresh:
+            page = self.cached(url, cap)
+            if page is not None:
+                return page
+
+        meta = None if force_refresh else self._load(url)
+        if meta is not None and not self._covers(meta, cap):
+            log.debug("[yellow]Cached body was cut off below this cap; downloading again[/yellow] %s", url, cap=cap)
+            meta = None
+        request_headers = dict(headers or {})
+        if meta:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        response, content, truncated, elapsed = self._request(url, request_headers, proxies, timeout, cap)
+        if response.status_code == 304 and meta is None:
+            # Nothing cached to reuse (the caller sent its own validators, or
+            # the entry vanished): ask again for the full body.
+            log.debug("[yellow]304 without a cached copy; refetching unconditionally[/yellow] %s", url)
+            for name in [name for name in request_headers if name.lower() in ("if-none-match", "if-modified-since")]:
+                del request_headers[name]
+            response, content, truncated, elapsed = self._request(url, request_headers, proxies, timeout, cap)
+            if response.status_code == 304:
+                self.metrics.record("errors")
+                raise requests.HTTPError(f"304 Not Modified for an unconditional request to {url}", response=response)
+
+        if response.status_code == 304:
+            content = meta.pop("content")
+            meta = self._meta_from(url, response, meta)
+            self._store(url, meta, None)
+            self.metrics.record("revalidated", saved=len(content))
+            log.debug("[cyan]Page revalidated (304)[/cyan] %s", url, elapsed_ms=int(elapsed * 1000))
+            return self._page(meta, content, "revalidated", elapsed, cap)
+
+        new_meta = self._meta_from(url, response, content=content, truncated=truncated, cap=cap if truncated else None)
+        if not cache_control(response.headers)["no_store"]:
+            self._store(url, new_meta, content)
+        self.metrics.record("misses", downloaded=len(content))
+        if truncated:
+            log.warning(f"[yellow]Page truncated at {len(content)} bytes: {url}[/yellow]")
+        log.debug("[yellow]Page fetched[/yellow] %s", url, bytes=len(content), elapsed_ms=int(elapsed * 1000))
+        return self._page(new_meta, content, "miss", elapsed)
+
+
+_default_fetcher: Optional[PageFetcher] = None
+_default_lock = threading.Lock()
+
+
+def get_page_fetcher() -> PageFetcher:
+    global _default_fetcher
+    if _default_fetcher is None:
+        with _default_lock:
+            if _default_fetcher is None:
+                _default_fetcher = PageFetcher(scheduler=get_host_scheduler())
+    return _default_fetcher
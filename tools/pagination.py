@@ -0,0 +1,135 @@
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qsl, urljoin, urlparse, urlunparse
+
+from tools.structured_log import get_logger
+from tools.text_utils import estimate_tokens
+from tools.page_fetch import MAX_PAGE_BYTES
+
+log = get_logger("tools.pagination")
+
+# Query parameters holding a page number. Short names such as "p" are left
+# out: WordPress uses `?p=<post id>`, so `?p=124` next to `?p=123` is another
+# post, not page 2. Sites paging with those names are still followed through
+# their `rel="next"` link.
+PAGE_PARAMS = ("page", "paged")
+MAX_PAGES = 5
+MAX_WORKERS = 3
+MAX_TOTAL_BYTES = 8 * 1024 * 1024
+MAX_TOTAL_TOKENS = 40000
+
+_TAG = re.compile(r"<(?:a|link)\b[^>]*>", re.I)
+_HREF = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+_REL_NEXT = re.compile(r"""\brel\s*=\s*["']?[^"'>]*\bnext\b""", re.I)
+_PATH_PAGE = re.compile(r"^(.*?)/page/(\d+)/?$")
+
+
+def _page_key(url: str) -> Tuple[Tuple, int]:
+    """(what identifies the article, page number) for `url`; two URLs are
+    pages of the same article when their keys match."""
+    parsed = urlparse(url)
+    params = parse_qsl(parsed.query, keep_blank_values=True)
+    number = 1
+    rest = []
+    for name, value in params:
+        if name.lower() in PAGE_PARAMS and value.isdigit():
+            number = int(value)
+        else:
+            rest.append((name, value))
+    path = parsed.path
+    match = _PATH_PAGE.match(path)
+    if match:
+        path, number = match.group(1), int(match.group(2))
+    return (parsed.netloc.lower(), path.rstrip("/"), tuple(sorted(rest))), number
+
+
+def page_links(url: str, html: str, max_pages: int = MAX_PAGES) -> List[str]:
+    """Later pages of the article at `url`, in reading order: numbered links
+    (`?page=N`, `/page/N/`) to the same article for the next `max_pages - 1`
+    page numbers, or else its `rel="next"` link."""
+    base_key, current = _page_key(url)
+    numbered: Dict[int, str] = {}
+    next_link = None
+    for tag in _TAG.findall(html):
+        href = _HREF.search(tag)
+        if not href:
+            continue
+        link = urljoin(url, next(group for group in href.groups() if group is not None).strip())
+        if not link.startswith(("http://", "https://")):
+            continue
+        link = urlunparse(urlparse(link)._replace(fragment=""))
+        if next_link is None and _REL_NEXT.search(tag):
+            next_link = link
+        key, number = _page_key(link)
+        if key == base_key and current < number < current + max_pages:
+            numbered.setdefault(number, link)
+    if numbered:
+        return [numbered[number] for number in sorted(numbered)]
+    return [next_link] if next_link and next_link != url else []
+
+
+def scrape_paginated(url: str, scrape: Callable[..., Dict], max_pages: int = MAX_PAGES, max_workers: int = MAX_WORKERS,
+                     max_bytes: int = MAX_TOTAL_BYTES, max_tokens: int = MAX_TOTAL_TOKENS) -> Dict:
+    """`scrape(url)` for a whole paginated article.
+
+    `scrape` is a readle `scrape_manual`, called with `with_page_links=True`
+    and a `max_bytes` share of the download budget (never above
+    MAX_PAGE_BYTES). Pages linked from the first page are fetched
+    concurrently, `max_workers` at a time; pages only reachable through
+    `rel="next"` one round at a time. Fetching stops once the pages so far
+    hold `max_tokens`, and the stitched text is cut there. Pages repeating
+    an earlier page's text are dropped. The result is the first page's, with
+    the joined content and the list of `pages` used.
+    """
+    first = scrape(url, max_bytes=min(max_bytes, MAX_PAGE_BYTES), with_page_links=True)
+    if not first or "error" in first or not first.get("content"):
+        return first
+    bytes_left = max_bytes - first.get("page_bytes", 0)
+    fetched_tokens = estimate_tokens(first["content"])
+    seen = {url}
+    pages = [(url, first)]
+    frontier = [link for link in first.get("page_links", []) if link not in seen]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while frontier and len(pages) < max_pages and bytes_left > 0 and fetched_tokens < max_tokens:
+            batch = frontier[:max_pages - len(pages)]
+            seen.update(batch)
+            share = min(bytes_left // len(batch), MAX_PAGE_BYTES)
+            results = list(executor.map(lambda link: scrape(link, max_bytes=share, with_page_links=True), batch))
+            frontier = []
+            for link, result in zip(batch, results):
+                if not result or "error" in result or not result.get("content"):
+                    log.warning(f"[yellow]Skipping page {link}: {(result or {}).get('error', 'no content')}[/yellow]")
+                    continue
+                bytes_left -= result.get("page_bytes", 0)
+                fetched_tokens += estimate_tokens(result["content"])
+                pages.append((link, result))
+                frontier.extend(l for l in result.get("page_links", []) if l not in seen and l not in frontier)
+
+    parts: List[str] = []
+    used: List[str] = []
+    hashes = set()
+    tokens = 0
+    for link, result in pages:
+        content = result["content"]
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if digest in hashes:
+            log.debug("[dim]Page repeats earlier content[/dim] %s", link)
+            continue
+        hashes.add(digest)
+        page_tokens = estimate_tokens(content)
+        if parts and tokens + page_tokens > max_tokens:
+            log.debug("[yellow]Token budget reached[/yellow]", pages=len(used), tokens=tokens)
+            break
+        parts.append(content)
+        used.append(link)
+        tokens += page_tokens
+    if len(used) > 1:
+        log.debug("[green]Stitched paginated article[/green] %s", url, pages=len(used), tokens=tokens)
+    stitched = dict(first)
+    stitched.pop("page_links", None)
+    stitched.pop("page_bytes", None)
+    stitched["content"] = "\n\n".join(parts)
+    stitched["pages"] = used
+    return stitched
@@ -0,0 +1,212 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from tools.structured_log import get_logger
+
+log = get_logger("tools.proxy_pool")
+
+DEFAULT_PROXIES = [
+    "23.95.150.145:6114:initditer89:initditer89",
+    "45.38.107.97:6014:initditer89:initditer89",
+    "45.43.186.39:6257:initditer89:initditer89",
+    "64.137.96.74:6641:initditer89:initditer89",
+    "107.172.163.27:6543:initditer89:initditer89",
+    "136.0.207.84:6661:initditer89:initditer89",
+    "142.147.128.93:6593:initditer89:initditer89",
+    "154.203.43.247:5536:initditer89:initditer89",
+    "198.23.239.134:6540:initditer89:initditer89",
+    "216.10.27.159:6837:initditer89:initditer89"
+]
+PROBE_URL = "https://httpbin.org/ip"
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+# Statuses the proxy itself answers with (authentication required, bad
+# gateway); any other HTTP status is the origin's answer.
+PROXY_STATUS_CODES = frozenset({407, 502})
+
+
+def is_proxy_failure(error: Exception) -> bool:
+    """Whether a request through a proxy failed because of the proxy: no
+    connection, a timeout, a broken transfer or a PROXY_STATUS_CODES status.
+    An origin's 404 or 500 says nothing about the proxy's health."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is None or error.response.status_code in PROXY_STATUS_CODES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+
+def proxy_url(spec: str) -> str:
+    """`ip:port:user:password` (the PROXIES_LIST format), `ip:port` or a full URL."""
+    if "://" in spec:
+        return spec
+    parts = spec.split(":")
+    if len(parts) == 4:
+        ip, port, username, password = parts
+        return f"http://{username}:{password}@{ip}:{port}"
+    return f"http://{spec}"
+
+
+@dataclass
+class ProxyState:
+    url: str
+    success: float = 0.75
+    latency: float = 2.0
+    consecutive_failures: int = 0
+    state: str = CLOSED
+    opened_at: float = 0.0
+    requests: int = 0
+
+    @property
+    def proxies(self) -> Dict[str, str]:
+        return {"http": self.url, "https": self.url}
+
+    @property
+    def label(self) -> str:
+        return self.url.rsplit("@", 1)[-1]
+
+
+class ProxyPool:
+    """Health-tracked proxy rotation.
+
+    Every outcome (from `report` or a background probe) updates the proxy's
+    success rate and latency as EWMAs. `failure_threshold` consecutive failures
+    open its circuit: the proxy is skipped for `cooldown` seconds, then
+    half-opened for a trial, and closed again on the first success. `choose`
+    picks among the usable proxies with weight `success**2 / latency`.
+    """
+
+    def __init__(self, proxies: Iterable[str] = DEFAULT_PROXIES, probe_url: str = PROBE_URL,
+                 probe_interval: float = 120.0, probe_timeout: float = 10.0, alpha: float = 0.3,
+                 failure_threshold: int = 3, cooldown: float = 300.0, min_latency: float = 0.05):
+        self.proxies: List[ProxyState] = [ProxyState(proxy_url(spec)) for spec in proxies]
+        self.probe_url = probe_url
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.min_latency = min_latency
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _usable(self, proxy: ProxyState, now: float) -> bool:
+        if proxy.state == OPEN and now - proxy.opened_at >= self.cooldown:
+            proxy.state = HALF_OPEN
+            log.debug("[cyan]Proxy circuit half-open[/cyan] %s", proxy.label)
+        return proxy.state != OPEN
+
+    def weight(self, proxy: ProxyState) -> float:
+        weight = proxy.success ** 2 / max(proxy.latency, self.min_latency)
+        return weight * 0.25 if proxy.state == HALF_OPEN else weight
+
+    def choose(self) -> Optional[ProxyState]:
+        """A usable proxy picked by weight, or None when every circuit is open."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [proxy for proxy in self.proxies if self._usable(proxy, now)]
+            if not candidates:
+                return None
+            weights = [self.weight(proxy) for proxy in candidates]
+            if sum(weights) <= 0:
+                return random.choice(candidates)
+            return random.choices(candidates, weights=weights)[0]
+
+    def get_proxies(self) -> Optional[Dict[str, str]]:
+        """`requests`-style proxies mapping for a chosen proxy (None: go direct)."""
+        proxy = self.choose()
+        return proxy.proxies if proxy else None
+
+    def find(self, proxies: Optional[Dict[str, str]]) -> Optional[ProxyState]:
+        url = (proxies or {}).get("https") or (proxies or {}).get("http")
+        return next((proxy for proxy in self.proxies if proxy.url == url), None)
+
+    def report(self, proxy: Optional[ProxyState], success: bool, latency: Optional[float] = None):
+        if proxy is None:
+            return
+        with self._lock:
+            proxy.requests += 1
+            proxy.success = (1 - self.alpha) * proxy.success + self.alpha * (1.0 if success else 0.0)
+            if latency is not None:
+                proxy.latency = (1 - self.alpha) * proxy.latency + self.alpha * latency
+            if success:
+                if proxy.state != CLOSED:
+                    log.info(f"[green]Proxy {proxy.label} recovered; circuit closed[/green]")
+                proxy.state = CLOSED
+                proxy.consecutive_failures = 0
+                return
+            proxy.consecutive_failures += 1
+            if proxy.state == HALF_OPEN or proxy.consecutive_failures >= self.failure_threshold:
+                if proxy.state != OPEN:
+                    log.warning(f"[yellow]Proxy {proxy.label} failed {proxy.consecutive_failures} times; circuit open for {self.cooldown:.0f}s[/yellow]")
+                proxy.state = OPEN
+                proxy.opened_at = time.monotonic()
+
+    def probe(self, proxy: ProxyState) -> bool:
+        start = time.monotonic()
+        try:
+            response = requests.get(self.probe_url, proxies=proxy.proxies, timeout=self.probe_timeout)
+            ok = response.status_code == 200
+        except requests.RequestException:
+            ok = False
+        self.report(proxy, ok, time.monotonic() - start if ok else None)
+        return ok
+
+    def probe_all(self) -> Dict[str, bool]:
+        """Probe every proxy whose circuit is not open (open ones wait out their cooldown)."""
+        now = time.monotonic()
+        with self._lock:
+            targets = [proxy for proxy in self.proxies if self._usable(proxy, now)]
+        if not targets:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(8, len(targets))) as executor:
+            outcomes = dict(zip((proxy.label for proxy in targets), executor.map(self.probe, targets)))
+        log.debug("[dim]Proxy probes[/dim]", healthy=sum(outcomes.values()), probed=len(outcomes))
+        return outcomes
+
+    def start(self):
+        """Probe in a daemon thread every `probe_interval` seconds (first round immediately)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._probe_loop, name="proxy-probes", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _probe_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.probe_all()
+            except Exception as e:
+                log.error(f"[red]Proxy probe round failed: {e}[/red]")
+            self._stop.wait(self.probe_interval)
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {"proxy": proxy.label, "state": proxy.state, "success": round(proxy.success, 3),
+                 "latency": round(proxy.latency, 3), "weight": round(self.weight(proxy), 3), "requests": proxy.requests}
+                for proxy in self.proxies
+            ]
+
+
+_default_pool: Optional[ProxyPool] = None
+_default_lock = threading.Lock()
+
+
+def get_proxy_pool() -> ProxyPool:
+    """The process-wide pool over DEFAULT_PROXIES, probing in the background."""
+    global _default_pool
+    if _default_pool is None:
+        with _default_lock:
+            if _default_pool is None:
+                _default_pool = ProxyPool()
+                _default_pool.start()
+    return _default_pool
@@ -2,9 +2,15 @@ import requests
 from bs4 import BeautifulSoup
 import argparse
 import json
+from typing import Optional, Tuple
 from urllib.parse import urlparse
-from rich import print as rprint 
-from tools.shared_console import console
+from tools.structured_log import get_logger
+from tools.page_fetch import get_page_fetcher
+from tools.content_types import extract_non_html
+from tools.extraction_cache import extract_with_cache, layer_timings
+from tools import lxml_extract, density_extract
+from tools.pagination import page_links
+from tools.readle_layers import ReadleLayers
 
 
 try:
@@ -12,13 +18,22 @@ try:
 except ImportError:
     trafilatura = None
 
+log = get_logger("tools.readle")
+
 MINIMUM_CONTENT_LENGTH = 30000
+# "lxml" parses each page once (tools.lxml_extract) and hands the same tree
+# to trafilatura; "bs4" is the original BeautifulSoup layer 1. None picks lxml
+# when it is installed.
+EXTRACTION_BACKEND = None
+# Run tools.density_extract (Readability-style text/link-density scoring)
+# between layer 1 and trafilatura.
+DENSITY_LAYER = True
 
 
 def clean_text(text):
     return ' '.join(text.strip().split())
 
-def scrape_manual(url: str) -> dict:
+def scrape_manual(url: str, max_bytes: Optional[int] = None, with_page_links: bool = False) -> dict:
     # proxies down
     """
     proxies = {
@@ -37,74 +52,115 @@ def scrape_manual(url: str) -> dict:
     }
 
     try:
-        res = requests.get(url, headers=headers, timeout=20)
-        res.raise_for_status()
-        html_content = res.text
+        res = get_page_fetcher().fetch(url, headers=headers, timeout=20, max_bytes=max_bytes)
     except requests.RequestException as e:
-        console.log(f"[red] Failed to fetch URL: {e}[/red]")
+        log.error(f"[red] Failed to fetch URL: {e}[/red]")
         return {"error": str(e)}
 
+    result = extract_non_html(res)
+    if not result:
+        result = extract_with_cache(url, res.content, res.text, extract_layers, variant="readle")
+        if with_page_links:
+            result["page_links"] = page_links(url, res.text)
+    if with_page_links:
+        result["page_bytes"] = len(res.content)
+    return result
+
+def layer1_bs4(html_content: str) -> Tuple[str, str]:
+    """Title and layer-1 content with BeautifulSoup (the "bs4" backend)."""
     soup = BeautifulSoup(html_content, "html.parser")
     title = soup.title.string.strip() if soup.title else "(no title)"
-    
-    console.log("[yellow]Trying Layer 1: BeautifulSoup...[/yellow]")
+    main_content_area = soup.find("article") or soup.find("main") or soup.body
     content = ""
-    try:
-        main_content_area = soup.find("article") or soup.find("main") or soup.body
-        
-        if main_content_area:
-            paragraphs = main_content_area.find_all(["p", "h2", "h3", "li"])
-            content_list = [clean_text(p.get_text()) for p in paragraphs if len(p.get_text().strip()) > 10]
-            content = "\n".join(content_list)
+    if main_content_area:
+        paragraphs = main_content_area.find_all(["p", "h2", "h3", "li"])
+        content_list = [clean_text(p.get_text()) for p in paragraphs if len(p.get_text().strip()) > 10]
+        content = "\n".join(content_list)
+    return title, content
+
+layers = ReadleLayers("readle", lxml_extract.READLE_RULES, include_tables=False, layer1_bs4=layer1_bs4)
+
+def layer1(html_content: str, backend: Optional[str] = None) -> Tuple[str, str, object]:
+    return layers.layer1(html_content, backend or EXTRACTION_BACKEND)
+
+def extract_layers(url: str, html_content: str, backend: Optional[str] = None) -> dict:
+    return layers.extract_layers(url, html_content, extract_all_layers, backend or EXTRACTION_BACKEND)
+
+def extract_all_layers(url: str, html_content: str, backend: Optional[str] = None) -> dict:
+    title, content, tree = "(no title)", "", None
+    with layer_timings.measure("layer1", url):
+        log.debug("[yellow]Trying Layer 1: BeautifulSoup...[/yellow]")
+        try:
+            title, content, tree = layer1(html_content, backend)
         
-        if len(content) > MINIMUM_CONTENT_LENGTH:
-            console.log("[green]Layer 1 (BeautifulSoup) successfully found significant content.[/green]")
-            return {
-                "title": title,
-                "content": content,
-                "source": url,
-                "domain": urlparse(url).netloc
-            }
-        else:
-            console.log(f"[yellow]Layer 1 only found {len(content)} characters, below threshold {MINIMUM_CONTENT_LENGTH}.[/yellow]")
+            if len(content) > MINIMUM_CONTENT_LENGTH:
+                log.debug("[green]Layer 1 (BeautifulSoup) successfully found significant content.[/green]")
+                return {
+                    "title": title,
+                    "content": content,
+                    "source": url,
+                    "domain": urlparse(url).netloc,
+                    "layer": "layer1"
+                }
+            else:
+                log.debug("[yellow]Layer 1 only found %d characters, below threshold %d.[/yellow]", len(content), MINIMUM_CONTENT_LENGTH)
 
-    except Exception as e:
-        console.log(f"[red]Error in Layer 1: {e}[/red]")
+        except Exception as e:
+            log.error(f"[red]Error in Layer 1: {e}[/red]")
 
-    console.log("[cyan]Activating Layer 2: Trafilatura...[/cyan]")
+    content_layer = "layer1"
+    if DENSITY_LAYER and density_extract.available():
+        log.debug("[yellow]Trying the density layer...[/yellow]")
+        density_content, tree = layers.density_layer(url, html_content, tree)
+        if len(density_content) > MINIMUM_CONTENT_LENGTH:
+            log.debug("[green]Density layer found significant content.[/green]")
+            return {"title": title, "content": density_content, "source": url, "domain": urlparse(url).netloc, "layer": "density"}
+        if len(density_content) > len(content):
+            content, content_layer = density_content, "density"
+
+    log.debug("[cyan]Activating Layer 2: Trafilatura...[/cyan]")
 
     if not trafilatura:
-        console.log("[red]Trafilatura is not installed. Please run 'pip install trafilatura'. Returning best result from Layer 1.[/red]")
+        log.error("[red]Trafilatura is not installed. Please run 'pip install trafilatura'. Returning best result from Layer 1.[/red]")
+        if content:
+            return {"title": title, "content": content, "source": url, "domain": urlparse(url).netloc, "layer": content_layer}
         return {
             "title": title,
-            "content": content if content else "Scraping failed and Trafilatura not available.",
+            "content": "Scraping failed and Trafilatura not available.",
             "source": url,
             "domain": urlparse(url).netloc
         }
         
     try:
-        trafilatura_content = trafilatura.extract(html_content, include_comments=False, include_tables=False)
+        with layer_timings.measure("trafilatura", url):
+            # trafilatura prunes the tree it is given, so it always runs after the other layers.
+            trafilatura_content = layers.run_trafilatura(tree if tree is not None else html_content)
         
         if trafilatura_content and len(trafilatura_content) > MINIMUM_CONTENT_LENGTH:
-            console.log("[green]Layer 2 (Trafilatura) successfully found significant content.[/green]")
+            log.debug("[green]Layer 2 (Trafilatura) successfully found significant content.[/green]")
             return {
                 "title": title,
                 "content": trafilatura_content,
                 "source": url,
-                "domain": urlparse(url).netloc
+                "domain": urlparse(url).netloc,
+                "layer": "trafilatura"
             }
         else:
-            console.log("[red]Layer 2 also failed to find significant content. Returning best available result.[/red]")
-            final_content = content if len(content) > len(trafilatura_content or "") else trafilatura_content
+            log.error("[red]Layer 2 also failed to find significant content. Returning best available result.[/red]")
+            layer1_wins = len(content) > len(trafilatura_content or "")
+            final_content = content if layer1_wins else trafilatura_content
+            if final_content:
+                return {"title": title, "content": final_content, "source": url, "domain": urlparse(url).netloc,
+                        "layer": content_layer if layer1_wins else "trafilatura"}
             return {
                 "title": title,
-                "content": final_content or "Failed to extract main content from this page.",
+                "content": "Failed to extract main content from this page.",
                 "source": url,
                 "domain": urlparse(url).netloc
             }
             
     except Exception as e:
-        rprint(f"[red]Error in Layer 2: {e}[/red]")
+        log.error(f"[red]Error in Layer 2: {e}[/red]")
         return {
             "title": title,
             "content": content if content else f"Total scraping failure. Last error: {e}",
@@ -0,0 +1,96 @@
+from typing import Callable, Optional, Tuple
+from urllib.parse import urlparse
+
+from tools.structured_log import get_logger
+from tools.extraction_cache import layer_timings
+from tools.extractor_memory import MIN_CONTENT_CHARS, extractor_memory
+from tools import lxml_extract, density_extract
+
+try:
+    import trafilatura
+except ImportError:
+    trafilatura = None
+
+log = get_logger("tools.readle_layers")
+
+
+class ReadleLayers:
+    """The extraction layers of one readle variant.
+
+    The variants share every layer and differ only in their layer-1 rules
+    (`rules` on lxml, `layer1_bs4` on the "bs4" backend) and whether
+    trafilatura keeps tables. Each readle module builds one of these and
+    keeps its own `extract_all_layers`, which decides between the layers.
+    `backend` is "lxml", "bs4" or None (lxml when installed).
+    """
+
+    def __init__(self, variant: str, rules: lxml_extract.Layer1Rules, include_tables: bool,
+                 layer1_bs4: Callable[[str], Tuple[str, str]]):
+        self.variant = variant
+        self.rules = rules
+        self.include_tables = include_tables
+        self.layer1_bs4 = layer1_bs4
+
+    @staticmethod
+    def use_lxml(backend: Optional[str] = None) -> bool:
+        return backend != "bs4" and lxml_extract.available()
+
+    def layer1(self, html_content: str, backend: Optional[str] = None) -> Tuple[str, str, object]:
+        """Title, layer-1 content and the lxml tree to reuse (None on the bs4 backend)."""
+        if not self.use_lxml(backend):
+            return (*self.layer1_bs4(html_content), None)
+        tree = lxml_extract.parse_html(html_content)
+        return lxml_extract.page_title(tree), lxml_extract.layer1_content(tree, self.rules), tree
+
+    @staticmethod
+    def density_layer(url: str, html_content: str, tree=None) -> Tuple[str, object]:
+        """Density-scored content and the lxml tree it was read from (parsed here when not given)."""
+        with layer_timings.measure("density", url):
+            try:
+                tree = tree if tree is not None else lxml_extract.parse_html(html_content)
+                return density_extract.density_content(tree), tree
+            except Exception as e:
+                log.error(f"[red]Error in density layer: {e}[/red]")
+                return "", tree
+
+    def run_trafilatura(self, source) -> Optional[str]:
+        """trafilatura's text for an HTML string or lxml tree (which it prunes)."""
+        return trafilatura.extract(source, include_comments=False, include_tables=self.include_tables)
+
+    def extract_layers(self, url: str, html_content: str, extract_all_layers: Callable[[str, str, Optional[str]], dict],
+                       backend: Optional[str] = None) -> dict:
+        """Run the layer that keeps winning on this domain, or `extract_all_layers`
+        when none has been learned yet (or the domain is due for re-validation)."""
+        domain = urlparse(url).netloc
+        layer = extractor_memory.preferred(domain, self.variant)
+        if layer:
+            result = self.extract_learned(url, html_content, layer, backend)
+            if result:
+                return result
+            log.debug("[yellow]Learned extractor %s came up short on %s; trying every layer.[/yellow]", layer, domain)
+        result = extract_all_layers(url, html_content, backend)
+        extractor_memory.record(domain, self.variant, result.get("layer"))
+        return result
+
+    def extract_learned(self, url: str, html_content: str, layer: str, backend: Optional[str] = None) -> Optional[dict]:
+        try:
+            if layer == "trafilatura" and trafilatura:
+                tree = lxml_extract.parse_html(html_content)
+                title = lxml_extract.page_title(tree)
+                with layer_timings.measure("trafilatura", url):
+                    content = self.run_trafilatura(tree)
+            elif layer == "layer1":
+                with layer_timings.measure("layer1", url):
+                    title, content, _ = self.layer1(html_content, backend)
+            elif layer == "density" and density_extract.available():
+                content, tree = self.density_layer(url, html_content)
+                title = lxml_extract.page_title(tree) if tree is not None else "(no title)"
+            else:
+                return None
+        except Exception as e:
+            log.error(f"[red]Error in learned {layer} extractor: {e}[/red]")
+            return None
+        if not content or len(content) < MIN_CONTENT_CHARS:
+            return None
+        log.debug("[green]Used the learned %s extractor.[/green]", layer)
+        return {"title": title, "content": content, "source": url, "domain": urlparse(url).netloc, "layer": layer}
@@ -0,0 +1,282 @@
+import re
+import threading
+from itertools import chain
+import numpy as np
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from tools.bm25 import BM25RelevanceModel
+from tools.domain_trust import DomainTrustTable
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Compile keywords into a prefix-trie shaped regex (longest branch first),
+    so the engine walks one branch per character instead of every alternative."""
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            body = ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class KeywordAutomaton:
+    """Multi-pattern substring matcher compiled into a single regex.
+
+    The keywords are folded into one trie-shaped pattern scanned inside a
+    lookahead, so one pass finds the longest keyword starting at each offset;
+    keywords that are substrings of a matched keyword are implied by it. That
+    makes `match_ids(text)` equal to `{k for k in keywords if k in text}`.
+
+    For batches, a keyword without whitespace can only occur inside a single
+    whitespace-delimited token, so the automaton runs once per distinct token
+    (memoised across batches) and only multi-word keywords are checked against
+    the full text.
+    """
+
+    MAX_VOCABULARY = 200_000
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        self.index: Dict[str, int] = {k: i for i, k in enumerate(self.keywords)}
+
+        self._pattern = re.compile("(?=(" + _trie_pattern(self.keywords) + "))") if self.keywords else None
+        self._implied: Dict[str, List[int]] = {
+            keyword: [self.index[other] for other in self.keywords if other in keyword]
+            for keyword in self.keywords
+        }
+        self._phrases = [(self.index[k], k) for k in self.keywords if any(c.isspace() for c in k)]
+        # Per-token keyword hits are stored as packed little-endian 64-bit words,
+        # so OR-ing the tokens of a row is one reduceat over a few integers.
+        self._words = max(1, (len(self.keywords) + 63) // 64)
+        self._vocabulary_lock = threading.Lock()
+        self._reset_vocabulary()
+
+    def _reset_vocabulary(self):
+        self._vocabulary: Dict[str, int] = {}
+        self._token_bits = np.zeros((0, self._words), dtype='<u8')
+        self._token_relevant = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def match_ids(self, text: str) -> Set[int]:
+        if self._pattern is None:
+            return set()
+        found: Set[int] = set()
+        for keyword in set(self._pattern.findall(text)):
+            found.update(self._implied[keyword])
+        return found
+
+    def _learn_tokens(self, tokens: Set[str]):
+        new_tokens = tokens.difference(self._vocabulary)
+        if not new_tokens:
+            return
+        if len(self._vocabulary) + len(new_tokens) > self.MAX_VOCABULARY:
+            self._reset_vocabulary()
+            new_tokens = tokens
+
+        offset = len(self._vocabulary)
+        hits = np.zeros((len(new_tokens), len(self.keywords)), dtype=bool)
+        for i, token in enumerate(new_tokens):
+            self._vocabulary[token] = offset + i
+            ids = self.match_ids(token)
+            if ids:
+                hits[i, list(ids)] = True
+        self._token_bits = np.vstack([self._token_bits, self._pack(hits)])
+        self._token_relevant = np.concatenate([self._token_relevant, hits.any(axis=1)])
+
+    def _pack(self, hits: np.ndarray) -> np.ndarray:
+        padded = np.zeros((hits.shape[0], self._words * 64), dtype=bool)
+        padded[:, :hits.shape[1]] = hits
+        return np.packbits(padded, axis=1, bitorder='little').view('<u8')
+
+    def _unpack(self, bits: np.ndarray) -> np.ndarray:
+        unpacked = np.unpackbits(np.ascontiguousarray(bits, dtype='<u8').view(np.uint8), axis=1, bitorder='little')
+        return unpacked[:, :len(self.keywords)].astype(bool)
+
+    def match_matrix(self, texts: Sequence[str], split_texts: Optional[Sequence[List[str]]] = None) -> np.ndarray:
+        matrix = np.zeros((len(texts), len(self.keywords)), dtype=bool)
+        if self._pattern is None or not texts:
+            return matrix
+
+        if split_texts is None:
+            split_texts = [text.split() for text in texts]
+        flat_tokens = list(chain.from_iterable(split_texts))
+        with self._vocabulary_lock:
+            self._learn_tokens(set(flat_tokens))
+            token_ids = np.fromiter(map(self._vocabulary.__getitem__, flat_tokens), dtype=np.int64, count=len(flat_tokens))
+            token_bits = self._token_bits
+            token_relevant = self._token_relevant
+        token_rows = np.repeat(np.arange(len(texts)), np.fromiter(map(len, split_texts), dtype=np.int64, count=len(texts)))
+
+        relevant = token_relevant[token_ids]
+        if relevant.any():
+            hit_rows = token_rows[relevant]
+            starts = np.flatnonzero(np.r_[True, hit_rows[1:] != hit_rows[:-1]])
+            row_bits = np.bitwise_or.reduceat(token_bits[token_ids[relevant]], starts, axis=0)
+            matrix[hit_rows[starts]] = self._unpack(row_bits)
+
+        for col, phrase in self._phrases:
+            matrix[:, col] = np.fromiter((phrase in text for text in texts), dtype=bool, count=len(texts))
+        return matrix
+
+    def columns(self, keywords: Iterable[str]) -> List[int]:
+        return [self.index[k] for k in dict.fromkeys(keywords) if k in self.index]
+
+
+class ResultScorer:
+    """Batch scorer for EnhancedSearchPersona, scoring a whole batch at once.
+
+    The lexical relevance term is BM25 over the batch (see tools.bm25), so it
+    only exists per batch. Given those BM25 scores, the per-result
+    `_calculate_*` methods of the persona produce the same numbers; they are
+    kept as the reference implementation for benchmarks.bench_result_scoring."""
+
+    def __init__(self, intent_patterns: Dict[str, Dict], domain_trust: DomainTrustTable,
+                 quality_indicators: List[str], spam_indicators: List[str],
+                 cross_intent_terms: Dict[str, List[str]], relevance_model: BM25RelevanceModel):
+        self.intent_patterns = intent_patterns
+        self.relevance_model = relevance_model
+        self.domain_trust = domain_trust
+        self.quality_indicators = quality_indicators
+        self.spam_indicators = spam_indicators
+        self.cross_intent_terms = cross_intent_terms
+
+        vocabulary: List[str] = []
+        for config in intent_patterns.values():
+            vocabulary.extend(config.get('keywords', []))
+        vocabulary.extend(quality_indicators)
+        vocabulary.extend(spam_indicators)
+        for terms in cross_intent_terms.values():
+            vocabulary.extend(terms)
+        self.automaton = KeywordAutomaton(vocabulary)
+
+        # Indicator columns are kept in list order (duplicates included) so the
+        # running sums below add in exactly the same order as the scalar code.
+        self._quality_cols = [self.automaton.index[k] for k in quality_indicators]
+        self._spam_cols = [self.automaton.index[k] for k in spam_indicators]
+        self._intent_cols = {
+            intent: self.automaton.columns(config.get('keywords', []))
+            for intent, config in intent_patterns.items()
+        }
+        self._cross_cols = {intent: self.automaton.columns(terms) for intent, terms in cross_intent_terms.items()}
+
+    def _keyword_counts(self, matches: np.ndarray, intent: str) -> np.ndarray:
+        cols = self._intent_cols.get(intent, [])
+        if not cols:
+            return np.zeros(matches.shape[0], dtype=np.int64)
+        return matches[:, cols].sum(axis=1)
+
+    def source_quality(self, matches: np.ndarray, domains: Sequence[str], intent: str) -> np.ndarray:
+        trust = [self.domain_trust.lookup(d) for d in domains]
+        scores = np.array([t.base_score() for t in trust], dtype=np.float64)
+
+        for col in self._quality_cols:
+            scores = scores + np.where(matches[:, col], 0.05, 0.0)
+        for col in self._spam_cols:
+            scores = scores - np.where(matches[:, col], 0.3, 0.0)
+
+        adjust = np.array([
+            0.2 if intent in t.boost_intents else (-0.3 if intent in t.penalty_intents else 0.0)
+            for t in trust
+        ])
+        scores = scores + adjust
+
+        return np.clip(scores, 0.1, 1.0)
+
+    def relevance(self, matches: np.ndarray, titles: Sequence[str], contents: Sequence[str],
+                  query: str, intent: str, lexical: Optional[np.ndarray] = None,
+                  now: Optional[datetime] = None) -> np.ndarray:
+        n = len(contents)
+        query_terms = set(query.lower().split())
+
+        if query_terms:
+            base = lexical if lexical is not None else self.relevance_model.score_batch(contents, query)
+
+            title_automaton = KeywordAutomaton(query_terms)
+            title_hits = title_automaton.match_matrix([t.lower() for t in titles]).sum(axis=1)
+            title_bonus = (title_hits / len(query_terms)) * 0.2
+        else:
+            base = np.zeros(n)
+            title_bonus = np.zeros(n)
+
+        semantic = np.zeros(n)
+        if intent in self.intent_patterns:
+            intent_keywords = self.intent_patterns[intent]['keywords']
+            if intent_keywords:
+                semantic = (self._keyword_counts(matches, intent) / len(intent_keywords)) * 0.3
+
+        current_year = (now or datetime.now()).year
+        years = (str(current_year), str(current_year - 1))
+        freshness = np.array([0.1 if (years[0] in c or years[1] in c) else 0.0 for c in contents])
+
+        total = base + semantic + title_bonus + freshness
+        return np.minimum(1.0, total)
+
+    def intent_match(self, matches: np.ndarray, domains: Sequence[str], intent: str) -> np.ndarray:
+        n = matches.shape[0]
+        if intent == 'general':
+            return np.zeros(n)
+
+        keywords = self.intent_patterns.get(intent, {}).get('keywords', [])
+
+        scores = np.zeros(n)
+        if keywords:
+            scores = scores + (self._keyword_counts(matches, intent) / len(keywords)) * 0.5
+
+        trust = [self.domain_trust.lookup(d) for d in domains]
+        boost = np.array([0.4 if intent in t.boost_intents else 0.0 for t in trust])
+        penalty = np.array([0.6 if intent in t.penalty_intents else 0.0 for t in trust])
+
+        scores = scores + boost
+        scores = scores - penalty
+        return np.clip(scores, -1.0, 1.0)
+
+    def final(self, matches: np.ndarray, relevance: np.ndarray, quality: np.ndarray,
+              intent_match: np.ndarray, intent: str) -> np.ndarray:
+        scores = relevance * 0.4 + quality * 0.3 + intent_match * 0.3
+
+        cols = self._cross_cols.get(intent)
+        if cols:
+            hit = matches[:, cols].any(axis=1)
+            scores = np.where(hit, scores * 0.3, scores)
+
+        return np.clip(scores, 0.0, 1.0)
+
+    def score_batch(self, results: List, query: str, intent: str, now: Optional[datetime] = None,
+                    lexical: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score SearchResult objects in place and return their final scores.
+        `lexical` is the batch's BM25 scores when the caller already has them."""
+        if not results:
+            return np.zeros(0)
+
+        titles = [r.title for r in results]
+        contents = [f"{r.title} {r.snippet}".lower() for r in results]
+        split_contents = [c.split() for c in contents]
+        domains = [r.domain for r in results]
+        matches = self.automaton.match_matrix(contents, split_contents)
+
+        quality = self.source_quality(matches, domains, intent)
+        relevance = self.relevance(matches, titles, contents, query, intent, lexical=lexical, now=now)
+        intent_match = self.intent_match(matches, domains, intent)
+        final = self.final(matches, relevance, quality, intent_match, intent)
+
+        for i, result in enumerate(results):
+            result.source_quality = float(quality[i])
+            result.relevance_score = float(relevance[i])
+            result.intent_match = float(intent_match[i])
+            result.final_score = float(final[i])
+        return final
@@ -8,6 +8,8 @@
 import requests
 import json
 
+from tools.host_scheduler import get_host_scheduler
+
 class SearchAddrsInfo:
     def __init__(self):
         self.base_url = "https://api.arkm.com/balances/address/"
@@ -34,7 +36,8 @@ class SearchAddrsInfo:
         """Query address information from the API and return simplified raw data."""
         try:
             url = f"{self.base_url}{address}"
-            response = requests.get(url, headers=self.headers)
+            with get_host_scheduler().slot(url):
+                response = requests.get(url, headers=self.headers)
             response.raise_for_status()
             data = json.loads(response.text)
 
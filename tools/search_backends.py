@@ -0,0 +1,267 @@
+import inspect
+import json
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+import requests
+
+from tools.structured_log import get_logger
+from tools.brave_parser import parse_organic_results
+
+log = get_logger("tools.search_backends")
+
+try:
+    from tools.upgradescraper import brave_search, is_cached as brave_is_cached
+except ImportError:
+    brave_search = None
+    brave_is_cached = None
+
+SEARXNG_URL_ENV = "SEARXNG_URL"
+DEFAULT_SEARXNG_URL = "http://localhost:8888"
+
+
+def _empty_response(query: str, engine: str, message: Optional[str] = None) -> Dict:
+    response = {
+        "status": "error" if message else "success",
+        "searchParameters": {"query": query, "engine": engine, "fetched_at": datetime.now().isoformat()},
+        "organic_results": [],
+    }
+    if message:
+        response["message"] = message
+    return response
+
+
+class SearchBackend(ABC):
+    """A web search source. `search` returns the brave_search response shape:
+    a dict whose `organic_results` entries carry position, title, link, snippet,
+    domain and optionally date."""
+
+    name = "base"
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 12) -> Dict:
+        ...
+
+    def is_cached(self, query: str, limit: int = 12) -> bool:
+        return False
+
+
+class BraveBackend(SearchBackend):
+    """The search.brave.com scraper in tools.upgradescraper (with its disk cache)."""
+
+    name = "brave"
+
+    def __init__(self, parser: Optional[str] = None):
+        self.parser = parser
+
+    def search(self, query: str, limit: int = 12) -> Dict:
+        if brave_search is None:
+            return _empty_response(query, self.name, "brave scraper not available")
+        return brave_search(query, limit=limit, parser=self.parser)
+
+    def is_cached(self, query: str, limit: int = 12) -> bool:
+        return bool(brave_is_cached and brave_is_cached(query, limit))
+
+
+class SearxngBackend(SearchBackend):
+    """SearXNG's JSON API (`/search?format=json`), e.g. a local instance started with
+    `docker run -p 8888:8080 searxng/searxng` with `json` enabled under search.formats."""
+
+    name = "searxng"
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 10.0,
+                 categories: str = "general", language: str = "auto"):
+        self.base_url = (base_url or os.getenv(SEARXNG_URL_ENV, DEFAULT_SEARXNG_URL)).rstrip("/")
+        self.timeout = timeout
+        self.categories = categories
+        self.language = language
+        self.session = requests.Session()
+
+    def search(self, query: str, limit: int = 12) -> Dict:
+        start = time.time()
+        try:
+            response = self.session.get(
+                f"{self.base_url}/search",
+                params={"q": query, "format": "json", "categories": self.categories, "language": self.language},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            log.error(f"[red]SearXNG search failed for '{query}': {e}[/red]")
+            return _empty_response(query, self.name, str(e))
+
+        organic_results = []
+        for item in payload.get("results", []):
+            if len(organic_results) >= limit:
+                break
+            link = item.get("url", "")
+            if not link.startswith(("http://", "https://")):
+                continue
+            result = {
+                "position": len(organic_results) + 1,
+                "title": " ".join((item.get("title") or "").split()),
+                "link": link,
+                "snippet": " ".join((item.get("content") or "").split()),
+                "domain": urlparse(link).netloc,
+            }
+            if item.get("publishedDate"):
+                result["date"] = item["publishedDate"]
+            organic_results.append(result)
+
+        return {
+            "status": "success",
+            "searchParameters": {
+                "query": query,
+                "engine": self.name,
+                "fetched_at": datetime.now().isoformat(),
+                "latency_ms": int((time.time() - start) * 1000),
+            },
+            "organic_results": organic_results,
+        }
+
+
+def fixture_slug(query: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", query.lower()).strip("_")[:120] or "empty"
+
+
+class FixtureBackend(SearchBackend):
+    """Offline backend for tests and benchmarks.
+
+    Responses come from `responses` (query -> organic_results list or full
+    response dict) or from `directory`, where `<slug>.json` holds a response
+    (or a bare results list) and `<slug>.html` a saved Brave results page.
+    `default.json`/`default.html` answer queries without their own fixture.
+    `latency` simulates network time; `cached` makes fan-out treat every query as free.
+    """
+
+    name = "fixture"
+
+    def __init__(self, directory: Optional[str] = None, responses: Optional[Dict] = None,
+                 latency: float = 0.0, cached: bool = False):
+        self.directory = Path(directory) if directory else None
+        self.responses = responses or {}
+        self.latency = latency
+        self.cached = cached
+
+    def _load(self, query: str, limit: int):
+        if query in self.responses:
+            return self.responses[query]
+        if self.directory is None:
+            return None
+        for stem in (fixture_slug(query), "default"):
+            json_path = self.directory / f"{stem}.json"
+            if json_path.exists():
+                with open(json_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            html_path = self.directory / f"{stem}.html"
+            if html_path.exists():
+                return parse_organic_results(html_path.read_text(encoding="utf-8"), limit)
+        return None
+
+    def search(self, query: str, limit: int = 12) -> Dict:
+        if self.latency:
+            time.sleep(self.latency)
+        data = self._load(query, limit)
+        if data is None:
+            return _empty_response(query, self.name)
+        if isinstance(data, list):
+            data = {"status": "success", "organic_results": data}
+        response = dict(data)
+        response["organic_results"] = list(data.get("organic_results", []))[:limit]
+        response.setdefault("searchParameters", {"query": query, "engine": self.name})
+        return response
+
+    def is_cached(self, query: str, limit: int = 12) -> bool:
+        return self.cached
+
+
+class RacingBackend(SearchBackend):
+    """Query several backends at once and return the first non-empty response.
+
+    If the first backend to answer has no results, the others are given until
+    `timeout` to do better. The winner's name is stored under `backend`.
+    """
+
+    name = "race"
+
+    def __init__(self, backends: Sequence[SearchBackend], timeout: float = 10.0):
+        if len(backends) < 2:
+            raise ValueError("Racing needs at least two search backends")
+        self.backends = list(backends)
+        self.timeout = timeout
+
+    def search(self, query: str, limit: int = 12) -> Dict:
+        executor = ThreadPoolExecutor(max_workers=len(self.backends))
+        try:
+            futures = {executor.submit(backend.search, query, limit): backend for backend in self.backends}
+            pending = set(futures)
+            fallback = None
+            deadline = time.monotonic() + self.timeout
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    backend = futures[future]
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        log.warning(f"[yellow]Search backend '{backend.name}' failed: {e}[/yellow]")
+                        continue
+                    response = dict(response, backend=backend.name)
+                    if response.get("organic_results"):
+                        log.debug("[cyan]Search race won by[/cyan] %s", backend.name, query=query)
+                        return response
+                    fallback = fallback or response
+            return fallback or _empty_response(query, self.name, "no backend answered in time")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def is_cached(self, query: str, limit: int = 12) -> bool:
+        return any(backend.is_cached(query, limit) for backend in self.backends)
+
+
+SEARCH_BACKENDS: Dict[str, Callable[..., SearchBackend]] = {
+    "brave": BraveBackend,
+    "searxng": SearxngBackend,
+    "fixture": FixtureBackend,
+}
+
+
+def register_search_backend(name: str, factory: Callable[..., SearchBackend]):
+    """Make `factory` buildable as `config['backend'] = name`. A backend class
+    that leaves abstract methods (e.g. `search`) unimplemented is refused here
+    rather than when a search first needs it."""
+    if inspect.isclass(factory) and inspect.isabstract(factory):
+        missing = ", ".join(sorted(factory.__abstractmethods__))
+        raise TypeError(f"Search backend '{name}' ({factory.__name__}) does not implement: {missing}")
+    SEARCH_BACKENDS[name] = factory
+
+
+def create_search_backend(config: Dict) -> SearchBackend:
+    """Build the backend named by `config['backend']`.
+
+    `config['options']` maps backend names to constructor keyword arguments.
+    The special name "race" builds a RacingBackend over `config['race']`.
+    """
+    options: Dict[str, Dict] = config.get("options", {})
+
+    def build(name: str) -> SearchBackend:
+        if name not in SEARCH_BACKENDS:
+            raise ValueError(f"Unknown search backend '{name}', available: {sorted(SEARCH_BACKENDS)}")
+        return SEARCH_BACKENDS[name](**options.get(name, {}))
+
+    name = config.get("backend", "brave")
+    if name == "race":
+        racers: List[str] = config.get("race", ["brave", "searxng"])
+        return RacingBackend([build(racer) for racer in racers], timeout=config.get("race_timeout", 10.0))
+    return build(name)
@@ -0,0 +1,155 @@
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from tools.structured_log import get_logger
+
+log = get_logger("tools.semantic_rerank")
+
+CPU_PROVIDERS = ["CPUExecutionProvider"]
+
+
+@dataclass
+class RerankReport:
+    reranked: int = 0
+    cache_hits: int = 0
+    latency: float = 0.0
+    error: Optional[str] = None
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of text -> embedding vector, so snippets that come back
+    across searches (and the repeated query) are embedded only once."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(text)
+            if vector is not None:
+                self._entries.move_to_end(text)
+            return vector
+
+    def put(self, text: str, vector: np.ndarray):
+        with self._lock:
+            self._entries[text] = vector
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def load_chroma_embedding_function(allow_download: bool = False):
+    """Return chromadb's bundled ONNX MiniLM embedding function pinned to the CPU
+    provider, or None when chromadb is missing or the model is not on disk and
+    downloading is not allowed."""
+    try:
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+    except ImportError:
+        log.warning("[yellow]Semantic rerank disabled: chromadb is not installed[/yellow]")
+        return None
+
+    model_path = getattr(ONNXMiniLM_L6_V2, "DOWNLOAD_PATH", None)
+    if not allow_download and model_path is not None and not Path(model_path).exists():
+        log.warning(f"[yellow]Semantic rerank disabled: embedding model not found at {model_path} (offline)[/yellow]")
+        return None
+
+    try:
+        return ONNXMiniLM_L6_V2(preferred_providers=CPU_PROVIDERS)
+    except TypeError:
+        return ONNXMiniLM_L6_V2()
+    except Exception as e:
+        log.error(f"[red]Semantic rerank disabled: failed to load embedding function: {e}[/red]")
+        return None
+
+
+class SemanticReranker:
+    """Second-stage reranker: cosine similarity between the query and each
+    snippet embedding, blended into the first-stage score."""
+
+    def __init__(self, embedding_function: Optional[Callable[[List[str]], Sequence]] = None,
+                 cache_size: int = 2048, allow_download: bool = False):
+        self._embedding_function = embedding_function
+        self._allow_download = allow_download
+        self._loaded = embedding_function is not None
+        self._load_lock = threading.Lock()
+        self.cache = EmbeddingCache(cache_size)
+
+    @property
+    def embedding_function(self):
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self._embedding_function = load_chroma_embedding_function(self._allow_download)
+                    self._loaded = True
+        return self._embedding_function
+
+    @property
+    def available(self) -> bool:
+        return self.embedding_function is not None
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts as unit vectors, serving repeated texts from the cache."""
+        vectors: List[Optional[np.ndarray]] = [self.cache.get(text) for text in texts]
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            embedded = np.asarray(self.embedding_function(missing), dtype=np.float32)
+            norms = np.linalg.norm(embedded, axis=1, keepdims=True)
+            embedded = np.divide(embedded, norms, out=np.zeros_like(embedded), where=norms > 0)
+            fresh = dict(zip(missing, embedded))
+            for text, vector in fresh.items():
+                self.cache.put(text, vector)
+            vectors = [vector if vector is not None else fresh[text] for text, vector in zip(texts, vectors)]
+        return np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    def similarities(self, query: str, texts: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of each text to the query, clipped to [0, 1]."""
+        if not texts:
+            return np.zeros(0)
+        vectors = self.embed([query, *texts])
+        return np.clip(vectors[1:] @ vectors[0], 0.0, 1.0).astype(np.float64)
+
+    def rerank(self, items: List, query: str, text_of: Callable, score_of: Callable,
+               top_n: int = 10, weight: float = 0.3) -> tuple:
+        """Blend semantic similarity into the scores of the first `top_n` items.
+
+        Returns `(blended, similarities, report)`: `blended[i]` is
+        `(1 - weight) * score + weight * similarity` for the reranked prefix and
+        the original score for the tail; an unavailable model leaves scores as is.
+        Blended and original scores are on different scales, so callers re-sort
+        only the first `report.reranked` items and keep the tail after them.
+        """
+        start = time.monotonic()
+        scores = np.array([score_of(item) for item in items], dtype=np.float64)
+        similarities = np.zeros(len(items))
+        report = RerankReport()
+        head = items[:top_n]
+        if not head:
+            return scores, similarities, report
+        if not self.available:
+            report.error = "embedding function unavailable"
+            return scores, similarities, report
+
+        texts = [text_of(item) for item in head]
+        cached_before = sum(1 for text in dict.fromkeys([query, *texts]) if self.cache.get(text) is not None)
+        try:
+            similarities[:len(head)] = self.similarities(query, texts)
+        except Exception as e:
+            report.error = str(e)
+            log.error(f"[red]Semantic rerank failed: {e}[/red]")
+            return scores, np.zeros(len(items)), report
+
+        scores[:len(head)] = (1.0 - weight) * scores[:len(head)] + weight * similarities[:len(head)]
+        report.reranked = len(head)
+        report.cache_hits = cached_before
+        report.latency = time.monotonic() - start
+        return scores, similarities, report
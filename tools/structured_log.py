@@ -0,0 +1,169 @@
+import logging
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Union
+
+from rich.errors import StyleSyntaxError
+from rich.style import Style
+
+from tools.shared_console import console
+
+LEVELS = {"trace": 5, "debug": 10, "info": 20, "warning": 30, "error": 40, "off": 100}
+LEVEL_ENV = "PUSTAKA_LOG_LEVEL"
+PROFILE_ENV = "PUSTAKA_LOG_PROFILE"
+
+# "rich": Rich markup and renderables on the shared console (interactive use).
+# "quiet": plain `key=value` lines through the stdlib logging module on stderr;
+#          no Rich rendering and no debug views, whatever the level.
+PROFILES = ("rich", "quiet")
+
+Message = Union[str, Callable[[], str]]
+
+_BRACKETED = re.compile(r"\[(/?)([^\[\]]*)\]")
+
+
+def _level_number(level: Union[str, int]) -> int:
+    if isinstance(level, int):
+        return level
+    return LEVELS.get(str(level).lower(), LEVELS["info"])
+
+
+class _Settings:
+    def __init__(self):
+        self.level = _level_number(os.getenv(LEVEL_ENV, "info"))
+        profile = os.getenv(PROFILE_ENV, "rich").lower()
+        self.profile = profile if profile in PROFILES else "rich"
+        self._stdlib_ready = False
+
+    def stdlib_logger(self, name: str) -> logging.Logger:
+        if not self._stdlib_ready:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+            root = logging.getLogger("pustaka")
+            root.addHandler(handler)
+            root.setLevel(1)
+            root.propagate = False
+            self._stdlib_ready = True
+        return logging.getLogger(f"pustaka.{name}")
+
+
+_settings = _Settings()
+_loggers: Dict[str, "StructuredLogger"] = {}
+
+
+def configure(level: Optional[Union[str, int]] = None, profile: Optional[str] = None):
+    """Set the process-wide level and/or output profile (see PROFILES)."""
+    if level is not None:
+        _settings.level = _level_number(level)
+    if profile is not None:
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown log profile '{profile}', expected one of {PROFILES}")
+        _settings.profile = profile
+
+
+def get_logger(name: str) -> "StructuredLogger":
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, StructuredLogger(name))
+    return logger
+
+
+@lru_cache(maxsize=256)
+def _is_style(definition: str) -> bool:
+    if not definition.strip():
+        return False
+    if definition.startswith("link=") or definition == "link":
+        return True
+    try:
+        Style.parse(definition)
+    except StyleSyntaxError:
+        return False
+    return True
+
+
+def _markup_tag(match: "re.Match") -> str:
+    closing, definition = match.groups()
+    if (closing and not definition.strip()) or _is_style(definition):
+        return ""
+    return match.group(0)
+
+
+def strip_markup(message: str) -> str:
+    """`message` without its Rich style tags (`[bold red]`, `[/]`,
+    `[link=...]`); other bracketed text such as "[ERROR]" or "list[int]" is kept."""
+    return _BRACKETED.sub(_markup_tag, message)
+
+
+class StructuredLogger:
+    """Level-gated logger whose messages cost nothing when filtered out.
+
+    A message may be a string or a zero-argument callable; `%` arguments and
+    callables are only evaluated once the level check passes. Keyword
+    arguments are attached as structured fields (`key=value`).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def is_enabled(self, level: Union[str, int]) -> bool:
+        return _level_number(level) >= _settings.level
+
+    @property
+    def debug_views(self) -> bool:
+        """True when debug renderables (trees, tables) should be built at all."""
+        return _settings.profile == "rich" and _settings.level <= LEVELS["debug"]
+
+    def log(self, level: Union[str, int], message: Message, *args: Any, **fields: Any):
+        number = _level_number(level)
+        if number < _settings.level:
+            return
+        text = message() if callable(message) else message
+        if args:
+            text = text % args
+
+        if _settings.profile == "quiet":
+            line = strip_markup(text)
+            if fields:
+                line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+            _settings.stdlib_logger(self.name).log(number, line)
+            return
+
+        if fields:
+            text += " [dim]" + " ".join(f"{key}={value}" for key, value in fields.items()) + "[/dim]"
+        console.log(text)
+
+    def trace(self, message: Message, *args: Any, **fields: Any):
+        self.log("trace", message, *args, **fields)
+
+    def debug(self, message: Message, *args: Any, **fields: Any):
+        self.log("debug", message, *args, **fields)
+
+    def info(self, message: Message, *args: Any, **fields: Any):
+        self.log("info", message, *args, **fields)
+
+    def warning(self, message: Message, *args: Any, **fields: Any):
+        self.log("warning", message, *args, **fields)
+
+    def error(self, message: Message, *args: Any, **fields: Any):
+        self.log("error", message, *args, **fields)
+
+    def view(self, build: Callable[[], Any]):
+        """Print a debug renderable; `build` is only called when debug views are on."""
+        if self.debug_views:
+            console.print(build())
+
+    @contextmanager
+    def span(self, operation: str, level: Union[str, int] = "debug", **fields: Any):
+        """Time a block and log its duration as an `elapsed_ms` field."""
+        if not self.is_enabled(level):
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.log(level, operation, elapsed_ms=f"{(time.perf_counter() - start) * 1000:.1f}", **fields)
@@ -0,0 +1,60 @@
+import re
+from typing import List
+
+CHARS_PER_TOKEN = 4
+
+# Elements whose text BeautifulSoup does not keep as NavigableString, so its
+# get_text() skips them; the lxml and selectolax readers skip them too to
+# produce the same text.
+NON_TEXT_CONTAINERS = frozenset({"script", "style", "template", "rt", "rp"})
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token), good enough for budgeting prompts."""
+    if not text:
+        return 0
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def word_tokens(text: str) -> List[str]:
+    return _WORD_RE.findall((text or "").lower())
+
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _pieces(text: str, max_tokens: int) -> List[str]:
+    """Paragraphs, with any paragraph over `max_tokens` split at sentence ends
+    and, failing that, cut at the character budget."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces: List[str] = []
+    for paragraph in re.split(r"\n\s*\n|\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END_RE.split(paragraph):
+            pieces.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+    return pieces
+
+
+def chunk_by_tokens(text: str, max_tokens: int) -> List[str]:
+    """Split text into chunks of at most ~`max_tokens` (estimate_tokens), packing
+    whole paragraphs together and keeping their order."""
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for piece in _pieces(text, max_tokens):
+        cost = estimate_tokens(piece) + 1
+        if current and used + cost > max_tokens:
+            chunks.append("\n".join(current))
+            current, used = [], 0
+        current.append(piece)
+        used += cost
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -0,0 +1,111 @@
+import re
+from collections import Counter
+from typing import List, Tuple
+
+import numpy as np
+
+from tools.structured_log import get_logger
+from tools.bm25 import stemming_tokenizer
+from tools.text_utils import estimate_tokens
+
+log = get_logger("tools.textrank")
+
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+# Sentences past this are not ranked (they keep the similarity matrix small).
+MAX_SENTENCES = 1500
+# Only terms shared by at least two sentences can link them; the most common
+# of those, up to this many, make up the matrix columns.
+MAX_TERMS = 4096
+# A candidate this similar to a sentence already picked adds nothing.
+REDUNDANCY = 0.8
+MIN_SENTENCE_CHARS = 20
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+(?=[\"'“(\[]?[A-Z0-9À-Ý])")
+
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """(line number, sentence) pairs; each non-empty line is split at sentence ends."""
+    sentences = []
+    for line_number, line in enumerate(text.splitlines()):
+        line = line.strip()
+        if line:
+            sentences.extend((line_number, sentence.strip()) for sentence in _SENTENCE_END.split(line) if sentence.strip())
+    return sentences
+
+
+def similarity_matrix(sentences: List[str]) -> np.ndarray:
+    """Cosine similarity of the sentences' TF-IDF vectors, with a zero diagonal."""
+    counts = [Counter(stemming_tokenizer(sentence)) for sentence in sentences]
+    df = Counter(term for count in counts for term in count)
+    n = len(sentences)
+    idf = {term: np.log((1 + n) / (1 + freq)) + 1.0 for term, freq in df.items()}
+    shared = [term for term, freq in df.most_common(MAX_TERMS) if freq > 1]
+    columns = {term: i for i, term in enumerate(shared)}
+
+    vectors = np.zeros((n, len(columns)), dtype=np.float32)
+    norms = np.zeros(n, dtype=np.float32)
+    for row, count in enumerate(counts):
+        weights = {term: tf * idf[term] for term, tf in count.items()}
+        norms[row] = np.sqrt(sum(w * w for w in weights.values()))
+        for term, weight in weights.items():
+            column = columns.get(term)
+            if column is not None:
+                vectors[row, column] = weight
+    vectors /= np.maximum(norms, 1e-9)[:, None]
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    return similarity
+
+
+def pagerank(similarity: np.ndarray, damping: float = DAMPING) -> np.ndarray:
+    """Power-iteration PageRank over a weighted, undirected sentence graph."""
+    n = similarity.shape[0]
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no terms with any other link to every sentence equally.
+    transition = np.where(out_weight > 0, similarity / np.maximum(out_weight, 1e-12), 1.0 / n)
+    scores = np.full(n, 1.0 / n, dtype=np.float64)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+
+def extractive_summary(text: str, max_tokens: int) -> str:
+    """The most central sentences of `text` (TextRank), at most ~`max_tokens`
+    of them, in their original order and lines. Text already within the
+    budget is returned unchanged."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    sentences = split_sentences(text)[:MAX_SENTENCES]
+    ranked = [i for i, (_, sentence) in enumerate(sentences) if len(sentence) >= MIN_SENTENCE_CHARS]
+    if len(ranked) < 2:
+        return text
+    similarity = similarity_matrix([sentences[i][1] for i in ranked])
+    scores = pagerank(similarity)
+
+    picked: List[int] = []
+    used = 0
+    for position in np.argsort(-scores, kind="stable"):
+        if picked and similarity[position, picked].max() >= REDUNDANCY:
+            continue
+        cost = estimate_tokens(sentences[ranked[position]][1]) + 1
+        if used + cost > max_tokens:
+            continue
+        picked.append(int(position))
+        used += cost
+
+    lines: List[str] = []
+    last_line = None
+    for index in sorted(ranked[position] for position in picked):
+        line_number, sentence = sentences[index]
+        if line_number == last_line:
+            lines[-1] += " " + sentence
+        else:
+            lines.append(sentence)
+        last_line = line_number
+    log.debug("[dim]Extractive summary[/dim]", sentences=f"{len(picked)}/{len(sentences)}", tokens=used)
+    return "\n".join(lines)
@@ -1,6 +1,8 @@
 import json
 import requests
 
+from tools.host_scheduler import get_host_scheduler
+
 class TweetScraper:
     FEATURES = {
         "creator_subscriptions_tweet_preview_api_enabled": True,
@@ -87,7 +89,8 @@ class TweetScraper:
         current_headers["referer"] = f"https://x.com/anyuser/status/{tweet_id}"
 
         try:
-            response = requests.get(self.BASE_URL, headers=current_headers, params=params)
+            with get_host_scheduler().slot(self.BASE_URL):
+                response = requests.get(self.BASE_URL, headers=current_headers, params=params)
             if response.status_code != 200:
                 return {
                     "status": "error",
@@ -1,35 +1,29 @@
 import os
 import time
 import pickle
+import hashlib
 import requests
-import random
 from datetime import datetime
 from urllib.parse import quote
 from typing import Dict, Optional
-from bs4 import BeautifulSoup
 from faker import Faker
 
 
-from tools.shared_console import console
+from tools.structured_log import get_logger
+from tools.brave_parser import parse_organic_results
+from tools.proxy_pool import get_proxy_pool
+from tools.host_scheduler import get_host_scheduler
+
+log = get_logger("tools.upgradescraper")
 
 faker = Faker()
 
 CACHE_DIR = ".search_cache"
+CACHE_TTL_SECONDS = 24 * 3600
+# One of tools.brave_parser.PARSER_BACKENDS ("selectolax", "lxml", "bs4"); None picks the fastest installed.
+BRAVE_PARSER_BACKEND = None
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-PROXIES_LIST = [
-    "23.95.150.145:6114:initditer89:initditer89",
-    "45.38.107.97:6014:initditer89:initditer89",
-    "45.43.186.39:6257:initditer89:initditer89",
-    "64.137.96.74:6641:initditer89:initditer89",
-    "107.172.163.27:6543:initditer89:initditer89",
-    "136.0.207.84:6661:initditer89:initditer89",
-    "142.147.128.93:6593:initditer89:initditer89",
-    "154.203.43.247:5536:initditer89:initditer89",
-    "198.23.239.134:6540:initditer89:initditer89",
-    "216.10.27.159:6837:initditer89:initditer89"
-]
-
 def generate_headers() -> Dict[str, str]:
     return {
         "User-Agent": faker.user_agent(),
@@ -40,17 +34,17 @@ def generate_headers() -> Dict[str, str]:
         "Connection": "keep-alive"
     }
 
-def get_random_proxy() -> Dict[str, str]:
-    proxy = random.choice(PROXIES_LIST)
-    ip, port, username, password = proxy.split(":")
-    proxy_url = f"http://{username}:{password}@{ip}:{port}"
-    return {
-        "http": proxy_url,
-        "https": proxy_url
-    }
+def get_cache_key(query: str, limit: int = 12, filter_domain: Optional[str] = None) -> str:
+    # hash() is salted per process, so it would never find yesterday's pages.
+    return hashlib.md5(f"{query}|{limit}|{filter_domain or ''}".encode("utf-8")).hexdigest()
 
-def get_cache_key(query: str) -> str:
-    return str(hash(query))
+def is_cached(query: str, limit: int = 12, filter_domain: Optional[str] = None) -> bool:
+    """Cheap freshness check (file mtime) used to plan query fan-out without loading the pickle."""
+    cache_file = os.path.join(CACHE_DIR, f"{get_cache_key(query, limit, filter_domain)}.pkl")
+    try:
+        return time.time() - os.path.getmtime(cache_file) < CACHE_TTL_SECONDS
+    except OSError:
+        return False
 
 def load_from_cache(cache_key: str) -> Optional[Dict]:
     cache_file = os.path.join(CACHE_DIR, f"{cache_key}.pkl")
@@ -61,11 +55,11 @@ def load_from_cache(cache_key: str) -> Optional[Dict]:
             fetched_at = cached["searchParameters"].get("fetched_at")
             if isinstance(fetched_at, str):
                 fetched_at = datetime.fromisoformat(fetched_at)
-            if (datetime.now() - fetched_at).total_seconds() < 24 * 3600:
-                console.log(f"Loaded cached results for query hash: [cyan]{cache_key}[/cyan]")
+            if (datetime.now() - fetched_at).total_seconds() < CACHE_TTL_SECONDS:
+                log.debug("Loaded cached results for query hash: [cyan]%s[/cyan]", cache_key)
                 return cached
     except Exception as e:
-        console.log(f"[bold red]Error loading cache:[/bold red] {str(e)}")
+        log.error(f"[bold red]Error loading cache:[/bold red] {str(e)}")
     return None
 
 def save_to_cache(cache_key: str, data: Dict) -> None:
@@ -74,28 +68,25 @@ def save_to_cache(cache_key: str, data: Dict) -> None:
         data["searchParameters"]["fetched_at"] = data["searchParameters"]["fetched_at"].isoformat()
         with open(cache_file, "wb") as f:
             pickle.dump(data, f)
-        console.log(f"Saved results to cache: [dim]{cache_file}[/dim]")
+        log.debug("Saved results to cache: [dim]%s[/dim]", cache_file)
     except Exception as e:
-        console.log(f"[bold red]Error saving cache:[/bold red] {str(e)}")
-
-def clean_text(text: str) -> str:
-    return ' '.join(text.strip().split()) if text else ""
+        log.error(f"[bold red]Error saving cache:[/bold red] {str(e)}")
 
 def fetch_search_page(url: str, headers: Dict[str, str], proxies: Optional[Dict[str, str]] = None) -> requests.Response:
     try:
         response = requests.get(url, headers=headers, proxies=proxies, timeout=15.0, allow_redirects=True)
         response.raise_for_status()
-        console.log(f":link: Successfully fetched URL: [link={url}]{url}[/link]")
+        log.debug(":link: Successfully fetched URL: [link=%s]%s[/link]", url, url)
         return response
     except requests.exceptions.RequestException as e:
-        console.log(f"[bold red]Request Error:[/bold red] {str(e)}")
+        log.error(f"[bold red]Request Error:[/bold red] {str(e)}")
         raise
     except Exception as e:
-        console.log(f"[bold red]General Error:[/bold red] {str(e)}")
+        log.error(f"[bold red]General Error:[/bold red] {str(e)}")
         raise
 
-def brave_search(query: str, limit: int = 12,filter_domain: Optional[str] = None) -> Dict:
-    cache_key = get_cache_key(query)
+def brave_search(query: str, limit: int = 12,filter_domain: Optional[str] = None, parser: Optional[str] = None) -> Dict:
+    cache_key = get_cache_key(query, limit, filter_domain)
     if cached_result := load_from_cache(cache_key):
         return cached_result
 
@@ -104,13 +95,18 @@ def brave_search(query: str, limit: int = 12,filter_domain: Optional[str] = None
     url = f"https://search.brave.com/search?q={encoded_query}"
     start = time.time()
     
-    proxies = get_random_proxy()
+    proxy_pool = get_proxy_pool()
+    proxy = proxy_pool.choose()
     
+    waited = 0.0
     try:
-        response = fetch_search_page(url, headers, proxies=proxies)
-        soup = BeautifulSoup(response.text, "html.parser")
+        with get_host_scheduler().slot(url) as waited:
+            fetch_start = time.time()
+            response = fetch_search_page(url, headers, proxies=proxy.proxies if proxy else None)
+        proxy_pool.report(proxy, True, time.time() - fetch_start)
     except Exception as e:
-        console.log(f"[bold red]Failed to fetch search page:[/bold red] {str(e)}")
+        proxy_pool.report(proxy, False)
+        log.error(f"[bold red]Failed to fetch search page:[/bold red] {str(e)}")
         return {
             "status": "error",
             "message": str(e),
@@ -127,45 +123,12 @@ def brave_search(query: str, limit: int = 12,filter_domain: Optional[str] = None
             "debug": {
                 "user_agent": headers["User-Agent"],
                 "ip": headers["X-Forwarded-For"],
-                "result_count": 0
+                "result_count": 0,
+                "queue_wait_ms": int(waited * 1000)
             }
         }
 
-    organic_results = []
-    for item in soup.find_all("div", class_=["snippet", "news-snippet", "video-snippet", "card"]):
-        if len(organic_results) >= limit:
-            break
-
-        a_tag = item.find("a", href=True)
-        if not a_tag or not a_tag['href'].startswith(("http://", "https://")):
-            continue
-
-        result_url = a_tag['href']
-        if filter_domain and filter_domain not in result_url:
-            continue
-
-        title_elem = item.find("div", class_=["title", "snippet-title"]) or a_tag
-        title = clean_text(title_elem.get_text(strip=True)) if title_elem else ""
-        snippet_elem = item.find("div", class_=["snippet-content", "description", "snippet-description"])
-        snippet = clean_text(snippet_elem.get_text(strip=True)) if snippet_elem else clean_text(item.get_text(separator=' ', strip=True))
-
-        date_elem = item.find("span", class_=["age", "date", "time", "snippet-age"])
-        date = clean_text(date_elem.get_text(strip=True)) if date_elem else None
-
-        if len(snippet) < 30 or len(title) < 5:
-            continue
-
-        result = {
-            "position": len(organic_results) + 1,
-            "title": title,
-            "link": result_url,
-            "snippet": snippet,
-            "domain": result_url.split("/")[2]
-        }
-        if date:
-            result["date"] = date
-
-        organic_results.append(result)
+    organic_results = parse_organic_results(response.text, limit, filter_domain, backend=parser or BRAVE_PARSER_BACKEND)
 
     result_data = {
         "status": "success",
@@ -182,7 +145,8 @@ def brave_search(query: str, limit: int = 12,filter_domain: Optional[str] = None
         "debug": {
             "user_agent": headers["User-Agent"],
             "ip": headers["X-Forwarded-For"],
-            "result_count": len(organic_results)
+            "result_count": len(organic_results),
+            "queue_wait_ms": int(waited * 1000)
         }
     }
 
@@ -1,26 +1,123 @@
 import json
 import os
+import threading
+import time
 from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from tools.structured_log import get_logger
+
+log = get_logger("tools.wallet_cache_handler")
 
 CACHE_DIR = Path(".wallet_cache")
-CACHE_DIR.mkdir(exist_ok=True) 
-def save_to_cache(address: str, raw_data: dict):
-    cache_file = CACHE_DIR / f"{address.lower()}.json"
+CACHE_DIR.mkdir(exist_ok=True)
+# Seconds a cached wallet counts as fresh; PUSTAKA_WALLET_CACHE_TTL overrides it.
+TTL_ENV = "PUSTAKA_WALLET_CACHE_TTL"
+DEFAULT_TTL = 15 * 60
+DEFAULT_SOURCE = "arkham"
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def cache_ttl() -> float:
     try:
-        with open(cache_file, 'w') as f:
-            json.dump(raw_data, f, indent=2)
-        print(f"[Info] Data for {address} saved to cache.")
-    except Exception as e:
-        print(f"[Error] Failed to save cache for {address}: {e}")
+        return float(os.getenv(TTL_ENV, DEFAULT_TTL))
+    except ValueError:
+        return DEFAULT_TTL
 
-def load_from_cache(address: str) -> dict | None:
-    cache_file = CACHE_DIR / f"{address.lower()}.json"
-    if not cache_file.exists():
-        return None
-    
+
+def _cache_file(address: str) -> Path:
+    return CACHE_DIR / f"{address.lower()}.json"
+
+
+def save_to_cache(address: str, raw_data: dict, source: str = DEFAULT_SOURCE):
+    """Store `raw_data` with the time it was fetched and where it came from."""
+    cache_file = _cache_file(address)
+    entry = {"address": address, "fetched_at": time.time(), "source": source, "data": raw_data}
     try:
-        with open(cache_file, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"[Error] Failed to load cache for {address}: {e}")
+        tmp_file = cache_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+        log.debug("Wallet data cached", address=address, source=source)
+    except OSError as e:
+        log.error(f"[red]Failed to save cache for {address}: {e}[/red]")
+
+
+def load_entry(address: str) -> Optional[Dict]:
+    """The cache entry (`data`, `fetched_at`, `source`) for `address`, or None.
+    Files from before entries had metadata count as fetched at their mtime."""
+    cache_file = _cache_file(address)
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        if not (isinstance(entry, dict) and "data" in entry and "fetched_at" in entry):
+            entry = {"address": address, "fetched_at": cache_file.stat().st_mtime, "source": "unknown", "data": entry}
+        return entry
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        log.error(f"[red]Failed to load cache for {address}: {e}[/red]")
         return None
+
+
+def load_from_cache(address: str) -> dict | None:
+    """The cached raw wallet data for `address`, whatever its age."""
+    entry = load_entry(address)
+    return entry["data"] if entry else None
+
+
+def _usable(raw_data) -> bool:
+    return isinstance(raw_data, dict) and bool(raw_data.get("portfolio")) and "error" not in raw_data
+
+
+def _fetch_and_store(address: str, fetch: Callable[[str], dict], source: str) -> Optional[dict]:
+    raw_data = fetch(address)
+    if _usable(raw_data):
+        save_to_cache(address, raw_data, source)
+    return raw_data
+
+
+def _refresh_in_background(address: str, fetch: Callable[[str], dict], source: str):
+    key = address.lower()
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            _fetch_and_store(address, fetch, source)
+            log.debug("[green]Wallet cache refreshed[/green]", address=address)
+        except Exception as e:
+            log.error(f"[red]Background wallet refresh failed for {address}: {e}[/red]")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, name=f"wallet-refresh-{key[:10]}", daemon=True).start()
+
+
+def get_wallet_data(address: str, fetch: Callable[[str], dict], ttl: Optional[float] = None,
+                    force_refresh: bool = False, source: str = DEFAULT_SOURCE) -> Dict:
+    """Wallet data for `address`, from the cache when possible.
+
+    Entries younger than `ttl` (default: cache_ttl()) are served without a
+    network call. Older ones are served immediately while `fetch(address)`
+    refreshes them in a background thread. Missing entries, and every call
+    with `force_refresh`, fetch in the foreground. Returns `data`,
+    `fetched_at`, `source` and `status` ("fresh", "stale" or "fetched").
+    """
+    ttl = cache_ttl() if ttl is None else ttl
+    entry = None if force_refresh else load_entry(address)
+    if entry is not None and _usable(entry["data"]):
+        age = time.time() - entry["fetched_at"]
+        if age <= ttl:
+            log.debug("[green]Wallet cache hit[/green]", address=address, age_s=int(age))
+            return {**entry, "status": "fresh"}
+        log.debug("[yellow]Serving stale wallet data; refreshing[/yellow]", address=address, age_s=int(age))
+        _refresh_in_background(address, fetch, source)
+        return {**entry, "status": "stale"}
+    raw_data = _fetch_and_store(address, fetch, source)
+    return {"address": address, "fetched_at": time.time(), "source": source, "data": raw_data, "status": "fetched"}